@@ -1,4 +1,5 @@
 # app/api/v2/endpoints/upload.py
+from dataclasses import asdict
 from typing import List
 
 from fastapi import APIRouter, Depends, File, Query, UploadFile
@@ -6,7 +7,10 @@ from prometheus_client import Counter
 
 from app.api.v2.schemas.upload import UploadResponse
 from app.application.upload import UploadManager
-from app.core.dependencies import get_upload_manager
+from app.application.upload.options import UploadOptions
+from app.application.upload.pipeline.parse_cache import ParseCache
+from app.application.upload.scheduler import IngestScheduler
+from app.core.dependencies import get_ingest_scheduler, get_parse_cache, get_upload_manager
 from app.core.exceptions import RequestValidationError, log_and_raise_http
 
 router = APIRouter()
@@ -22,6 +26,17 @@ FILE_PROCESSED = Counter("files_processed", "Total processed files")
 async def upload_files(
         files: List[UploadFile] = File(...),
         form_id: str = Query(..., description="ID формы"),
+        bypass_parse_cache: bool = Query(
+            False,
+            description="Парсить файлы заново, не используя кэш результатов парсинга",
+        ),
+        skip_identical: bool = Query(
+            False,
+            description=(
+                "Не обрабатывать файлы, содержимое которых уже успешно загружено "
+                "в эту форму: вернуть file_id существующей записи"
+            ),
+        ),
         upload_manager: UploadManager = Depends(get_upload_manager),
 ):
     """
@@ -36,10 +51,20 @@ async def upload_files(
     - **202** — файлы приняты, обработка запущена в фоне
     - **400 / 404** — ошибки валидации (невалидный form_id, нет файлов,
                        форма не найдена)
+    - **413** — превышен лимит размера запроса
+    - **429** — очередь обработки переполнена; повторить через `Retry-After` секунд
+    - **503** — spool-каталог заполнен, повторите позже
     - **500** — критическая ошибка на уровне запроса
     """
     try:
-        return await upload_manager.upload_files(files, form_id)
+        return await upload_manager.upload_files(
+            files,
+            form_id,
+            UploadOptions(
+                skip_identical_content=skip_identical,
+                bypass_parse_cache=bypass_parse_cache,
+            ),
+        )
 
     except RequestValidationError as e:
         log_and_raise_http(e)
@@ -51,4 +76,19 @@ async def upload_files(
             domain="upload.endpoint",
             meta={"form_id": form_id, "error": str(e)},
         )
-        log_and_raise_http(error)
\ No newline at end of file
+        log_and_raise_http(error)
+
+
+@router.get("/upload-stats", summary="Метрики приёма и парсинга файлов")
+async def upload_stats(
+        parse_cache: ParseCache | None = Depends(get_parse_cache),
+        scheduler: IngestScheduler = Depends(get_ingest_scheduler),
+):
+    """
+    Счётчики кэша результатов парсинга (hits / misses / stores / evictions, размер)
+    и состояние очереди обработки (глубина, выполняемые файлы, время ожидания).
+    """
+    return {
+        "parse_cache": asdict(parse_cache.stats()) if parse_cache is not None else None,
+        "scheduler": asdict(scheduler.stats()),
+    }
@@ -1,5 +1,4 @@
 # app/api/v2/endpoints/upload_progress.py
-import asyncio
 import json
 
 from fastapi import APIRouter, Depends, HTTPException, Path
@@ -11,7 +10,7 @@ from app.core.dependencies import get_upload_manager
 
 router = APIRouter()
 
-_POLL_INTERVAL = 0.1  # секунд
+_HEARTBEAT_INTERVAL = 15.0  # секунд без изменений до keep-alive комментария
 
 
 @router.get("/upload-progress/{upload_id}")
@@ -25,17 +24,30 @@ async def upload_progress(
     Клиент подключается сразу после получения upload_id из POST /upload
     и держит соединение открытым до завершения задачи.
 
-    Формат промежуточных событий:
+    События отправляются только при изменениях. Формат промежуточных событий:
         {
             "upload_id":          "...",
             "status":             "processing",
             "current":            2,
             "total":              5,
             "progress_percentage": 40.0,
-            "processed_files":    ["file1.xlsx", "file2.xlsx"],
-            "errors":             []
+            "processed_files":    ["file2.xlsx"],     # только новые
+            "errors":             [],                 # только новые
+            "stages": {
+                "file3.xlsx": {"step": "ParseWorkbookStep", "sheet": "Раздел1", "rows": 420}
+            }
         }
 
+    Ключ в "stages" — имя файла без пробелов по краям, то же, что в
+    "processed_files" и в result.details.
+
+    При PARSE_EXECUTOR=process книга парсится в отдельном процессе, и этапы по
+    листам ("sheet", "rows") приходят не по ходу парсинга, а все сразу после
+    его окончания; до этого "step" остаётся "ParseWorkbookStep".
+
+    Пока ничего не меняется, раз в 15 секунд приходит комментарий
+    ": keep-alive" (EventSource его игнорирует).
+
     Финальное событие (status = "completed" | "failed") дополнительно
     содержит поле "result" с полным UploadResponse — тем самым клиенту
     не нужен отдельный запрос за результатом:
@@ -54,7 +66,7 @@ async def upload_progress(
 
     # Проверяем upload_id ДО открытия потока — пока заголовки не отправлены
     # можно вернуть корректный 404.
-    if not upload_manager.get_upload_progress(upload_id):
+    if not await upload_manager.open_upload_progress(upload_id):
         raise HTTPException(status_code=404, detail=f"Upload '{upload_id}' not found")
 
     return StreamingResponse(
@@ -76,10 +88,18 @@ async def upload_progress(
 
 async def _event_generator(upload_id: str, upload_manager: UploadManager):
     """
-    Отправляет SSE-события пока задача не перейдёт в терминальный статус.
-    Последним событием отдаёт полный результат обработки.
+    Отправляет SSE-события по мере изменения прогресса, пока задача не
+    перейдёт в терминальный статус. Последним событием отдаёт полный
+    результат обработки.
+
+    processed_files / errors в событии — только новые с прошлого события;
+    stages — текущие этапы файлов в работе. Если изменений нет дольше
+    _HEARTBEAT_INTERVAL, отправляется комментарий, чтобы прокси не закрыл поток.
     """
-    last_sent: dict | None = None
+    version = -1
+    sent_files = 0
+    sent_errors = 0
+    sent_stages: dict | None = None
 
     while True:
         progress = upload_manager.get_upload_progress(upload_id)
@@ -87,7 +107,18 @@ async def _event_generator(upload_id: str, upload_manager: UploadManager):
             # Задача уже очищена (race condition при повторном подключении)
             break
 
-        is_terminal = progress.status in ("completed", "failed")
+        if not await progress.wait_for_change(version, _HEARTBEAT_INTERVAL):
+            yield ": keep-alive\n\n"
+            continue
+
+        version = progress.version
+        is_terminal = progress.is_terminal
+        new_files = progress.processed_files[sent_files:]
+        new_errors = progress.errors[sent_errors:]
+        stages = {name: dict(stage) for name, stage in progress.stages.items()}
+
+        if not (is_terminal or new_files or new_errors or stages != sent_stages):
+            continue
 
         data: dict = {
             "upload_id": upload_id,
@@ -95,8 +126,9 @@ async def _event_generator(upload_id: str, upload_manager: UploadManager):
             "current": progress.current_file,
             "total": progress.total_files,
             "progress_percentage": progress.progress_percentage,
-            "processed_files": progress.processed_files.copy(),
-            "errors": progress.errors.copy(),
+            "processed_files": new_files,
+            "errors": new_errors,
+            "stages": stages,
         }
 
         if is_terminal:
@@ -109,12 +141,11 @@ async def _event_generator(upload_id: str, upload_manager: UploadManager):
             )
             data["result"] = final_response.model_dump()
 
-        if data != last_sent:
-            yield f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
-            last_sent = data
+        yield f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+        sent_files += len(new_files)
+        sent_errors += len(new_errors)
+        sent_stages = stages
 
         if is_terminal:
             upload_manager.cleanup_upload_progress(upload_id)
             break
-
-        await asyncio.sleep(_POLL_INTERVAL)
\ No newline at end of file
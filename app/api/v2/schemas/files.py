@@ -20,3 +20,4 @@ class FileResponse(BaseModel):
     filename: str
     status: str
     error: Optional[str] = None
+    file_id: Optional[str] = None
@@ -42,6 +42,24 @@ class UploadResponse(BaseModel):
     )
 
 
+class FileStage(BaseModel):
+    """Этап обработки файла в SSE-событии."""
+
+    step: Optional[str] = Field(
+        None,
+        description="Шаг upload pipeline ('queued' — файл ждёт слота обработки).",
+        examples=["ParseWorkbookStep", "PersistStep"],
+    )
+    sheet: Optional[str] = Field(
+        None,
+        description=(
+            "Последний разобранный лист. При PARSE_EXECUTOR=process листы "
+            "приходят после парсинга всей книги."
+        ),
+    )
+    rows: Optional[int] = Field(None, description="Записей flat_data, разобранных к этому моменту.")
+
+
 class UploadProgressResponse(BaseModel):
     """
     Схема одного SSE-события из GET /upload-progress/{upload_id}.
@@ -77,11 +95,15 @@ class UploadProgressResponse(BaseModel):
     )
     processed_files: List[str] = Field(
         ...,
-        description="Имена уже обработанных файлов (в порядке завершения).",
+        description="Файлы, обработанные с момента предыдущего события (в порядке файлов в запросе).",
     )
     errors: List[str] = Field(
         ...,
-        description="Сообщения об ошибках по отдельным файлам.",
+        description="Новые с момента предыдущего события сообщения об ошибках по файлам.",
+    )
+    stages: Dict[str, FileStage] = Field(
+        default_factory=dict,
+        description="Текущий этап по каждому файлу, который сейчас в работе.",
     )
     result: Optional[Dict[str, Any]] = Field(
         None,
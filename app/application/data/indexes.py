@@ -1,10 +1,11 @@
-﻿"""Создание индексов MongoDB для коллекций Files и FlatData."""
+﻿"""Создание индексов MongoDB для коллекций Files, FlatData и UploadJobs."""
 
 from __future__ import annotations
 
 from pymongo.errors import OperationFailure
 
 from app.core.database import mongo_connection
+from config.config import config
 
 
 class MongoIndexManager:
@@ -44,7 +45,7 @@ class MongoIndexManager:
         )
 
     async def create_file_indexes(self) -> None:
-        """Создаёт уникальные индексы коллекции Files по file_id и паре filename/form_id."""
+        """Создаёт индексы коллекции Files: уникальные по file_id и filename/form_id, поиск по хэшу содержимого."""
         await self.db.Files.create_index(
             [("file_id", 1)],
             unique=True,
@@ -64,10 +65,37 @@ class MongoIndexManager:
                 "Устраните дубликаты и перезапустите приложение."
             ) from exc
 
+        await self.db.Files.create_index(
+            [("form_id", 1), ("content_hash", 1), ("status", 1)],
+            name="form_content_hash_idx",
+        )
+
+    async def create_upload_job_indexes(self) -> None:
+        """Индексы очереди UploadJobs: поиск по upload_id, выбор задачи worker'ом, TTL завершённых."""
+        await self.db.UploadJobs.create_index(
+            [("upload_id", 1)],
+            unique=True,
+            name="uniq_upload_id",
+        )
+        await self.db.UploadJobs.create_index(
+            [("status", 1), ("created_at", 1)],
+            name="status_created_idx",
+        )
+        await self.db.UploadJobs.create_index(
+            [("status", 1), ("lease_expires_at", 1)],
+            name="status_lease_idx",
+        )
+        await self.db.UploadJobs.create_index(
+            [("finished_at", 1)],
+            expireAfterSeconds=config.UPLOAD_JOB_TTL_SECONDS,
+            name="finished_ttl_idx",
+        )
+
     async def create_all_indexes(self) -> None:
-        """Создаёт все индексы FlatData и Files."""
+        """Создаёт все индексы FlatData, Files и UploadJobs."""
         await self.create_flat_data_index()
         await self.create_file_indexes()
+        await self.create_upload_job_indexes()
 
 
 async def create_indexes() -> None:
@@ -4,13 +4,13 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional
 
 from app.core.exceptions import CriticalUploadError
 from app.core.mongo_transactions import run_in_transaction
 from app.domain.file.models import FileModel, FileStatus
 from app.domain.file.service import FileService
-from app.domain.flat_data.models import FlatDataRecord
+from app.domain.flat_data.batch import FileFlatData
 from app.domain.flat_data.service import FlatDataService
 from app.domain.log.service import LogService
 from config.config import config
@@ -40,16 +40,16 @@ class DataSaveService:
     async def process_and_save_all(
         self,
         file_model: FileModel,
-        flat_data: Optional[List[FlatDataRecord]] = None,
+        flat_data: Optional[FileFlatData] = None,
     ) -> None:
         """Атомарно или пошагово сохраняет файл и строки FlatData, затем пишет записи в Logs."""
-        flat_list = flat_data or []
-        use_tx = self._should_use_transaction_for_flat_count(len(flat_list))
+        flat_data = flat_data if flat_data is not None else FileFlatData()
+        use_tx = self._should_use_transaction_for_flat_count(len(flat_data))
         try:
             if use_tx:
-                await self._persist_in_transaction(file_model, flat_list)
+                await self._persist_in_transaction(file_model, flat_data)
             else:
-                await self._persist_with_cleanup_on_failure(file_model, flat_list)
+                await self._persist_with_cleanup_on_failure(file_model, flat_data)
         except CriticalUploadError:
             raise
         except Exception as exc:
@@ -64,15 +64,15 @@ class DataSaveService:
     async def _persist_in_transaction(
         self,
         file_model: FileModel,
-        flat_list: List[FlatDataRecord],
+        flat_data: FileFlatData,
     ) -> None:
         """Выполняет обновление Files и вставку FlatData в одной транзакции (при поддержке сервером)."""
 
         async def work(session):
             await self._file_service.update_or_create(file_model, session=session)
             inserted_total = 0
-            if flat_list:
-                inserted_total = await self._flat_data_service.save_flat_data(flat_list, session=session)
+            if len(flat_data):
+                inserted_total = await self._flat_data_service.save_flat_data(flat_data, session=session)
             file_model.status = FileStatus.SUCCESS
             file_model.flat_data_size = inserted_total
             await self._file_service.update_or_create(file_model, session=session)
@@ -80,7 +80,7 @@ class DataSaveService:
 
         inserted_total = await run_in_transaction(work)
 
-        if not flat_list:
+        if not len(flat_data):
             await self._log_service.save_log(
                 scenario="upload",
                 message=f"FlatData is empty for {file_model.file_id}",
@@ -88,7 +88,7 @@ class DataSaveService:
                 meta={"file_id": file_model.file_id},
             )
 
-        expected_count = len(flat_list)
+        expected_count = len(flat_data)
         if expected_count > 0 and inserted_total < expected_count:
             discrepancy = expected_count - inserted_total
             await self._log_service.save_log(
@@ -127,7 +127,7 @@ class DataSaveService:
     async def _persist_with_cleanup_on_failure(
         self,
         file_model: FileModel,
-        flat_list: List[FlatDataRecord],
+        flat_data: FileFlatData,
     ) -> None:
         """
         Сохраняет большой объём без одной транзакции (ограничение размера транзакции MongoDB).
@@ -143,8 +143,8 @@ class DataSaveService:
             )
 
             inserted_total = 0
-            if flat_list:
-                inserted_total = await self._flat_data_service.save_flat_data(flat_list)
+            if len(flat_data):
+                inserted_total = await self._flat_data_service.save_flat_data(flat_data)
             else:
                 await self._log_service.save_log(
                     scenario="upload",
@@ -156,7 +156,7 @@ class DataSaveService:
             file_model.status = FileStatus.SUCCESS
             file_model.flat_data_size = inserted_total
 
-            expected_count = len(flat_list)
+            expected_count = len(flat_data)
             if expected_count > 0 and inserted_total < expected_count:
                 discrepancy = expected_count - inserted_total
                 await self._log_service.save_log(
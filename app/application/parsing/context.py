@@ -26,7 +26,7 @@ class ParsingPipelineContext:
     - sheet_model.sheet_name           — нормализованное имя листа
     - sheet_model.horizontal_headers   — горизонтальные заголовки
     - sheet_model.vertical_headers     — вертикальные заголовки
-    - sheet_model.flat_data_records    — плоские данные
+    - sheet_model.flat_data            — плоские данные
     - sheet_model.warnings / .errors   — диагностика
 
     Нейтральный носитель — не знает о конкретных формах.
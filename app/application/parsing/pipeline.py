@@ -1,6 +1,6 @@
 """Оркестратор parsing pipeline: запускает шаги для парсинга одного листа."""
 import logging
-from typing import List
+from typing import Iterable
 
 from app.application.parsing.context import ParsingPipelineContext
 from app.application.parsing.steps.base import ParsingPipelineStep
@@ -26,11 +26,13 @@ class ParsingPipelineRunner:
     - Exception (непредвиденная): оборачивается в CriticalParsingError и пробрасывается.
 
     Никогда не поглощает CriticalParsingError — это ответственность вызывающего кода.
+
+    Runner не хранит состояние листа (шаги без состояния, профилировщик — на запуск),
+    поэтому один экземпляр переиспользуется для всех листов с тем же планом.
     """
 
-    def __init__(self, steps: List[ParsingPipelineStep]) -> None:
-        self.steps = steps
-        self.profiler = PipelineProfiler("Parsing")
+    def __init__(self, steps: Iterable[ParsingPipelineStep]) -> None:
+        self.steps = tuple(steps)
 
     async def run_for_sheet(self, ctx: ParsingPipelineContext) -> None:
         """
@@ -43,8 +45,9 @@ class ParsingPipelineRunner:
             CriticalParsingError: если любой шаг завершился критической ошибкой.
                                   Вызывающий код обязан обработать это исключение.
         """
-        self.profiler.start()
-        
+        profiler = PipelineProfiler("Parsing")
+        profiler.start()
+
         logger.debug(
             "Начало parsing pipeline: лист='%s', форма='%s', шагов=%d",
             ctx.sheet_name,
@@ -54,7 +57,7 @@ class ParsingPipelineRunner:
 
         for step in self.steps:
             step_name = step.__class__.__name__
-            self.profiler.increment_step()
+            profiler.increment_step()
 
             try:
                 await step.execute(ctx)
@@ -108,5 +111,5 @@ class ParsingPipelineRunner:
                 "Parsing pipeline успешно завершён для листа '%s'",
                 ctx.sheet_name,
             )
-        
-        self.profiler.finish()
\ No newline at end of file
+
+        profiler.finish()
\ No newline at end of file
@@ -1,12 +1,20 @@
 """Реестр стратегий parsing pipeline."""
 import logging
+import threading
+from collections import OrderedDict
 from typing import Optional
 
-from app.domain.form.models import FormInfo, FormType
-from app.application.parsing.strategies.base import BaseFormParsingStrategy
+from app.domain.form.models import FormInfo, FormType, requisites_hash
+from app.application.parsing.pipeline import ParsingPipelineRunner
+from app.application.parsing.strategies.base import BaseFormParsingStrategy, normalize_sheet_name
 
 logger = logging.getLogger(__name__)
 
+# Ключ плана листа: (form id, хэш типа и реквизитов формы, нормализованное имя листа).
+PlanKey = tuple[str, str, str]
+
+_MAX_PLANS = 512
+
 
 class ParsingStrategyRegistry:
     """
@@ -15,11 +23,16 @@ class ParsingStrategyRegistry:
     Связывает FormType с конкретной реализацией BaseFormParsingStrategy.
     Ручные формы регистрируются явно в _register_manual_forms().
     Для всего остального возвращается AutoFormParsingStrategy по умолчанию.
+
+    Построенные планы листов (ParsingPipelineRunner с неизменяемым набором шагов)
+    кэшируются по PlanKey; при изменении формы её планы сбрасываются (invalidate_form).
     """
 
     def __init__(self) -> None:
         self._strategies: dict[FormType, BaseFormParsingStrategy] = {}
         self._default: Optional[BaseFormParsingStrategy] = None
+        self._plans: "OrderedDict[PlanKey, ParsingPipelineRunner]" = OrderedDict()
+        self._plans_lock = threading.Lock()
         self._init()
 
     def _init(self) -> None:
@@ -50,6 +63,7 @@ class ParsingStrategyRegistry:
         strategy: BaseFormParsingStrategy,
     ) -> None:
         self._strategies[form_type] = strategy
+        self.clear_plans()
         logger.debug(
             "Зарегистрирована стратегия %s для формы %s",
             strategy.__class__.__name__,
@@ -80,9 +94,10 @@ class ParsingStrategyRegistry:
         """
         Точка входа для ProcessSheetsStep.
         Возвращает ParsingPipelineRunner или None если лист нужно пропустить.
-        """
-        from app.application.parsing.pipeline import ParsingPipelineRunner
 
+        Runner берётся из кэша планов; один и тот же экземпляр отдаётся для всех
+        листов с тем же PlanKey.
+        """
         strategy = self.get_strategy(form_info.type)
 
         if not strategy.should_process_sheet(sheet_name, sheet_index, form_info):
@@ -94,9 +109,38 @@ class ParsingStrategyRegistry:
             )
             return None
 
-        steps = strategy.build_steps_for_sheet(sheet_name, form_info)
-        return ParsingPipelineRunner(steps=steps)
-
+        key: PlanKey = (form_info.id, requisites_hash(form_info), normalize_sheet_name(sheet_name))
+        with self._plans_lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                return plan
+
+        plan = ParsingPipelineRunner(steps=strategy.build_steps_for_sheet(sheet_name, form_info))
+        with self._plans_lock:
+            plan = self._plans.setdefault(key, plan)
+            self._plans.move_to_end(key)
+            while len(self._plans) > _MAX_PLANS:
+                self._plans.popitem(last=False)
+        logger.debug("План парсинга листа '%s' для формы %s построен", key[2], form_info.id)
+        return plan
+
+    def invalidate_form(self, form_id: str) -> None:
+        """Сбрасывает планы формы (подписка на FormService: форма изменена или удалена)."""
+        with self._plans_lock:
+            stale = [key for key in self._plans if key[0] == form_id]
+            for key in stale:
+                del self._plans[key]
+        if stale:
+            logger.debug("Сброшено планов парсинга формы %s: %d", form_id, len(stale))
+
+    def clear_plans(self) -> None:
+        with self._plans_lock:
+            self._plans.clear()
+
+    @property
+    def plans_count(self) -> int:
+        return len(self._plans)
 
 
 _registry: Optional[ParsingStrategyRegistry] = None
@@ -1,22 +1,22 @@
 
-"""Шаг: генерация FlatDataRecord через domain/parsing."""
+"""Шаг: генерация flat_data листа (SheetFlatBatch) через domain/parsing."""
 import logging
 
 from app.application.parsing.context import ParsingPipelineContext
 from app.application.parsing.steps.base import BaseParsingStep
 from app.core.exceptions import CriticalParsingError, NonCriticalParsingError
 from app.core.profiling import profile_step
-from app.domain.parsing import build_flat_data_records
+from app.domain.parsing import build_sheet_flat_batch
 
 logger = logging.getLogger(__name__)
 
 
 class GenerateFlatDataStep(BaseParsingStep):
     """
-    Строит список FlatDataRecord из извлечённых данных.
+    Строит колоночный SheetFlatBatch из извлечённых данных.
 
     Требует: ctx.extracted_data — должен быть заполнен ExtractDataStep.
-    Записывает: ctx.sheet_model.flat_data_records (единственный источник правды).
+    Записывает: ctx.sheet_model.flat_data (единственный источник правды).
 
     Отсутствие extracted_data — NonCriticalParsingError: лист пуст,
     но это не повод останавливать весь файл.
@@ -33,7 +33,7 @@ class GenerateFlatDataStep(BaseParsingStep):
             )
 
         try:
-            ctx.sheet_model.flat_data_records = build_flat_data_records(
+            ctx.sheet_model.flat_data = build_sheet_flat_batch(
                 ctx.extracted_data,
                 section=ctx.sheet_name,
                 skip_empty=False,
@@ -48,6 +48,6 @@ class GenerateFlatDataStep(BaseParsingStep):
 
         logger.debug(
             "Сгенерировано %d записей flat_data для листа '%s'",
-            len(ctx.sheet_model.flat_data_records),
+            len(ctx.sheet_model.flat_data),
             ctx.sheet_name,
         )
@@ -1,6 +1,7 @@
 """Шаг: парсинг заголовков через domain/parsing."""
 import logging
 from collections import Counter
+from typing import Optional
 
 from app.application.parsing.context import ParsingPipelineContext
 from app.application.parsing.steps.base import BaseParsingStep
@@ -12,6 +13,7 @@ from app.domain.parsing.header_parsing import (
     strip_horizontal_leading_okei_banner,
     strip_horizontal_leading_section_banner,
 )
+from app.domain.parsing.vertical_hierarchy_config import VerticalHierarchyOptions
 
 logger = logging.getLogger(__name__)
 
@@ -81,6 +83,7 @@ class ParseHeadersStep(BaseParsingStep):
         horizontal_header_leading_levels_to_drop: int = 0,
         *,
         horizontal_header_strip_fk1_banner: bool = False,
+        vertical_hierarchy: Optional[VerticalHierarchyOptions] = None,
     ) -> None:
         self._horizontal_header_leading_levels_to_drop = max(
             0,
@@ -88,6 +91,9 @@ class ParseHeadersStep(BaseParsingStep):
         )
         # Флаг исторически назван «fk1_banner»; сейчас управляет только снятием сегмента с «ОКЕИ».
         self._horizontal_header_strip_okei_banner = horizontal_header_strip_fk1_banner
+        # Настройки иерархии из requisites, собранные при построении плана листа;
+        # None — parse_headers собирает их сам.
+        self._vertical_hierarchy = vertical_hierarchy
 
     @profile_step()
     async def execute(self, ctx: ParsingPipelineContext) -> None:
@@ -124,6 +130,7 @@ class ParseHeadersStep(BaseParsingStep):
                 workbook_source=ctx.workbook_source,
                 vertical_hierarchy_mode=vertical_hierarchy_mode,
                 form_requisites=ctx.form_info.requisites,
+                vertical_hierarchy=self._vertical_hierarchy,
             )
         except Exception as e:
             raise CriticalParsingError(
@@ -4,6 +4,10 @@ from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Callable, Optional
 
 from app.domain.form.models import FormInfo
+from app.domain.parsing.vertical_hierarchy_config import (
+    VerticalHierarchyOptions,
+    hierarchy_options_from_requisites,
+)
 
 if TYPE_CHECKING:
     from app.application.parsing.steps.base import ParsingPipelineStep
@@ -42,6 +46,9 @@ class BaseFormParsingStrategy(ABC):
     - Стратегия не знает об UploadPipelineContext.
     - Стратегия не логирует — она только конфигурирует.
     - Форма-специфичные параметры шагов передаются через конструктор шага.
+    - Шаги не хранят состояние листа: реестр кэширует построенный набор шагов
+      по (форма, хэш реквизитов, нормализованное имя листа) и переиспользует его,
+      поэтому набор шагов должен зависеть только от form_info и normalize_sheet_name(sheet_name).
     """
 
     @abstractmethod
@@ -189,6 +196,21 @@ class DefaultFormParsingStrategy(BaseFormParsingStrategy):
             return True
         return False
 
+    def get_vertical_hierarchy_options(
+        self,
+        form_info: FormInfo,
+    ) -> Optional[VerticalHierarchyOptions]:
+        """
+        Настройки вертикальной иерархии из requisites — один раз на план листа.
+
+        При некорректных requisites возвращает None: ошибка проявится
+        в ParseHeadersStep для листа, как и без плана.
+        """
+        try:
+            return hierarchy_options_from_requisites(form_info.requisites)
+        except (TypeError, ValueError):
+            return None
+
     # --- Реализация типового pipeline ---
 
     def build_steps_for_sheet(
@@ -222,6 +244,7 @@ class DefaultFormParsingStrategy(BaseFormParsingStrategy):
             form_info,
         )
         strip_fk1_banner = self.get_horizontal_header_strip_fk1_banner(sheet_name, form_info)
+        vertical_hierarchy = self.get_vertical_hierarchy_options(form_info)
 
         steps: list["ParsingPipelineStep"] = [
             NormalizeSheetNameStep(normalize_fn=normalize_fn),
@@ -235,6 +258,7 @@ class DefaultFormParsingStrategy(BaseFormParsingStrategy):
                 ParseHeadersStep(
                     horizontal_header_leading_levels_to_drop=header_leading_drop,
                     horizontal_header_strip_fk1_banner=strip_fk1_banner,
+                    vertical_hierarchy=vertical_hierarchy,
                 ),
                 ExtractDataStep(deduplicate_columns=deduplicate_columns),
                 GenerateFlatDataStep(),
@@ -1,10 +1,12 @@
 """Process one uploaded file through upload pipeline."""
 
 import logging
+from pathlib import Path
 
 from fastapi import UploadFile
 
 from app.api.v2.schemas.files import FileResponse
+from app.application.upload.options import UploadOptions
 from app.application.upload.pipeline import UploadPipelineContext, UploadPipelineRunner
 from app.core.exceptions import CriticalUploadError, log_app_error
 from app.domain.file.models import FileStatus
@@ -14,7 +16,13 @@ logger = logging.getLogger(__name__)
 
 
 class FileProcessor:
-    """Runs upload pipeline for a single file and maps result to API response."""
+    """
+    Runs upload pipeline for a single file and maps result to API response.
+
+    process_file() runs the whole pipeline. UploadManager uses the phases
+    separately (create_context → parse → persist → build_response) so that
+    one file can be parsed while another one is being written.
+    """
 
     def __init__(self, pipeline: UploadPipelineRunner):
         self._pipeline = pipeline
@@ -24,27 +32,55 @@ class FileProcessor:
         file: UploadFile,
         form_id: str,
         form_info: FormInfo,
+        options: UploadOptions | None = None,
+        content_hash: str | None = None,
     ) -> FileResponse:
+        ctx = self.create_context(file, form_id, form_info, options, content_hash)
+        await self.parse(ctx)
+        if self.needs_persist(ctx):
+            await self.persist(ctx)
+        return self.build_response(ctx)
+
+    def create_context(
+        self,
+        file: UploadFile,
+        form_id: str,
+        form_info: FormInfo,
+        options: UploadOptions | None = None,
+        content_hash: str | None = None,
+        file_path: Path | None = None,
+    ) -> UploadPipelineContext:
         filename = (file.filename or "").strip()
         logger.info("Processing file: '%s'", filename)
-
-        ctx = UploadPipelineContext(
+        return UploadPipelineContext(
             file=file,
             filename=filename,
             form_id=form_id,
             form_info=form_info,
+            options=options or UploadOptions(),
+            content_hash=content_hash,
+            file_path=file_path,
         )
 
-        try:
-            await self._pipeline.run_for_file(ctx)
+    async def parse(self, ctx: UploadPipelineContext) -> None:
+        await self._run_phase(self._pipeline.run_parse_phase, ctx)
+
+    async def persist(self, ctx: UploadPipelineContext) -> None:
+        await self._run_phase(self._pipeline.run_persist_phase, ctx)
 
-            if ctx.failed:
-                return FileResponse(
-                    filename=ctx.filename,
-                    status=FileStatus.FAILED,
-                    error=ctx.error or "Unknown upload error",
-                )
+    @staticmethod
+    def needs_persist(ctx: UploadPipelineContext) -> bool:
+        return not ctx.failed and not ctx.skipped
+
+    def build_response(self, ctx: UploadPipelineContext) -> FileResponse:
+        if ctx.failed:
+            return FileResponse(
+                filename=ctx.filename,
+                status=FileStatus.FAILED,
+                error=ctx.error or "Unknown upload error",
+            )
 
+        if not ctx.skipped:
             form_type = getattr(getattr(ctx.form_info, "type", None), "value", "?")
             logger.info(
                 "File '%s' processed successfully. form_type=%s, sheets=%d, records=%d",
@@ -53,21 +89,23 @@ class FileProcessor:
                 len(ctx.sheets),
                 len(ctx.flat_data),
             )
-            return FileResponse(
-                filename=ctx.filename,
-                status=FileStatus.SUCCESS,
-                error="",
-            )
+        return FileResponse(
+            filename=ctx.filename,
+            status=FileStatus.SUCCESS,
+            error="",
+            file_id=ctx.file_model.file_id if ctx.file_model else None,
+        )
+
+    async def _run_phase(self, phase, ctx: UploadPipelineContext) -> None:
+        try:
+            await phase(ctx)
         except Exception as exc:
             error = CriticalUploadError(
                 message=f"Internal file processing error: {exc}",
                 domain="upload.file_processor",
                 http_status=500,
-                meta={"file_name": ctx.filename, "form_id": form_id, "error": str(exc)},
+                meta={"file_name": ctx.filename, "form_id": ctx.form_id, "error": str(exc)},
             )
             log_app_error(error, exc_info=True)
-            return FileResponse(
-                filename=ctx.filename,
-                status=FileStatus.FAILED,
-                error=error.message,
-            )
+            ctx.failed = True
+            ctx.error = error.message
@@ -0,0 +1,117 @@
+# app/application/upload/job_queue.py
+import asyncio
+import logging
+from dataclasses import asdict
+from typing import List
+
+from app.api.v2.schemas.files import FileResponse
+from app.application.upload.options import UploadOptions
+from app.application.upload.spool import SpooledFile, UploadSpool
+from app.application.upload.upload_progress import UploadProgress
+from app.core.exceptions import UploadBackpressureError
+from app.domain.upload_job import UploadJob, UploadJobFile, UploadJobService
+from config.config import config
+
+logger = logging.getLogger(__name__)
+
+
+def job_file_responses(job: UploadJob) -> List[FileResponse]:
+    """Результаты файлов задачи в порядке файлов в запросе."""
+    return [FileResponse(**item.result) for item in job.files if item.result is not None]
+
+
+def apply_job_to_progress(progress: UploadProgress, job: UploadJob) -> None:
+    progress.replace_state(
+        status=job.status.value if job.is_terminal else "processing",
+        current_file=job.current_file,
+        processed_files=list(job.processed_files),
+        errors=list(job.errors),
+        stages={name: dict(stage) for name, stage in job.stages.items()},
+        file_responses=job_file_responses(job) if job.is_terminal else [],
+    )
+
+
+class UploadJobQueue:
+    """
+    Очередь задач загрузки в коллекции UploadJobs (UPLOAD_EXECUTION_MODE=queue).
+
+    API-процесс только принимает файлы в общий spool-каталог и ставит задачу;
+    обрабатывает её отдельный процесс `python -m app.worker`. Прогресс для SSE
+    читается из документа задачи — так поток работает в любом из процессов
+    uvicorn, а не только в том, что принял файлы.
+    """
+
+    def __init__(
+        self,
+        job_service: UploadJobService,
+        spool: UploadSpool,
+        *,
+        max_pending: int | None = None,
+        poll_interval: float | None = None,
+    ) -> None:
+        if not spool.enabled:
+            raise ValueError("UPLOAD_EXECUTION_MODE=queue requires UPLOAD_SPOOL_ENABLED=true")
+        self._jobs = job_service
+        self._spool = spool
+        self._max_pending = max_pending or config.UPLOAD_JOB_MAX_PENDING
+        self._poll_interval = poll_interval or config.UPLOAD_JOB_PROGRESS_POLL_SECONDS
+
+    async def ensure_capacity(self, upload_id: str, form_id: str) -> None:
+        """
+        Raises:
+            UploadBackpressureError — в очереди уже UPLOAD_JOB_MAX_PENDING незавершённых задач
+        """
+        pending = await self._jobs.count_pending()
+        if pending >= self._max_pending:
+            raise UploadBackpressureError(
+                message="Upload queue is full, retry later",
+                retry_after=config.INGEST_RETRY_AFTER_SECONDS,
+                meta={"upload_id": upload_id, "form_id": form_id, "pending_jobs": pending},
+            )
+
+    async def submit(
+        self,
+        spooled: List[SpooledFile],
+        upload_id: str,
+        form_id: str,
+        options: UploadOptions,
+    ) -> None:
+        files = [
+            UploadJobFile(
+                filename=item.filename,
+                content_type=item.content_type,
+                size=item.size,
+                path=str(item.path),
+                content_hash=item.content_hash,
+            )
+            for item in spooled
+        ]
+        await self._jobs.create_job(upload_id, form_id, files, asdict(options))
+        # Файлы теперь принадлежат worker'у — он удалит их после обработки.
+        for item in spooled:
+            self._spool.hand_off(item)
+
+    async def load_progress(self, upload_id: str) -> tuple[UploadProgress, int] | None:
+        """Локальная копия прогресса задачи и версия документа, с которой она снята."""
+        job = await self._jobs.get(upload_id)
+        if job is None:
+            return None
+        progress = UploadProgress(upload_id=upload_id, total_files=len(job.files), form_id=job.form_id)
+        apply_job_to_progress(progress, job)
+        return progress, job.version
+
+    async def follow(self, progress: UploadProgress, version: int, is_watched) -> None:
+        """
+        Подтягивает изменения задачи в локальный UploadProgress, пока она не
+        завершится или пока прогресс кому-то нужен (is_watched()).
+        """
+        while not progress.is_terminal and is_watched():
+            await asyncio.sleep(self._poll_interval)
+            try:
+                job = await self._jobs.get_if_newer(progress.upload_id, version)
+            except Exception as exc:
+                logger.warning("Failed to read upload job %s: %s", progress.upload_id, exc)
+                continue
+            if job is not None:
+                version = job.version
+                apply_job_to_progress(progress, job)
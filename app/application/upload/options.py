@@ -0,0 +1,18 @@
+# app/application/upload/options.py
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class UploadOptions:
+    """
+    Параметры одного запроса на загрузку, общие для всех его файлов.
+
+    skip_identical_content — если файл с тем же содержимым (SHA-256) уже
+        успешно загружен в эту форму, не читать и не парсить его заново:
+        вернуть file_id существующей записи.
+    bypass_parse_cache — не брать результат парсинга из кэша (результат
+        повторного парсинга при этом перезаписывает запись кэша).
+    """
+
+    skip_identical_content: bool = False
+    bypass_parse_cache: bool = False
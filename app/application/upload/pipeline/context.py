@@ -1,10 +1,13 @@
 ﻿from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Callable, List, Mapping, Optional
 
 from fastapi import UploadFile
 
+from app.application.upload.options import UploadOptions
+from app.core.profiling import PipelineProfiler
 from app.domain.file.models import FileInfo, FileModel
-from app.domain.flat_data.models import FlatDataRecord
+from app.domain.flat_data.batch import FileFlatData
 from app.domain.form.models import FormInfo
 from app.domain.sheet.models import SheetModel
 
@@ -15,20 +18,39 @@ class UploadPipelineContext:
 
     form_id: str
     form_info: FormInfo
-    file: UploadFile
+    file: Optional[UploadFile]
     filename: str
+    options: UploadOptions = field(default_factory=UploadOptions)
 
+    content_hash: Optional[str] = None
+    # Файл в spool: содержимое в память процесса не читается, книгу открывает исполнитель парсинга
+    file_path: Optional[Path] = None
     file_content: Optional[bytes] = None
     file_info: Optional[FileInfo] = None
     file_model: Optional[FileModel] = None
-    workbook_sheets: Dict[str, Any] = field(default_factory=dict)
+    # {имя_листа: DataFrame}; после ReadWorkbookStep — LazyWorkbook (листы читаются по требованию)
+    workbook_sheets: Mapping[str, Any] = field(default_factory=dict)
     sheets: List[SheetModel] = field(default_factory=list)
+    # flat_data всех листов; заполняется вместе с sheets (set_sheets)
+    flat_data: FileFlatData = field(default_factory=FileFlatData)
 
     error: Optional[str] = None
     failed: bool = False
+    # Результат уже есть в БД (файл с тем же содержимым) — оставшиеся шаги не выполняются
+    skipped: bool = False
     warnings: List[str] = field(default_factory=list)
-
-    @property
-    def flat_data(self) -> List[FlatDataRecord]:
-        """Собирает все FlatDataRecord из распарсенных листов."""
-        return [record for sheet in self.sheets for record in sheet.flat_data_records]
+    # Получатель этапов обработки (шаг, лист, число записей) — обычно UploadProgress
+    on_stage: Optional[Callable[..., None]] = field(default=None, repr=False, compare=False)
+    # Профилировщик этого файла: живёт от начала парсинга до конца записи в БД
+    profiler: PipelineProfiler = field(
+        default_factory=lambda: PipelineProfiler("Upload"), repr=False, compare=False
+    )
+
+    def report_stage(self, **stage: Any) -> None:
+        if self.on_stage is not None:
+            self.on_stage(**stage)
+
+    def set_sheets(self, sheets: List[SheetModel]) -> None:
+        """Сохраняет распарсенные листы и собирает из них flat_data файла."""
+        self.sheets = sheets
+        self.flat_data = FileFlatData(sheet.flat_data for sheet in sheets)
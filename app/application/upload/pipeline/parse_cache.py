@@ -0,0 +1,240 @@
+"""
+Дисковый кэш результатов парсинга книг.
+
+Ключ — (SHA-256 содержимого, хэш типа и реквизитов формы, PARSER_VERSION,
+версия HeaderFixer): тот же файл, загруженный повторно в ту же форму
+с теми же реквизитами, не читается и не парсится заново. Ручная правка
+manual_map.json меняет ключи всех записей, выученные HeaderFixer случаи — нет.
+
+Значение — колоночное представление листов (заголовки и flat_data в виде
+словарей уникальных меток строк/колонок + массивов индексов и значений)
+и предупреждения парсинга книги, JSON, сжатый zlib. Запись атомарная (временный файл + os.replace), вытеснение —
+LRU по суммарному размеру файлов.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.domain.flat_data.batch import SheetFlatBatch
+from app.domain.form.models import FormInfo, requisites_hash
+from app.domain.parsing.header_fixer import header_fixer_version
+from app.domain.parsing.models import PARSER_VERSION
+from app.domain.sheet.models import SheetModel
+from config.config import config
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".parse.z"
+# Увеличивать при изменении формата записи: записи старого формата не читаются
+_FORMAT_VERSION = 2
+
+
+@dataclass
+class ParseCacheEntry:
+    """Сохранённый результат парсинга книги."""
+
+    sheets: List[SheetModel]
+    warnings: List[str] = field(default_factory=list)
+
+
+@dataclass
+class ParseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    entries: int = 0
+    total_bytes: int = 0
+
+
+def make_cache_key(content_hash: str, form_info: FormInfo, fixer_version: Optional[str] = None) -> str:
+    """
+    Ключ записи кэша. fixer_version — версия HeaderFixer и ручных правок
+    manual_map (по умолчанию — header_fixer_version()): заголовки зависят от неё.
+    """
+    if fixer_version is None:
+        fixer_version = header_fixer_version()
+    raw = f"{content_hash}:{requisites_hash(form_info)}:{PARSER_VERSION}:{fixer_version}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _encode_sheet(sheet: SheetModel) -> Dict[str, Any]:
+    batch = sheet.flat_data
+
+    return {
+        "sheet_fullname": sheet.sheet_fullname,
+        "sheet_name": sheet.sheet_name,
+        "horizontal_headers": sheet.horizontal_headers,
+        "vertical_headers": sheet.vertical_headers,
+        "warnings": sheet.warnings,
+        "errors": sheet.errors,
+        "row_labels": batch.row_labels.tolist(),
+        "column_labels": batch.column_labels.tolist(),
+        "section": batch.section,
+        "rows": batch.row_codes.tolist(),
+        "columns": batch.column_codes.tolist(),
+        "values": batch.values.tolist(),
+    }
+
+
+def _decode_sheet(payload: Dict[str, Any]) -> SheetModel:
+    values = np.empty(len(payload["values"]), dtype=object)
+    values[:] = payload["values"]
+    flat_data = SheetFlatBatch(
+        section=payload["section"],
+        row_labels=np.array(payload["row_labels"], dtype=object),
+        column_labels=np.array(payload["column_labels"], dtype=object),
+        row_codes=np.array(payload["rows"], dtype=np.int32),
+        column_codes=np.array(payload["columns"], dtype=np.int32),
+        values=values,
+    )
+    return SheetModel(
+        sheet_fullname=payload["sheet_fullname"],
+        sheet_name=payload["sheet_name"],
+        horizontal_headers=list(payload["horizontal_headers"]),
+        vertical_headers=list(payload["vertical_headers"]),
+        flat_data=flat_data,
+        warnings=list(payload["warnings"]),
+        errors=list(payload["errors"]),
+    )
+
+
+class ParseCache:
+    """
+    LRU-кэш результатов парсинга в каталоге на диске.
+
+    Учёт размера и порядка доступа — в памяти процесса; при создании
+    восстанавливается сканированием каталога (порядок — по mtime).
+    Методы потокобезопасны: шаг вызывает их через asyncio.to_thread.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int) -> None:
+        self._dir = Path(directory)
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._stats = ParseCacheStats()
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._scan()
+
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[ParseCacheEntry]:
+        path = self._path(key)
+        try:
+            raw = path.read_bytes()
+            payload = json.loads(zlib.decompress(raw))
+            if payload.get("parser_version") != PARSER_VERSION:
+                raise ValueError("parser version mismatch")
+            if payload.get("format") != _FORMAT_VERSION:
+                raise ValueError("entry format mismatch")
+            entry = ParseCacheEntry(
+                sheets=[_decode_sheet(item) for item in payload["sheets"]],
+                warnings=list(payload["warnings"]),
+            )
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(key)
+                self._stats.misses += 1
+            return None
+        except Exception as exc:
+            logger.warning("Parse cache entry %s is unreadable, dropping: %s", key, exc)
+            with self._lock:
+                self._forget(key)
+                self._stats.misses += 1
+            path.unlink(missing_ok=True)
+            return None
+
+        with self._lock:
+            self._stats.hits += 1
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            else:
+                self._entries[key] = len(raw)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, sheets: List[SheetModel], warnings: Optional[List[str]] = None) -> None:
+        payload = {
+            "parser_version": PARSER_VERSION,
+            "format": _FORMAT_VERSION,
+            "sheets": [_encode_sheet(sheet) for sheet in sheets],
+            "warnings": list(warnings or []),
+        }
+        raw = zlib.compress(
+            json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            level=6,
+        )
+        if len(raw) > self._max_bytes:
+            logger.debug("Parse cache entry %s (%d bytes) exceeds cache size, not stored", key, len(raw))
+            return
+
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(raw)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._forget(key)
+            self._entries[key] = len(raw)
+            self._stats.stores += 1
+            self._evict()
+
+    def stats(self) -> ParseCacheStats:
+        with self._lock:
+            return ParseCacheStats(
+                hits=self._stats.hits,
+                misses=self._stats.misses,
+                stores=self._stats.stores,
+                evictions=self._stats.evictions,
+                entries=len(self._entries),
+                total_bytes=sum(self._entries.values()),
+            )
+
+    # ------------------------------------------------------------------
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{key}{_SUFFIX}"
+
+    def _scan(self) -> None:
+        found = []
+        for path in self._dir.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            found.append((stat.st_mtime, path.name[: -len(_SUFFIX)], stat.st_size))
+        for _, key, size in sorted(found):
+            self._entries[key] = size
+        self._evict()
+
+    def _forget(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def _evict(self) -> None:
+        total = sum(self._entries.values())
+        while self._entries and total > self._max_bytes:
+            key, size = self._entries.popitem(last=False)
+            self._path(key).unlink(missing_ok=True)
+            total -= size
+            self._stats.evictions += 1
+
+
+def build_parse_cache() -> Optional[ParseCache]:
+    """Создаёт кэш по настройкам; None, если кэш выключен."""
+    if not config.PARSE_CACHE_ENABLED:
+        return None
+    return ParseCache(config.PARSE_CACHE_DIR, config.PARSE_CACHE_MAX_BYTES)
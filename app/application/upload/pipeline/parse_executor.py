@@ -0,0 +1,213 @@
+"""
+Исполнители тяжёлой части upload pipeline: чтение книги и парсинг всех листов.
+
+ProcessPoolParseExecutor выносит CPU-работу в отдельные процессы, чтобы она не
+держала event loop и GIL процесса API. В родительский процесс возвращается
+только компактный результат — список SheetModel; DataFrame листов остаются
+в worker'е. Файл из spool передаётся путём (WorkbookParseJob.path) и читается
+уже исполнителем, так что байты книги не проходят через родительский процесс.
+InlineParseExecutor выполняет то же самое в текущем процессе
+(тесты, отладка, PARSE_EXECUTOR=inline).
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Protocol
+
+from app.application.parsing.registry import ParsingStrategyRegistry
+from app.application.upload.pipeline.context import UploadPipelineContext
+from app.application.upload.pipeline.steps.ProcessSheetsStep import ProcessSheetsStep
+from app.application.upload.pipeline.steps.ReadWorkbookStep import ReadWorkbookStep
+from app.core.exceptions import CriticalUploadError
+from app.domain.file.models import FileInfo
+from app.domain.form.models import FormInfo
+from app.domain.sheet.models import SheetModel
+from config.config import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WorkbookParseJob:
+    """
+    Всё, что нужно для парсинга книги вне upload-контекста (должно пиклиться).
+
+    Содержимое — либо content, либо файл по path (читается при парсинге).
+    """
+
+    filename: str
+    form_info: FormInfo
+    content: bytes = b""
+    file_info: Optional[FileInfo] = None
+    path: Optional[Path] = None
+
+
+@dataclass
+class WorkbookParseResult:
+    """Компактный результат парсинга книги."""
+
+    sheets: List[SheetModel] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+
+class ParseExecutor(Protocol):
+    async def parse(self, job: WorkbookParseJob) -> WorkbookParseResult: ...
+
+    def shutdown(self) -> None: ...
+
+
+async def parse_workbook(
+    job: WorkbookParseJob,
+    parsing_registry: ParsingStrategyRegistry | None = None,
+) -> WorkbookParseResult:
+    """ReadWorkbookStep + ProcessSheetsStep над изолированным контекстом."""
+    ctx = UploadPipelineContext(
+        form_id=job.form_info.id,
+        form_info=job.form_info,
+        file=None,
+        filename=job.filename,
+        file_content=_read_job_content(job),
+        file_info=job.file_info,
+    )
+    await ReadWorkbookStep().execute(ctx)
+    await ProcessSheetsStep(parsing_registry=parsing_registry).execute(ctx)
+    return WorkbookParseResult(sheets=ctx.sheets, warnings=ctx.warnings)
+
+
+def _read_job_content(job: WorkbookParseJob) -> bytes:
+    if job.content or job.path is None:
+        return job.content
+    try:
+        return job.path.read_bytes()
+    except OSError as exc:
+        raise CriticalUploadError(
+            message=f"Failed to read file '{job.filename}': {exc}",
+            domain="upload.read_file",
+            http_status=500,
+            meta={"file_name": job.filename, "error": str(exc)},
+        ) from exc
+
+
+def _parse_workbook_in_worker(job: WorkbookParseJob) -> WorkbookParseResult:
+    """Точка входа в процессе-worker'е: глобальный реестр стратегий, свой event loop."""
+    return asyncio.run(parse_workbook(job))
+
+
+class InlineParseExecutor:
+    """Парсинг в текущем процессе и текущем event loop."""
+
+    def __init__(self, parsing_registry: ParsingStrategyRegistry | None = None) -> None:
+        self._parsing_registry = parsing_registry
+
+    async def parse(self, job: WorkbookParseJob) -> WorkbookParseResult:
+        return await parse_workbook(job, self._parsing_registry)
+
+    def shutdown(self) -> None:
+        return None
+
+
+class ProcessPoolParseExecutor:
+    """
+    Парсинг в пуле процессов.
+
+    max_tasks_per_child ограничивает число файлов на один процесс — после этого
+    процесс пересоздаётся и возвращает накопленную память (pandas/openpyxl
+    фрагментируют кучу). На Python < 3.11 пул пересоздаётся целиком после
+    max_workers * max_tasks_per_child заданий.
+
+    Пул создаётся лениво при первом задании; упавший пул (BrokenProcessPool)
+    пересоздаётся, а текущий файл завершается CriticalUploadError.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_tasks_per_child: int | None = None,
+    ) -> None:
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._max_tasks_per_child = max_tasks_per_child or None
+        self._pool: ProcessPoolExecutor | None = None
+        self._submitted = 0
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    async def parse(self, job: WorkbookParseJob) -> WorkbookParseResult:
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        try:
+            return await loop.run_in_executor(pool, _parse_workbook_in_worker, job)
+        except BrokenProcessPool as exc:
+            self._discard_pool(pool)
+            raise CriticalUploadError(
+                message=f"Parse worker crashed while processing '{job.filename}'",
+                domain="upload.parse_executor",
+                http_status=500,
+                meta={"file_name": job.filename, "error": str(exc)},
+            ) from exc
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        recycle_after = None
+        if self._max_tasks_per_child and sys.version_info < (3, 11):
+            recycle_after = self._max_workers * self._max_tasks_per_child
+
+        if self._pool is not None and recycle_after and self._submitted >= recycle_after:
+            # Запущенные задания дорабатывают в старом пуле.
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+        if self._pool is None:
+            self._pool = self._create_pool()
+            self._submitted = 0
+
+        self._submitted += 1
+        return self._pool
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        # spawn: fork процесса с запущенным event loop и потоками драйвера Mongo небезопасен.
+        kwargs = {
+            "max_workers": self._max_workers,
+            "mp_context": multiprocessing.get_context("spawn"),
+        }
+        if self._max_tasks_per_child and sys.version_info >= (3, 11):
+            kwargs["max_tasks_per_child"] = self._max_tasks_per_child
+
+        logger.info(
+            "Parse worker pool started: workers=%d, max_tasks_per_child=%s",
+            self._max_workers,
+            self._max_tasks_per_child,
+        )
+        return ProcessPoolExecutor(**kwargs)
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        if self._pool is pool:
+            self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def build_parse_executor(
+    parsing_registry: ParsingStrategyRegistry | None = None,
+) -> ParseExecutor:
+    """Создаёт исполнитель по настройке PARSE_EXECUTOR (process | inline)."""
+    mode = (config.PARSE_EXECUTOR or "inline").strip().lower()
+    if mode == "process":
+        return ProcessPoolParseExecutor(
+            max_workers=config.PARSE_WORKERS or None,
+            max_tasks_per_child=config.PARSE_WORKER_MAX_TASKS or None,
+        )
+    if mode != "inline":
+        logger.warning("Unknown PARSE_EXECUTOR=%r, falling back to inline", config.PARSE_EXECUTOR)
+    return InlineParseExecutor(parsing_registry)
@@ -3,15 +3,16 @@ from typing import List
 
 from app.application.parsing.registry import ParsingStrategyRegistry
 from app.application.upload.pipeline.context import UploadPipelineContext
+from app.application.upload.pipeline.parse_cache import ParseCache
+from app.application.upload.pipeline.parse_executor import InlineParseExecutor, ParseExecutor
 from app.application.upload.pipeline.steps.AcquireFileRecordStep import AcquireFileRecordStep
 from app.application.upload.pipeline.steps.BaseUploadPipelineStep import UploadPipelineStep
 from app.application.upload.pipeline.steps.EnrichFlatDataStep import EnrichFlatDataStep
 from app.application.upload.pipeline.steps.ExtractMetadataStep import ExtractMetadataStep
 from app.application.upload.pipeline.steps.FinalizeFileModelStep import FinalizeFileModelStep
+from app.application.upload.pipeline.steps.ParseWorkbookStep import ParseWorkbookStep
 from app.application.upload.pipeline.steps.PersistStep import PersistStep
-from app.application.upload.pipeline.steps.ProcessSheetsStep import ProcessSheetsStep
 from app.application.upload.pipeline.steps.ReadFileContentStep import ReadFileContentStep
-from app.application.upload.pipeline.steps.ReadWorkbookStep import ReadWorkbookStep
 from app.core.exceptions import (
     CriticalParsingError,
     CriticalUploadError,
@@ -20,37 +21,74 @@ from app.core.exceptions import (
     NonCriticalUploadError,
     log_app_error,
 )
-from app.core.profiling import PipelineProfiler
 
 logger = logging.getLogger(__name__)
 
 
 class UploadPipelineRunner:
-    """Запускает шаги загрузки и отображает все ошибки в состояние контекста."""
+    """
+    Запускает шаги загрузки и отображает все ошибки в состояние контекста.
 
-    def __init__(self, steps: List[UploadPipelineStep], data_save_service):
+    Шаги делятся на две фазы: steps — подготовка и парсинг (CPU),
+    persist_steps — запись в БД. run_for_file выполняет обе подряд;
+    UploadManager вызывает фазы раздельно, чтобы парсинг следующего файла
+    шёл параллельно с записью предыдущего. Ошибка любой фазы обрабатывается
+    одинаково — rollback записи файла.
+
+    Runner общий для всех файлов, поэтому профилировщик у каждого файла свой
+    (ctx.profiler): фазы разных файлов перекрываются.
+    """
+
+    def __init__(
+        self,
+        steps: List[UploadPipelineStep],
+        data_save_service,
+        persist_steps: List[UploadPipelineStep] | None = None,
+    ):
         self.steps = steps
+        self.persist_steps = persist_steps or []
         self.data_save_service = data_save_service
-        self.profiler = PipelineProfiler("Upload")
 
     async def run_for_file(self, ctx: UploadPipelineContext) -> None:
-        self.profiler.start()
-        
-        for step in self.steps:
-            self.profiler.increment_step()
+        await self.run_parse_phase(ctx)
+        if ctx.failed or ctx.skipped:
+            return
+        await self.run_persist_phase(ctx)
+
+    async def run_parse_phase(self, ctx: UploadPipelineContext) -> None:
+        ctx.profiler.start()
+        if await self._run_steps(ctx, self.steps) and ctx.skipped:
+            ctx.profiler.finish()
+
+    async def run_persist_phase(self, ctx: UploadPipelineContext) -> None:
+        if await self._run_steps(ctx, self.persist_steps):
+            ctx.profiler.finish()
+
+    async def _run_steps(self, ctx: UploadPipelineContext, steps: List[UploadPipelineStep]) -> bool:
+        """Выполняет шаги; False — файл завершился ошибкой (ctx.failed выставлен)."""
+        for step in steps:
+            ctx.profiler.increment_step()
+            ctx.report_stage(step=step.__class__.__name__)
             try:
                 await step.execute(ctx)
+                if ctx.skipped:
+                    logger.info(
+                        "Pipeline short-circuited after %s for '%s'",
+                        step.__class__.__name__,
+                        ctx.filename,
+                    )
+                    break
 
             except (CriticalUploadError, CriticalParsingError) as error:
                 log_app_error(error)
                 await self._handle_critical_error(ctx, error)
-                return
+                return False
 
             except DuplicateFileError as error:
                 log_app_error(error)
                 ctx.failed = True
                 ctx.error = error.message
-                return
+                return False
 
             except (NonCriticalUploadError, NonCriticalParsingError) as error:
                 ctx.warnings.append(error.message)
@@ -71,9 +109,9 @@ class UploadPipelineRunner:
                 )
                 log_app_error(error, exc_info=True)
                 await self._handle_critical_error(ctx, error)
-                return
-        
-        self.profiler.finish()
+                return False
+
+        return True
 
     async def _handle_critical_error(self, ctx: UploadPipelineContext, error: Exception) -> None:
         """Помечает контекст как неуспешный и делает rollback записи файла, если возможно."""
@@ -102,16 +140,29 @@ def build_default_pipeline(
     file_service,
     data_save_service,
     parsing_registry: ParsingStrategyRegistry | None = None,
+    parse_executor: ParseExecutor | None = None,
+    parse_cache: ParseCache | None = None,
 ) -> UploadPipelineRunner:
-    """Собирает upload pipeline по умолчанию."""
+    """
+    Собирает upload pipeline по умолчанию.
+
+    Без parse_executor чтение и парсинг книги выполняются в текущем процессе,
+    без parse_cache результаты парсинга не кэшируются.
+    PersistStep вынесен в отдельную фазу (persist_steps).
+    """
+    if parse_executor is None:
+        parse_executor = InlineParseExecutor(parsing_registry)
+
     steps: List[UploadPipelineStep] = [
         AcquireFileRecordStep(file_service),
         ReadFileContentStep(),
         ExtractMetadataStep(file_service),
-        ReadWorkbookStep(),
-        ProcessSheetsStep(parsing_registry=parsing_registry),
+        ParseWorkbookStep(parse_executor, cache=parse_cache),
         FinalizeFileModelStep(),
         EnrichFlatDataStep(),
-        PersistStep(data_save_service),
     ]
-    return UploadPipelineRunner(steps=steps, data_save_service=data_save_service)
+    return UploadPipelineRunner(
+        steps=steps,
+        data_save_service=data_save_service,
+        persist_steps=[PersistStep(data_save_service)],
+    )
@@ -1,25 +1,46 @@
 ﻿import logging
 from io import BytesIO
-from typing import Dict
 
 import pandas as pd
 
+from config.config import config
+
+from .LazyWorkbook import LazyWorkbook
+
 logger = logging.getLogger(__name__)
 
+READER_ENGINES = ("calamine", "pandas")
+
 
 class ExcelReader:
-    """Читатель Excel-файлов на уровне application."""
+    """
+    Читатель Excel-файлов на уровне application.
+
+    engine (по умолчанию EXCEL_READER_ENGINE) — как строится DataFrame листа:
+    "calamine" — из ячеек calamine через SheetGrid, "pandas" — pd.ExcelFile.parse.
+    trim_used_range (по умолчанию EXCEL_TRIM_USED_RANGE) — отрезать пустой хвост листа.
+    """
+
+    def __init__(self, engine: str | None = None, trim_used_range: bool | None = None) -> None:
+        engine = engine or config.EXCEL_READER_ENGINE
+        if engine not in READER_ENGINES:
+            raise ValueError(f"Unknown Excel reader engine '{engine}', expected one of {READER_ENGINES}")
+        self._engine = engine
+        self._trim_used_range = (
+            config.EXCEL_TRIM_USED_RANGE if trim_used_range is None else trim_used_range
+        )
 
-    def read(self, content: bytes, filename: str) -> Dict[str, pd.DataFrame]:
+    def read(self, content: bytes, filename: str) -> LazyWorkbook:
         """
-        Читает все листы Excel из байтов в памяти через pandas + calamine.
+        Открывает Excel из байтов в памяти через pandas + calamine.
 
         Args:
             content: Содержимое Excel-файла в байтах (из ctx.file_content)
             filename: Имя файла для логирования (из ctx.filename)
 
         Returns:
-            Dict[str, pd.DataFrame]: {имя_листа: DataFrame без заголовков}
+            LazyWorkbook: {имя_листа: DataFrame без заголовков}; лист читается
+            при обращении к нему, пустые листы не входят
 
         Raises:
             ValueError: если file_content пустой
@@ -29,6 +50,7 @@ class ExcelReader:
             - Использует engine='calamine' (поддерживает .xls, .xlsx, .xlsm)
             - header=None: заголовки парсит parsing pipeline
             - dtype=object: отключена автотипизация pandas
+            - книгу нужно закрыть (LazyWorkbook.close) после чтения листов
         """
         if not content:
             raise ValueError(f"Пустое содержимое файла '{filename}'")
@@ -41,13 +63,7 @@ class ExcelReader:
 
         self._validate_excel_format(content, filename)
         try:
-            sheets = pd.read_excel(
-                BytesIO(content),
-                sheet_name=None,
-                header=None,
-                dtype=object,
-                engine="calamine",
-            )
+            excel_file = pd.ExcelFile(BytesIO(content), engine="calamine")
         except Exception as e:
             logger.error(
                 "ExcelReader: ошибка чтения '%s': %s",
@@ -58,32 +74,18 @@ class ExcelReader:
                 f"Ошибка чтения Excel файла '{filename}': {str(e)}"
             ) from e
 
-        result: Dict[str, pd.DataFrame] = {}
-
-        for sheet_name, df in sheets.items():
-            if df is None or df.empty:
-                logger.debug(
-                    "ExcelReader: лист '%s' пустой, пропуск",
-                    sheet_name,
-                )
-                continue
-
-            result[sheet_name] = df
-
-            logger.debug(
-                "ExcelReader: лист '%s' прочитан (%d × %d)",
-                sheet_name,
-                len(df),
-                len(df.columns),
-            )
-
-        logger.info(
-            "ExcelReader: прочитано %d листов из файла %s",
-            len(result),
+        logger.debug(
+            "ExcelReader: в файле %s листов: %d",
             filename,
+            len(excel_file.sheet_names),
         )
 
-        return result
+        return LazyWorkbook(
+            excel_file,
+            filename,
+            engine=self._engine,
+            trim_used_range=self._trim_used_range,
+        )
 
     def _validate_excel_format(self, content: bytes, filename: str) -> None:
         """
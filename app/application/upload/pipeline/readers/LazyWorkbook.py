@@ -0,0 +1,142 @@
+import logging
+from collections.abc import Iterator, Mapping
+from typing import List
+
+import pandas as pd
+
+from .SheetGrid import SheetGrid, used_range
+
+logger = logging.getLogger(__name__)
+
+
+class LazyWorkbook(Mapping):
+    """
+    Листы книги как {имя_листа: DataFrame}, читаемые по требованию.
+
+    Книга открывается один раз (pd.ExcelFile, calamine). Имена листов берутся
+    из метаданных, DataFrame строится только при обращении к листу — листы,
+    которые стратегия пропускает, в DataFrame не превращаются.
+
+    Пустые листы, как и раньше в ExcelReader, в книгу не входят: это влияет на
+    sheet_index (skip_sheets). Пустота проверяется по размеру диапазона
+    calamine без конвертации ячеек в Python-объекты.
+
+    DataFrame не кэшируются: каждый __getitem__ читает лист заново.
+
+    engine: "calamine" — DataFrame строится из SheetGrid напрямую из ячеек
+    calamine; "pandas" — через ExcelFile.parse (TextParser). Результат одинаков.
+
+    trim_used_range: пустые строки ниже и столбцы правее последнего значения
+    отрезаются до того, как лист попадёт в parsing pipeline (форматирование
+    на весь столбец, тысячи пустых строк под таблицей).
+    """
+
+    def __init__(
+        self,
+        excel_file: pd.ExcelFile,
+        filename: str,
+        engine: str = "calamine",
+        trim_used_range: bool = True,
+    ) -> None:
+        self._excel_file = excel_file
+        self._filename = filename
+        self._engine = engine
+        self._trim_used_range = trim_used_range
+        self._candidates: List[str] = list(excel_file.sheet_names)
+        self._names: List[str] = []
+        self._checked = 0
+        self.loaded: List[str] = []
+
+    def __iter__(self) -> Iterator[str]:
+        index = 0
+        while True:
+            if index < len(self._names):
+                yield self._names[index]
+                index += 1
+            elif not self._check_next():
+                return
+
+    def __len__(self) -> int:
+        while self._check_next():
+            pass
+        return len(self._names)
+
+    def __contains__(self, sheet_name: object) -> bool:
+        return sheet_name in iter(self)
+
+    def __getitem__(self, sheet_name: str) -> pd.DataFrame:
+        if sheet_name not in self:
+            raise KeyError(sheet_name)
+        if self._engine == "pandas":
+            try:
+                df = self._excel_file.parse(sheet_name, header=None, dtype=object)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Ошибка чтения листа '{sheet_name}' файла '{self._filename}': {str(e)}"
+                ) from e
+        else:
+            grid = self.grid(sheet_name)
+            df = grid.to_dataframe()
+
+        if self._trim_used_range and not df.empty:
+            values = grid.values if self._engine != "pandas" else df.to_numpy()
+            rows, cols = used_range(values)
+            if (rows, cols) != df.shape:
+                logger.info(
+                    "ExcelReader: лист '%s' файла %s обрезан по используемому диапазону: %d × %d → %d × %d",
+                    sheet_name,
+                    self._filename,
+                    df.shape[0],
+                    df.shape[1],
+                    rows,
+                    cols,
+                )
+                df = df.iloc[:rows, :cols]
+
+        self.loaded.append(sheet_name)
+        logger.debug(
+            "ExcelReader: лист '%s' прочитан (%d × %d)",
+            sheet_name,
+            len(df),
+            len(df.columns),
+        )
+        return df
+
+    def grid(self, sheet_name: str) -> SheetGrid:
+        """Ячейки листа как SheetGrid, минуя DataFrame."""
+        try:
+            rows = self._excel_file.book.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False)
+            return SheetGrid.from_rows(rows)
+        except Exception as e:
+            raise RuntimeError(
+                f"Ошибка чтения листа '{sheet_name}' файла '{self._filename}': {str(e)}"
+            ) from e
+
+    def close(self) -> None:
+        logger.info(
+            "ExcelReader: из файла %s прочитано %d листов из %d",
+            self._filename,
+            len(self.loaded),
+            len(self._candidates),
+        )
+        self._excel_file.close()
+
+    def __enter__(self) -> "LazyWorkbook":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _check_next(self) -> bool:
+        """Проверяет очередной лист на пустоту; False — листы закончились."""
+        if self._checked >= len(self._candidates):
+            return False
+        sheet_name = self._candidates[self._checked]
+        self._checked += 1
+
+        sheet = self._excel_file.book.get_sheet_by_name(sheet_name)
+        if sheet.height == 0 or sheet.width == 0:
+            logger.debug("ExcelReader: лист '%s' пустой, пропуск", sheet_name)
+        else:
+            self._names.append(sheet_name)
+        return True
@@ -0,0 +1,109 @@
+from datetime import date, timedelta
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas._libs.parsers import STR_NA_VALUES
+
+# Одно определение «пустой» ячейки для reader'а и парсинга.
+from app.domain.parsing import EMPTY_CELL_STRINGS, INT64_FLOAT_LIMIT, cell_types
+
+_NA_STRINGS = np.array(sorted(STR_NA_VALUES), dtype=object)
+
+
+def used_range(values: np.ndarray) -> Tuple[int, int]:
+    """
+    Число строк и столбцов до последней непустой ячейки включительно.
+
+    Пустая ячейка — NaN/None или строка, которая после strip().lower()
+    совпадает с одним из EMPTY_CELL_STRINGS (служебные _x0000_ и т.п.).
+    Для листа без значений (в том числе из одних оформленных пустых ячеек) — (0, 0).
+    """
+    if values.size == 0:
+        return 0, 0
+
+    filled = ~pd.isna(values)
+    strings = filled & (cell_types(values) == str)
+    if strings.any():
+        normalized = np.char.lower(np.char.strip(values[strings].astype(str)))
+        filled[strings] = ~np.isin(normalized, list(EMPTY_CELL_STRINGS))
+
+    rows = np.flatnonzero(filled.any(axis=1))
+    if rows.size == 0:
+        return 0, 0
+    cols = np.flatnonzero(filled.any(axis=0))
+    return int(rows[-1]) + 1, int(cols[-1]) + 1
+
+
+class SheetGrid:
+    """
+    Ячейки листа в виде 2-D object ndarray — без построения DataFrame через
+    TextParser, как это делает pd.read_excel.
+
+    Значения приводятся так же, как в pandas (engine="calamine", header=None,
+    dtype=object): целые float → int, даты → Timestamp, строки из списка
+    NA-значений pandas и пустые ячейки → NaN. to_dataframe() даёт тот же
+    DataFrame, что pd.read_excel, без копирования массива: шаги парсинга
+    работают с DataFrame, поэтому сетка на object ndarray и заканчивается.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self, values: np.ndarray) -> None:
+        self.values = values
+
+    @classmethod
+    def from_rows(cls, rows: List[list]) -> "SheetGrid":
+        """
+        Строит сетку из CalamineSheet.to_python(skip_empty_area=False).
+        rows очищается: после копирования в массив строки не нужны.
+        """
+        if not rows:
+            return cls(np.empty((0, 0), dtype=object))
+
+        values = np.empty((len(rows), len(rows[0])), dtype=object)
+        values[:] = rows
+        rows.clear()
+        types = cell_types(values)
+
+        floats = types == float
+        if floats.any():
+            as_float = values[floats].astype(np.float64)
+            integral = (np.abs(as_float) < INT64_FLOAT_LIMIT) & (np.floor(as_float) == as_float)
+            converted = values[floats]
+            converted[integral] = as_float[integral].astype(np.int64).astype(object)
+            values[floats] = converted
+
+        strings = types == str
+        if strings.any():
+            na = np.zeros(values.shape, dtype=bool)
+            na[strings] = np.isin(values[strings], _NA_STRINGS)
+            values[na] = np.nan
+
+        # Даты и интервалы встречаются редко — приводим поштучно.
+        other = ~(floats | strings | (types == int) | (types == bool))
+        del types
+        for row, col in zip(*np.nonzero(other)):
+            value = values[row, col]
+            if isinstance(value, date):
+                values[row, col] = pd.Timestamp(value)
+            elif isinstance(value, timedelta):
+                values[row, col] = pd.Timedelta(value)
+
+        return cls(values)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.values.shape
+
+    def trimmed(self) -> "SheetGrid":
+        """Сетка без пустых строк снизу и пустых столбцов справа (view, без копии)."""
+        rows, cols = used_range(self.values)
+        if (rows, cols) == self.values.shape:
+            return self
+        return SheetGrid(self.values[:rows, :cols])
+
+    def to_dataframe(self) -> pd.DataFrame:
+        if self.values.size == 0:
+            return pd.DataFrame()
+        return pd.DataFrame(self.values, copy=False)
@@ -1,5 +1,7 @@
 ﻿"""Экспорт компонентов чтения workbook для upload pipeline."""
 
 from .ExcelReader import ExcelReader
+from .LazyWorkbook import LazyWorkbook
+from .SheetGrid import SheetGrid
 
-__all__ = ["ExcelReader"]
+__all__ = ["ExcelReader", "LazyWorkbook", "SheetGrid"]
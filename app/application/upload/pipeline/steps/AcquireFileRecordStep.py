@@ -1,5 +1,6 @@
 ﻿"""Шаг: получить или переиспользовать запись файла для жизненного цикла загрузки."""
 
+import hashlib
 import logging
 from datetime import datetime
 
@@ -11,9 +12,32 @@ from app.domain.file.service import FileService
 
 logger = logging.getLogger(__name__)
 
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+async def _hash_upload_file(ctx: UploadPipelineContext) -> str:
+    """SHA-256 содержимого загруженного файла, чтение чанками без буферизации целиком."""
+    digest = hashlib.sha256()
+    await ctx.file.seek(0)
+    while True:
+        chunk = await ctx.file.read(_HASH_CHUNK_SIZE)
+        if not chunk:
+            break
+        digest.update(chunk)
+    await ctx.file.seek(0)
+    return digest.hexdigest()
+
 
 class AcquireFileRecordStep:
-    """Получает запись файла и переводит её в статус PROCESSING."""
+    """
+    Получает запись файла и переводит её в статус PROCESSING.
+
+    Считает SHA-256 содержимого (если он не посчитан при приёме файла) и
+    сохраняет его в file_model.content_hash. В режиме
+    options.skip_identical_content файл с уже успешно загруженным тем же
+    содержимым не обрабатывается: в контекст кладётся существующая запись,
+    ctx.skipped = True, запись текущего имени файла не создаётся.
+    """
 
     def __init__(self, file_service: FileService):
         self._file_service = file_service
@@ -46,6 +70,26 @@ class AcquireFileRecordStep:
                     },
                 )
 
+            if not ctx.content_hash:
+                ctx.content_hash = await _hash_upload_file(ctx)
+
+            if ctx.options.skip_identical_content:
+                identical = await self._file_service.get_by_content_hash(
+                    ctx.content_hash,
+                    FileStatus.SUCCESS,
+                    ctx.form_id,
+                )
+                if identical:
+                    ctx.file_model = identical
+                    ctx.skipped = True
+                    logger.info(
+                        "File '%s' has the same content as already uploaded '%s' (file_id=%s), skipping",
+                        ctx.filename,
+                        identical.filename,
+                        identical.file_id,
+                    )
+                    return
+
             file_model = await self._file_service.get_by_filename(ctx.filename, ctx.form_id)
             if not file_model:
                 file_model = FileModel.create_processing(
@@ -60,6 +104,7 @@ class AcquireFileRecordStep:
             file_model.error = None
             file_model.sheets = []
             file_model.flat_data_size = 0
+            file_model.content_hash = ctx.content_hash
             file_model.updated_at = datetime.now()
 
             await self._file_service.update_or_create(file_model)
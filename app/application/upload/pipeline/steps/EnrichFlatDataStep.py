@@ -24,9 +24,9 @@ class EnrichFlatDataStep:
                 meta={"file_name": ctx.filename},
             )
 
-        reporter = (ctx.file_model.reporter or "").upper()
-        for rec in ctx.flat_data:
-            rec.file_id = ctx.file_model.file_id
-            rec.form = ctx.form_id
-            rec.year = ctx.file_model.year
-            rec.reporter = reporter
+        ctx.flat_data.stamp(
+            file_id=ctx.file_model.file_id,
+            form=ctx.form_id,
+            year=ctx.file_model.year,
+            reporter=(ctx.file_model.reporter or "").upper(),
+        )
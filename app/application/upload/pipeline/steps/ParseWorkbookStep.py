@@ -0,0 +1,94 @@
+"""Шаг: прочитать книгу и распарсить листы через исполнитель (пул процессов или inline)."""
+
+import asyncio
+import logging
+
+from app.application.upload.pipeline.context import UploadPipelineContext
+from app.application.upload.pipeline.parse_cache import make_cache_key
+from app.core.exceptions import CriticalUploadError
+from app.core.profiling import profile_step
+
+logger = logging.getLogger(__name__)
+
+
+class ParseWorkbookStep:
+    """
+    Заменяет пару ReadWorkbookStep + ProcessSheetsStep в upload pipeline.
+
+    Оба шага выполняются исполнителем как одно задание; в контекст попадает
+    только результат — ctx.sheets и предупреждения. ctx.workbook_sheets
+    в этом режиме не заполняется.
+
+    С кэшем (ParseCache) результат для уже встречавшегося содержимого берётся
+    с диска без парсинга — вместе с предупреждениями парсинга. options.bypass_parse_cache пропускает чтение из
+    кэша, но свежий результат всё равно сохраняется.
+
+    Этапы по листам (ctx.report_stage) исполнитель в другом процессе
+    отдать не может — они воспроизводятся по готовому результату.
+    """
+
+    def __init__(self, executor, cache=None) -> None:
+        self._executor = executor
+        self._cache = cache
+
+    @profile_step()
+    async def execute(self, ctx: UploadPipelineContext) -> None:
+        from app.application.upload.pipeline.parse_executor import WorkbookParseJob
+
+        if not ctx.file_model:
+            raise CriticalUploadError(
+                message="file_model must be set before ParseWorkbookStep",
+                domain="upload.parse_workbook",
+                http_status=500,
+                meta={"file_name": ctx.filename},
+            )
+
+        cache_key = None
+        if self._cache is not None and ctx.content_hash:
+            cache_key = make_cache_key(ctx.content_hash, ctx.form_info)
+            if not ctx.options.bypass_parse_cache:
+                cached = await asyncio.to_thread(self._cache.get, cache_key)
+                if cached is not None:
+                    ctx.set_sheets(cached.sheets)
+                    ctx.warnings.extend(cached.warnings)
+                    self._report_sheets(ctx)
+                    logger.info(
+                        "Workbook parse result taken from cache: file='%s', sheets=%d, records=%d",
+                        ctx.filename,
+                        len(ctx.sheets),
+                        len(ctx.flat_data),
+                    )
+                    return
+
+        job = WorkbookParseJob(
+            filename=ctx.filename,
+            form_info=ctx.form_info,
+            content=ctx.file_content or b"",
+            file_info=ctx.file_info,
+            path=ctx.file_path,
+        )
+        result = await self._executor.parse(job)
+
+        ctx.set_sheets(result.sheets)
+        ctx.warnings.extend(result.warnings)
+        self._report_sheets(ctx)
+
+        if cache_key is not None:
+            try:
+                await asyncio.to_thread(self._cache.put, cache_key, ctx.sheets, result.warnings)
+            except Exception as exc:
+                logger.warning("Failed to store parse result in cache for '%s': %s", ctx.filename, exc)
+
+        logger.info(
+            "Workbook parsed: file='%s', sheets=%d, records=%d",
+            ctx.filename,
+            len(ctx.sheets),
+            len(ctx.flat_data),
+        )
+
+    @staticmethod
+    def _report_sheets(ctx: UploadPipelineContext) -> None:
+        rows = 0
+        for sheet in ctx.sheets:
+            rows += len(sheet.flat_data)
+            ctx.report_stage(sheet=sheet.sheet_fullname, rows=rows)
@@ -1,7 +1,6 @@
 """Шаг парсинга листов рабочей книги через parsing-pipeline."""
 
 import logging
-from typing import Optional
 
 from app.application.parsing.context import ParsingPipelineContext
 from app.application.parsing.registry import ParsingStrategyRegistry
@@ -15,27 +14,28 @@ logger = logging.getLogger(__name__)
 
 
 class ProcessSheetsStep:
-    """Парсит листы рабочей книги и сохраняет список SheetModel в контекст."""
+    """
+    Парсит листы рабочей книги и сохраняет список SheetModel в контекст.
+
+    Не зависит от file_model: выполняется в том числе в процессе-worker'е
+    (см. parse_executor), где записи файла нет.
+
+    Лист читается из ctx.workbook_sheets только после того, как стратегия его
+    приняла; по окончании книга закрывается.
+    """
 
     def __init__(self, parsing_registry: ParsingStrategyRegistry | None = None) -> None:
         self._parsing_registry = parsing_registry
 
     @profile_step()
     async def execute(self, ctx: UploadPipelineContext) -> None:
-        if not ctx.file_model:
-            raise CriticalUploadError(
-                message="file_model must be set before ProcessSheetsStep",
-                domain="upload.process_sheets",
-                http_status=500,
-                meta={"file_name": ctx.filename},
-            )
-
         if self._parsing_registry is None:
             from app.application.parsing.registry import get_parsing_strategy_registry
 
             self._parsing_registry = get_parsing_strategy_registry()
 
         parsed_sheets: list[SheetModel] = []
+        rows = 0
         workbook_source: ParsingWorkbookSource | None = None
         if ctx.file_content is not None and ctx.file_info is not None:
             workbook_source = ParsingWorkbookSource(
@@ -43,16 +43,32 @@ class ProcessSheetsStep:
                 extension=ctx.file_info.extension or "",
             )
 
-        for sheet_index, (sheet_name, dataframe) in enumerate(ctx.workbook_sheets.items()):
-            parsed_sheet = await self._parse_sheet(
-                ctx=ctx,
-                sheet_name=sheet_name,
-                sheet_index=sheet_index,
-                dataframe=dataframe,
-                workbook_source=workbook_source,
-            )
-            if parsed_sheet is not None:
+        try:
+            for sheet_index, sheet_name in enumerate(ctx.workbook_sheets):
+                pipeline = self._parsing_registry.build_pipeline_for_sheet(
+                    form_info=ctx.form_info,
+                    sheet_name=sheet_name,
+                    sheet_index=sheet_index,
+                )
+                if pipeline is None:
+                    continue
+
+                parsed_sheet = await self._parse_sheet(
+                    ctx=ctx,
+                    pipeline=pipeline,
+                    sheet_name=sheet_name,
+                    dataframe=self._load_sheet(ctx, sheet_name),
+                    workbook_source=workbook_source,
+                )
                 parsed_sheets.append(parsed_sheet)
+                rows += len(parsed_sheet.flat_data)
+                ctx.report_stage(sheet=sheet_name, rows=rows)
+        finally:
+            close = getattr(ctx.workbook_sheets, "close", None)
+            if close is not None:
+                close()
+            if workbook_source is not None:
+                workbook_source.close()
 
         if not parsed_sheets:
             raise CriticalUploadError(
@@ -62,7 +78,7 @@ class ProcessSheetsStep:
                 meta={"file_name": ctx.filename},
             )
 
-        ctx.sheets = parsed_sheets
+        ctx.set_sheets(parsed_sheets)
         logger.info(
             "Sheet parsing completed. file='%s', parsed_sheets=%d, records=%d",
             ctx.filename,
@@ -70,22 +86,26 @@ class ProcessSheetsStep:
             len(ctx.flat_data),
         )
 
+    @staticmethod
+    def _load_sheet(ctx: UploadPipelineContext, sheet_name: str):
+        try:
+            return ctx.workbook_sheets[sheet_name]
+        except Exception as exc:
+            raise CriticalUploadError(
+                message=f"Failed to read sheet '{sheet_name}' for '{ctx.filename}': {exc}",
+                domain="upload.read_workbook",
+                http_status=400,
+                meta={"sheet_name": sheet_name, "file_name": ctx.filename, "error": str(exc)},
+            ) from exc
+
     async def _parse_sheet(
         self,
         ctx: UploadPipelineContext,
+        pipeline,
         sheet_name: str,
-        sheet_index: int,
         dataframe,
         workbook_source: ParsingWorkbookSource | None,
-    ) -> Optional[SheetModel]:
-        pipeline = self._parsing_registry.build_pipeline_for_sheet(
-            form_info=ctx.form_info,
-            sheet_name=sheet_name,
-            sheet_index=sheet_index,
-        )
-        if pipeline is None:
-            return None
-
+    ) -> SheetModel:
         sheet_model = SheetModel(sheet_fullname=sheet_name)
         parsing_ctx = ParsingPipelineContext(
             sheet_model=sheet_model,
@@ -114,7 +134,7 @@ class ProcessSheetsStep:
         logger.debug(
             "Sheet parsed: '%s', records=%d, warnings=%d",
             sheet_model.sheet_name or sheet_name,
-            len(sheet_model.flat_data_records),
+            len(sheet_model.flat_data),
             len(sheet_model.warnings),
         )
         return sheet_model
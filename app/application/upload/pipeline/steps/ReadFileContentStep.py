@@ -8,21 +8,29 @@ logger = logging.getLogger(__name__)
 
 
 class ReadFileContentStep:
-    """Один раз читает загруженный поток и кэширует байты в контексте."""
+    """
+    Один раз читает загруженный поток и кэширует байты в контексте.
+
+    Файл из spool (ctx.file_path) в память не читается — только проверяется,
+    что он не пуст: книгу по пути читает исполнитель парсинга, и в процессе
+    API не копятся байты всех файлов, ожидающих парсинга.
+    """
 
     @profile_step()
     async def execute(self, ctx: UploadPipelineContext) -> None:
         try:
+            if ctx.file_path is not None:
+                size = ctx.file_path.stat().st_size
+                if not size:
+                    raise self._empty_file_error(ctx)
+                logger.info("File '%s' left on disk for parsing: %d bytes", ctx.filename, size)
+                return
+
             await ctx.file.seek(0)
             content = await ctx.file.read()
 
             if not content:
-                raise CriticalUploadError(
-                    message="Uploaded file is empty",
-                    domain="upload.read_file",
-                    http_status=400,
-                    meta={"file_name": ctx.filename},
-                )
+                raise self._empty_file_error(ctx)
 
             ctx.file_content = content
             logger.info("File '%s' loaded into memory: %d bytes", ctx.filename, len(content))
@@ -36,3 +44,12 @@ class ReadFileContentStep:
                 http_status=500,
                 meta={"file_name": ctx.filename, "error": str(exc)},
             ) from exc
+
+    @staticmethod
+    def _empty_file_error(ctx: UploadPipelineContext) -> CriticalUploadError:
+        return CriticalUploadError(
+            message="Uploaded file is empty",
+            domain="upload.read_file",
+            http_status=400,
+            meta={"file_name": ctx.filename},
+        )
@@ -7,7 +7,10 @@ from app.core.profiling import profile_step
 
 
 class ReadWorkbookStep:
-    """Преобразует байты файла в словарь листов рабочей книги."""
+    """
+    Открывает книгу из байтов файла. Листы читаются позже, в ProcessSheetsStep,
+    и только те, которые принимает стратегия парсинга.
+    """
 
     def __init__(self, excel_reader: ExcelReader | None = None) -> None:
         self._excel_reader = excel_reader or ExcelReader()
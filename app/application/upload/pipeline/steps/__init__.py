@@ -5,6 +5,7 @@ from .BaseUploadPipelineStep import UploadPipelineStep
 from .EnrichFlatDataStep import EnrichFlatDataStep
 from .ExtractMetadataStep import ExtractMetadataStep
 from .FinalizeFileModelStep import FinalizeFileModelStep
+from .ParseWorkbookStep import ParseWorkbookStep
 from .PersistStep import PersistStep
 from .ProcessSheetsStep import ProcessSheetsStep
 from .ReadFileContentStep import ReadFileContentStep
@@ -17,6 +18,7 @@ __all__ = [
     "AcquireFileRecordStep",
     "ReadWorkbookStep",
     "ProcessSheetsStep",
+    "ParseWorkbookStep",
     "FinalizeFileModelStep",
     "EnrichFlatDataStep",
     "PersistStep",
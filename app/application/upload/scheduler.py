@@ -0,0 +1,267 @@
+# app/application/upload/scheduler.py
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Deque, Dict, List, Optional
+
+from app.core.exceptions import UploadBackpressureError
+from config.config import config
+
+logger = logging.getLogger(__name__)
+
+# Относительная стоимость байта по расширению: xlsx/xlsm сжаты (zip), на байт
+# файла приходится в несколько раз больше ячеек, чем в BIFF (.xls).
+_EXTENSION_WEIGHTS: Dict[str, float] = {"xls": 1.0, "xlsx": 4.0, "xlsm": 4.0}
+_DEFAULT_WEIGHT = 4.0
+_MIN_FILE_COST = 64 * 1024
+
+
+def estimate_file_cost(size: int, filename: str) -> float:
+    """Оценка стоимости обработки файла в «взвешенных байтах»."""
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    weight = _EXTENSION_WEIGHTS.get(extension, _DEFAULT_WEIGHT)
+    return max(size, _MIN_FILE_COST) * weight
+
+
+@dataclass
+class IngestSchedulerStats:
+    queue_depth: int = 0            # файлов ждут запуска
+    queued_cost: float = 0.0        # стоимость принятых, но не запущенных файлов
+    running_files: int = 0
+    inflight_bytes: int = 0
+    admitted_uploads: int = 0
+    rejected_uploads: int = 0
+    started_files: int = 0
+    avg_wait_seconds: float = 0.0   # по последним запускам
+    max_wait_seconds: float = 0.0
+    throughput_cost_per_second: float = 0.0
+
+
+@dataclass
+class _Waiter:
+    size: int
+    cost: float
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class IngestTicket:
+    """Занятый слот планировщика; release() идемпотентен."""
+
+    waiter: _Waiter
+    started_at: float
+    released: bool = False
+
+
+class IngestScheduler:
+    """
+    Глобальный планировщик обработки загруженных файлов (один на процесс).
+
+    - admit() при POST /upload резервирует стоимость всей загрузки в очереди;
+      если очередь переполнена — UploadBackpressureError (429 + Retry-After).
+    - slot() ждёт, пока число выполняемых файлов и их суммарный объём не
+      опустятся ниже лимитов. Очередь справедливая: формы обслуживаются по
+      кругу, внутри формы — загрузки по кругу, внутри загрузки — по порядку.
+    - finish_upload() снимает неиспользованный резерв загрузки.
+
+    acquire()/release() — то же, что slot(), для случаев, когда слот
+    передаётся между задачами (парсинг → очередь записи).
+    """
+
+    _WAIT_WINDOW = 200
+
+    def __init__(
+        self,
+        *,
+        max_running_files: int | None = None,
+        max_inflight_bytes: int | None = None,
+        max_queued_cost: float | None = None,
+        default_retry_after: int | None = None,
+    ) -> None:
+        self._max_running = max(1, max_running_files or config.INGEST_MAX_RUNNING_FILES)
+        self._max_inflight_bytes = max_inflight_bytes or config.INGEST_MAX_INFLIGHT_BYTES
+        self._max_queued_cost = max_queued_cost or config.INGEST_MAX_QUEUED_COST
+        self._default_retry_after = default_retry_after or config.INGEST_RETRY_AFTER_SECONDS
+
+        # form_id -> upload_id -> очередь ожидающих файлов; OrderedDict = порядок обхода по кругу
+        self._queues: "OrderedDict[str, OrderedDict[str, Deque[_Waiter]]]" = OrderedDict()
+        self._reserved: Dict[str, float] = {}
+        self._running = 0
+        self._inflight_bytes = 0
+        self._waits: Deque[float] = deque(maxlen=self._WAIT_WINDOW)
+        self._stats = IngestSchedulerStats()
+        self._throughput = 0.0  # EWMA стоимости, обработанной за секунду
+
+    # ------------------------------------------------------------------
+    # Приём запроса
+    # ------------------------------------------------------------------
+
+    def admit(self, upload_id: str, form_id: str, files: List[tuple[int, str]]) -> None:
+        """
+        Резервирует место в очереди под файлы загрузки (size, filename).
+
+        Raises:
+            UploadBackpressureError — очередь заполнена
+        """
+        cost = sum(estimate_file_cost(size, name) for size, name in files)
+        queued = self._queued_cost()
+        # Пустую очередь не блокируем даже очень большой загрузкой — иначе она не пройдёт никогда.
+        if queued > 0 and queued + cost > self._max_queued_cost:
+            self._stats.rejected_uploads += 1
+            retry_after = self._retry_after(queued + cost - self._max_queued_cost)
+            logger.warning(
+                "Upload rejected by ingest scheduler: upload_id=%s, form=%s, cost=%.0f, queued=%.0f, retry_after=%ds",
+                upload_id,
+                form_id,
+                cost,
+                queued,
+                retry_after,
+            )
+            raise UploadBackpressureError(
+                message="Upload queue is full, retry later",
+                retry_after=retry_after,
+                meta={"upload_id": upload_id, "form_id": form_id, "queued_cost": queued},
+            )
+
+        self._reserved[upload_id] = self._reserved.get(upload_id, 0.0) + cost
+        self._stats.admitted_uploads += 1
+
+    def finish_upload(self, upload_id: str) -> None:
+        self._reserved.pop(upload_id, None)
+
+    # ------------------------------------------------------------------
+    # Запуск файлов
+    # ------------------------------------------------------------------
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        upload_id: str,
+        form_id: str,
+        size: int,
+        filename: str,
+    ) -> AsyncIterator[None]:
+        """Ждёт своей очереди и удерживает слот на время обработки файла."""
+        ticket = await self.acquire(upload_id, form_id, size, filename)
+        try:
+            yield
+        finally:
+            self.release(ticket)
+
+    async def acquire(self, upload_id: str, form_id: str, size: int, filename: str) -> "IngestTicket":
+        cost = estimate_file_cost(size, filename)
+        waiter = _Waiter(size=size, cost=cost, future=asyncio.get_running_loop().create_future())
+        self._enqueue(form_id, upload_id, waiter)
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except BaseException:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release(waiter, started_at=None)
+            else:
+                self._remove(form_id, upload_id, waiter)
+            raise
+
+        return IngestTicket(waiter=waiter, started_at=time.monotonic())
+
+    def release(self, ticket: "IngestTicket") -> None:
+        if ticket.released:
+            return
+        ticket.released = True
+        self._release(ticket.waiter, started_at=ticket.started_at)
+
+    def stats(self) -> IngestSchedulerStats:
+        waits = list(self._waits)
+        return IngestSchedulerStats(
+            queue_depth=sum(len(q) for uploads in self._queues.values() for q in uploads.values()),
+            queued_cost=self._queued_cost(),
+            running_files=self._running,
+            inflight_bytes=self._inflight_bytes,
+            admitted_uploads=self._stats.admitted_uploads,
+            rejected_uploads=self._stats.rejected_uploads,
+            started_files=self._stats.started_files,
+            avg_wait_seconds=(sum(waits) / len(waits)) if waits else 0.0,
+            max_wait_seconds=max(waits) if waits else 0.0,
+            throughput_cost_per_second=self._throughput,
+        )
+
+    # ------------------------------------------------------------------
+
+    def _queued_cost(self) -> float:
+        return sum(self._reserved.values())
+
+    def _retry_after(self, excess_cost: float) -> int:
+        if self._throughput <= 0:
+            return self._default_retry_after
+        return int(min(600, max(1, math.ceil(excess_cost / self._throughput))))
+
+    def _enqueue(self, form_id: str, upload_id: str, waiter: _Waiter) -> None:
+        uploads = self._queues.setdefault(form_id, OrderedDict())
+        uploads.setdefault(upload_id, deque()).append(waiter)
+
+    def _remove(self, form_id: str, upload_id: str, waiter: _Waiter) -> None:
+        uploads = self._queues.get(form_id)
+        queue = uploads.get(upload_id) if uploads else None
+        if queue is None:
+            return
+        try:
+            queue.remove(waiter)
+        except ValueError:
+            return
+        if not queue:
+            del uploads[upload_id]
+        if not uploads:
+            del self._queues[form_id]
+
+    def _can_start(self, waiter: _Waiter) -> bool:
+        if self._running == 0:
+            return True
+        return (
+            self._running < self._max_running
+            and self._inflight_bytes + waiter.size <= self._max_inflight_bytes
+        )
+
+    def _dispatch(self) -> None:
+        while self._queues:
+            form_id, uploads = next(iter(self._queues.items()))
+            upload_id, queue = next(iter(uploads.items()))
+            waiter = queue[0]
+            if not self._can_start(waiter):
+                return
+
+            queue.popleft()
+            # Обслуженная загрузка и форма уходят в конец круга.
+            if queue:
+                uploads.move_to_end(upload_id)
+            else:
+                del uploads[upload_id]
+            if uploads:
+                self._queues.move_to_end(form_id)
+            else:
+                del self._queues[form_id]
+
+            self._start(upload_id, waiter)
+
+    def _start(self, upload_id: str, waiter: _Waiter) -> None:
+        self._running += 1
+        self._inflight_bytes += waiter.size
+        if upload_id in self._reserved:
+            self._reserved[upload_id] = max(0.0, self._reserved[upload_id] - waiter.cost)
+        self._stats.started_files += 1
+        self._waits.append(time.monotonic() - waiter.enqueued_at)
+        waiter.future.set_result(None)
+
+    def _release(self, waiter: _Waiter, started_at: Optional[float]) -> None:
+        self._running -= 1
+        self._inflight_bytes -= waiter.size
+        if started_at is not None:
+            elapsed = max(time.monotonic() - started_at, 1e-3)
+            rate = waiter.cost / elapsed
+            self._throughput = rate if self._throughput <= 0 else 0.8 * self._throughput + 0.2 * rate
+        self._dispatch()
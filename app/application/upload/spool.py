@@ -0,0 +1,223 @@
+# app/application/upload/spool.py
+import asyncio
+import hashlib
+import io
+import logging
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+
+from fastapi import UploadFile
+from starlette.datastructures import UploadFile as StarletteUploadFile
+
+from app.core.exceptions import RequestValidationError
+from config.config import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SpooledFile:
+    """
+    Принятый файл запроса, ожидающий обработки в фоне.
+
+    В spool-режиме содержимое лежит на диске (`path`), в памяти хранится
+    только служебная информация. Без spool — содержимое в `content`.
+    `content_hash` — SHA-256 содержимого, посчитанный по ходу приёма.
+    """
+
+    filename: str
+    content_type: str
+    size: int
+    path: Optional[Path] = None
+    content: Optional[bytes] = None
+    content_hash: Optional[str] = None
+    released: bool = False
+
+    def open(self) -> BinaryIO:
+        """Открывает содержимое файла на чтение (дескриптор закрывает вызывающий)."""
+        if self.path is not None:
+            return open(self.path, "rb")
+        return io.BytesIO(self.content or b"")
+
+    def to_upload_file(self) -> StarletteUploadFile:
+        """Оборачивает содержимое в UploadFile для upload pipeline."""
+        return StarletteUploadFile(
+            file=self.open(),
+            filename=self.filename,
+            size=self.size,
+            headers={"content-type": self.content_type},
+        )
+
+
+class UploadSpool:
+    """
+    Принимает файлы запроса на диск потоково, чанками фиксированного размера.
+
+    Каждый запрос получает собственный подкаталог в `base_dir`. Общий объём
+    файлов на диске ограничен `max_total_bytes`, объём одного запроса —
+    `max_request_bytes`. Файл удаляется, как только его обработка дошла до
+    терминального статуса (`release`), каталог запроса — по завершении
+    фоновой задачи (`release_upload`).
+
+    При `enabled=False` файлы читаются в память — поведение до появления spool.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path | None = None,
+        *,
+        enabled: bool | None = None,
+        chunk_size: int | None = None,
+        max_request_bytes: int | None = None,
+        max_total_bytes: int | None = None,
+    ) -> None:
+        self._base_dir = Path(base_dir or config.UPLOAD_SPOOL_DIR)
+        self._enabled = config.UPLOAD_SPOOL_ENABLED if enabled is None else enabled
+        self._chunk_size = chunk_size or config.UPLOAD_SPOOL_CHUNK_SIZE
+        self._max_request_bytes = max_request_bytes or config.UPLOAD_MAX_REQUEST_BYTES
+        self._max_total_bytes = max_total_bytes or config.UPLOAD_SPOOL_MAX_BYTES
+        self._total_bytes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @property
+    def total_bytes(self) -> int:
+        """Объём файлов, принятых и ещё не освобождённых."""
+        return self._total_bytes
+
+    def upload_dir(self, upload_id: str) -> Path:
+        return self._base_dir / upload_id
+
+    async def spool(self, files: List[UploadFile], upload_id: str) -> List[SpooledFile]:
+        """
+        Принимает все файлы запроса.
+
+        Raises:
+            RequestValidationError(413) — превышен лимит размера запроса
+            RequestValidationError(503) — spool-каталог заполнен
+        """
+        spooled: List[SpooledFile] = []
+        request_bytes = 0
+        try:
+            for index, file in enumerate(files):
+                item = await self._spool_one(file, upload_id, index, request_bytes)
+                request_bytes += item.size
+                spooled.append(item)
+        except BaseException:
+            for item in spooled:
+                self.release(item)
+            self.release_upload(upload_id)
+            raise
+
+        logger.info(
+            "Upload spooled: upload_id=%s, files=%d, bytes=%d, on_disk=%s",
+            upload_id,
+            len(spooled),
+            request_bytes,
+            self._enabled,
+        )
+        return spooled
+
+    def release(self, item: SpooledFile) -> None:
+        """Освобождает файл после того, как его обработка завершена (идемпотентно)."""
+        if item.released:
+            return
+        item.released = True
+        if item.path is not None:
+            try:
+                item.path.unlink(missing_ok=True)
+            except OSError as exc:
+                logger.warning("Не удалось удалить spool-файл %s: %s", item.path, exc)
+            item.path = None
+        item.content = None
+        self._total_bytes = max(0, self._total_bytes - item.size)
+
+    def hand_off(self, item: SpooledFile) -> None:
+        """Передаёт файл другому процессу (ingest worker): файл остаётся на диске, но не учитывается здесь."""
+        if item.released:
+            return
+        item.released = True
+        self._total_bytes = max(0, self._total_bytes - item.size)
+
+    def release_upload(self, upload_id: str) -> None:
+        """Удаляет каталог запроса вместе с оставшимися файлами."""
+        if self._enabled:
+            shutil.rmtree(self.upload_dir(upload_id), ignore_errors=True)
+
+    # ------------------------------------------------------------------
+
+    async def _spool_one(
+        self,
+        file: UploadFile,
+        upload_id: str,
+        index: int,
+        request_bytes: int,
+    ) -> SpooledFile:
+        # Одно нормализованное имя для этапов, результатов и задачи в UploadJobs.
+        filename = (file.filename or "").strip()
+        content_type = file.content_type or ""
+
+        if not self._enabled:
+            content = await file.read()
+            self._reserve(len(content), request_bytes, upload_id, filename)
+            return SpooledFile(
+                filename,
+                content_type,
+                len(content),
+                content=content,
+                content_hash=hashlib.sha256(content).hexdigest(),
+            )
+
+        target_dir = self.upload_dir(upload_id)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        # Имя файла клиента в путь не попадает — только порядковый номер.
+        path = target_dir / f"{index:04d}.part"
+
+        size = 0
+        digest = hashlib.sha256()
+        try:
+            with open(path, "wb") as out:
+                while True:
+                    chunk = await file.read(self._chunk_size)
+                    if not chunk:
+                        break
+                    self._reserve(len(chunk), request_bytes + size, upload_id, filename)
+                    size += len(chunk)
+                    digest.update(chunk)
+                    await asyncio.to_thread(out.write, chunk)
+        except BaseException:
+            self._total_bytes = max(0, self._total_bytes - size)
+            path.unlink(missing_ok=True)
+            raise
+
+        return SpooledFile(
+            filename,
+            content_type,
+            size,
+            path=path,
+            content_hash=digest.hexdigest(),
+        )
+
+    def _reserve(self, size: int, request_bytes: int, upload_id: str, filename: str) -> None:
+        if request_bytes + size > self._max_request_bytes:
+            raise RequestValidationError(
+                message=(
+                    f"Upload exceeds the request size limit of "
+                    f"{self._max_request_bytes} bytes"
+                ),
+                http_status=413,
+                domain="upload.spool",
+                meta={"upload_id": upload_id, "file_name": filename},
+            )
+        if self._total_bytes + size > self._max_total_bytes:
+            raise RequestValidationError(
+                message="Upload spool is full, retry later",
+                http_status=503,
+                domain="upload.spool",
+                meta={"upload_id": upload_id, "spooled_bytes": self._total_bytes},
+            )
+        self._total_bytes += size
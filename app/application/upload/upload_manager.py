@@ -1,12 +1,12 @@
 # app/application/upload/upload_manager.py
 import asyncio
-import io
 import logging
-from typing import Dict, List
+from dataclasses import dataclass
+from functools import partial
+from typing import Dict, List, Set
 from uuid import uuid4
 
 from fastapi import UploadFile
-from starlette.datastructures import UploadFile as StarletteUploadFile
 
 from app.api.v2.schemas.files import FileResponse
 from app.api.v2.schemas.upload import UploadResponse
@@ -14,12 +14,21 @@ from app.application.data import DataSaveService
 from app.application.parsing.registry import ParsingStrategyRegistry
 from app.application.upload.file_processor import FileProcessor
 from app.application.upload.form_loader import FormLoader
-from app.application.upload.pipeline import build_default_pipeline
+from app.application.upload.job_queue import UploadJobQueue
+from app.application.upload.options import UploadOptions
+from app.application.upload.pipeline import UploadPipelineContext, build_default_pipeline
+from app.application.upload.pipeline.parse_cache import ParseCache
+from app.application.upload.pipeline.parse_executor import ParseExecutor
 from app.application.upload.request_validator import RequestValidator
 from app.application.upload.response_builder import UploadResponseBuilder
+from app.application.upload.scheduler import IngestScheduler, IngestTicket
+from app.application.upload.spool import SpooledFile, UploadSpool
 from app.application.upload.upload_progress import UploadProgress
+from app.domain.file.models import FileStatus
 from app.domain.file.service import FileService
+from app.domain.form.models import FormInfo
 from app.domain.form.service import FormService
+from config.config import config
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +45,20 @@ class UploadManager:
     Финальный UploadResponse формируется внутри фоновой задачи и
     сохраняется в UploadProgress.file_responses — SSE-эндпоинт
     забирает его оттуда и отдаёт клиенту последним событием.
+
+    Файлы одной загрузки парсятся параллельно (не больше
+    UPLOAD_FILE_CONCURRENCY одновременно), а запись в БД идёт отдельной
+    стадией: пока пишется файл N, парсится N+1. Прогресс и file_responses
+    при этом фиксируются в порядке файлов в запросе.
+
+    Поверх этого все загрузки процесса проходят через общий
+    IngestScheduler: он ограничивает число одновременно обрабатываемых
+    файлов и их объём, а переполненная очередь даёт 429 ещё на приёме.
+
+    С job_queue (UPLOAD_EXECUTION_MODE=queue) файлы не обрабатываются в этом
+    процессе: загрузка ставится задачей в UploadJobs, её выполняет
+    `python -m app.worker` через process_upload(), а прогресс читается из
+    документа задачи.
     """
 
     def __init__(
@@ -44,6 +67,12 @@ class UploadManager:
         form_service: FormService,
         data_save_service: DataSaveService,
         parsing_registry: ParsingStrategyRegistry | None = None,
+        spool: UploadSpool | None = None,
+        parse_executor: ParseExecutor | None = None,
+        parse_cache: ParseCache | None = None,
+        file_concurrency: int | None = None,
+        scheduler: IngestScheduler | None = None,
+        job_queue: UploadJobQueue | None = None,
     ):
         self._validator = RequestValidator()
         self._form_loader = FormLoader(form_service=form_service)
@@ -51,9 +80,16 @@ class UploadManager:
             file_service=file_service,
             data_save_service=data_save_service,
             parsing_registry=parsing_registry,
+            parse_executor=parse_executor,
+            parse_cache=parse_cache,
         )
         self._file_processor = FileProcessor(pipeline=self._pipeline)
+        self._spool = spool or UploadSpool()
+        self._file_concurrency = file_concurrency or config.UPLOAD_FILE_CONCURRENCY
+        self._scheduler = scheduler or IngestScheduler()
+        self._job_queue = job_queue
         self._upload_progress: Dict[str, UploadProgress] = {}
+        self._background_tasks: Set[asyncio.Task] = set()
 
     # ------------------------------------------------------------------
     # Публичный API
@@ -63,81 +99,244 @@ class UploadManager:
         self,
         files: List[UploadFile],
         form_id: str,
+        options: UploadOptions | None = None,
     ) -> UploadResponse:
         """
-        Валидирует запрос, читает файлы в память, регистрирует задачу
+        Валидирует запрос, принимает файлы в spool, регистрирует задачу
         и немедленно возвращает 202 с upload_id.
 
         Raises:
             RequestValidationError — если запрос невалиден (нет файлов,
-                                     некорректный form_id и т.д.)
+                                     некорректный form_id, превышен лимит
+                                     размера запроса и т.д.)
+            UploadBackpressureError — очередь обработки переполнена (429)
         """
         form_id = self._validator.validate_request(files, form_id)
         logger.info("Upload started: form=%s, files=%d", form_id, len(files))
 
-        # Читаем содержимое файлов сразу — FastAPI закрывает объекты
+        upload_id = str(uuid4())
+        options = options or UploadOptions()
+
+        if self._job_queue is not None:
+            return await self._enqueue_upload(files, form_id, upload_id, options)
+
+        # Отказываем до записи на диск; размеры известны после разбора multipart.
+        self._scheduler.admit(
+            upload_id,
+            form_id,
+            [(file.size or 0, file.filename or "") for file in files],
+        )
+
+        # Принимаем содержимое сразу — FastAPI закрывает объекты
         # UploadFile после возврата ответа из эндпоинта.
-        buffered: List[tuple[str, str, bytes]] = []
-        for file in files:
-            content = await file.read()
-            buffered.append((file.filename or "", file.content_type or "", content))
+        try:
+            spooled = await self._spool.spool(files, upload_id)
+        except BaseException:
+            self._scheduler.finish_upload(upload_id)
+            raise
 
-        upload_id = str(uuid4())
         progress = UploadProgress(
             upload_id=upload_id,
-            total_files=len(buffered),
+            total_files=len(spooled),
             form_id=form_id,
         )
         self._upload_progress[upload_id] = progress
 
-        asyncio.create_task(
-            self._process_files_background(buffered, form_id, upload_id, progress)
+        task = asyncio.create_task(
+            self._process_files_background(spooled, form_id, upload_id, progress, options)
         )
+        self._track(task)
 
         return UploadResponseBuilder.build_accepted_response(upload_id)
 
+    async def process_upload(
+        self,
+        spooled: List[SpooledFile],
+        form_id: str,
+        upload_id: str,
+        progress: UploadProgress,
+        options: UploadOptions | None = None,
+    ) -> None:
+        """
+        Обрабатывает уже принятые файлы загрузки (используется ingest worker'ом).
+
+        Spool-файлы здесь не удаляются даже при отмене: их удаляет worker,
+        когда результат файла записан в задачу, а каталог — когда задача
+        завершена. Иначе задачу после потери аренды нечем было бы доделать.
+        """
+        await self._process_files_background(
+            spooled, form_id, upload_id, progress, options, keep_spool=True
+        )
+
     def get_upload_progress(self, upload_id: str) -> UploadProgress | None:
         return self._upload_progress.get(upload_id)
 
+    async def open_upload_progress(self, upload_id: str) -> UploadProgress | None:
+        """
+        Прогресс для SSE: локальный или, в режиме очереди, копия прогресса
+        задачи из UploadJobs, которая обновляется в фоне до её завершения.
+        """
+        progress = self._upload_progress.get(upload_id)
+        if progress is not None or self._job_queue is None:
+            return progress
+
+        loaded = await self._job_queue.load_progress(upload_id)
+        if loaded is None:
+            return None
+        progress, version = loaded
+        # Пока грузили, другой SSE-клиент мог уже открыть этот прогресс.
+        existing = self._upload_progress.setdefault(upload_id, progress)
+        if existing is progress:
+            self._track(
+                asyncio.create_task(
+                    self._job_queue.follow(
+                        progress,
+                        version,
+                        lambda: self._upload_progress.get(upload_id) is progress,
+                    )
+                )
+            )
+        return existing
+
     def cleanup_upload_progress(self, upload_id: str) -> None:
         self._upload_progress.pop(upload_id, None)
 
+    @property
+    def scheduler(self) -> IngestScheduler:
+        return self._scheduler
+
+    @property
+    def spool(self) -> UploadSpool:
+        return self._spool
+
+    def _track(self, task: asyncio.Task) -> None:
+        # Держим ссылку на задачу: event loop хранит только слабые ссылки.
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _enqueue_upload(
+        self,
+        files: List[UploadFile],
+        form_id: str,
+        upload_id: str,
+        options: UploadOptions,
+    ) -> UploadResponse:
+        await self._job_queue.ensure_capacity(upload_id, form_id)
+        spooled = await self._spool.spool(files, upload_id)
+        try:
+            await self._job_queue.submit(spooled, upload_id, form_id, options)
+        except BaseException:
+            for item in spooled:
+                self._spool.release(item)
+            self._spool.release_upload(upload_id)
+            raise
+        return UploadResponseBuilder.build_accepted_response(upload_id)
+
     # ------------------------------------------------------------------
     # Фоновая обработка
     # ------------------------------------------------------------------
 
     async def _process_files_background(
         self,
-        buffered: List[tuple[str, str, bytes]],
+        spooled: List[SpooledFile],
         form_id: str,
         upload_id: str,
         progress: UploadProgress,
+        options: UploadOptions | None = None,
+        *,
+        keep_spool: bool = False,
     ) -> None:
         file_responses: List[FileResponse] = []
         try:
             form_info = await self._form_loader.load_form(form_id)
 
-            for filename, content_type, content in buffered:
-                upload_file = StarletteUploadFile(
-                    file=io.BytesIO(content),
-                    filename=filename,
-                    headers={"content-type": content_type},
-                )
-                response = await self._file_processor.process_file(
-                    upload_file, form_id, form_info
-                )
-                file_responses.append(response)
+            results: List[FileResponse | None] = [None] * len(spooled)
+            reported = 0
+            semaphore = asyncio.Semaphore(max(1, self._file_concurrency))
 
-                success = response.status == "success"
-                progress.add_processed_file(
-                    response.filename,
-                    success,
-                    response.error if not success else None,
-                )
+            def report_in_order() -> None:
+                # Файлы завершаются в произвольном порядке, а прогресс и
+                # итоговый список отдаются строго в порядке загрузки.
+                nonlocal reported
+                while reported < len(results) and results[reported] is not None:
+                    response = results[reported]
+                    file_responses.append(response)
+                    success = response.status == "success"
+                    progress.add_processed_file(
+                        response.filename,
+                        success,
+                        response.error if not success else None,
+                    )
+                    reported += 1
+
+            def finish(index: int, response: FileResponse) -> None:
+                results[index] = response
+                progress.record_file_result(index, response)
+                report_in_order()
+
+            # Двухстадийный конвейер: парсинг (до file_concurrency файлов)
+            # передаёт готовые контексты записи в БД через ограниченную
+            # очередь — следующий файл парсится, пока пишется предыдущий.
+            persist_queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, config.UPLOAD_PERSIST_QUEUE_SIZE))
+            in_flight: List[_ParsedFile] = []
+
+            async def parse_one(index: int, item: SpooledFile) -> None:
+                async with semaphore:
+                    parsed = await self._parse_spooled_file(
+                        item, form_id, form_info, options, upload_id, progress, keep_spool=keep_spool
+                    )
+                    if isinstance(parsed, FileResponse):
+                        finish(index, parsed)
+                        return
+                    in_flight.append(parsed)
+                    await persist_queue.put((index, parsed))
+
+            async def persist_all() -> None:
+                while True:
+                    entry = await persist_queue.get()
+                    if entry is None:
+                        return
+                    index, parsed = entry
+                    # Дальше файл освобождает _persist_parsed_file — не повторно в finally.
+                    in_flight.remove(parsed)
+                    try:
+                        finish(index, await self._persist_parsed_file(parsed))
+                    except Exception as exc:
+                        logger.error("Persist stage failed for file '%s': %s", parsed.item.filename, exc)
+                        if results[index] is None:
+                            finish(index, _internal_error_response(parsed.item.filename, exc))
+
+            # Ошибка одного файла не отменяет остальные: фазы сами
+            # превращают исключения в FileResponse, а gather не пробрасывает их.
+            producers = asyncio.gather(
+                *(parse_one(index, item) for index, item in enumerate(spooled)),
+                return_exceptions=True,
+            )
+            writer = asyncio.create_task(persist_all())
+            try:
+                await asyncio.wait({producers, writer}, return_when=asyncio.FIRST_COMPLETED)
+                if writer.done():
+                    # Запись упала раньше парсинга: иначе парсинг встал бы на полной очереди.
+                    producers.cancel()
+                    await asyncio.gather(producers, return_exceptions=True)
+                    writer.result()
+                else:
+                    await persist_queue.put(None)
+                    await writer
+            finally:
+                for task in (producers, writer):
+                    if not task.done():
+                        task.cancel()
+                await asyncio.gather(producers, writer, return_exceptions=True)
+                # Если обработку прервали, не держим слоты планировщика и файлы.
+                for parsed in in_flight:
+                    await self._release_parsed_file(parsed)
 
             # Фиксируем итог — complete/fail сохраняют file_responses
             # внутри progress, SSE-эндпоинт заберёт их для финального события.
-            if all(r.status == "success" for r in file_responses):
+            if len(file_responses) == len(spooled) and all(
+                r.status == "success" for r in file_responses
+            ):
                 progress.complete(file_responses)
             else:
                 progress.fail(file_responses)
@@ -151,4 +350,93 @@ class UploadManager:
                 e,
             )
             # Частичные результаты сохраняем, чтобы клиент получил хоть что-то
-            progress.fail(file_responses or [])
\ No newline at end of file
+            progress.fail(file_responses or [])
+
+        finally:
+            self._scheduler.finish_upload(upload_id)
+            if not keep_spool:
+                for item in spooled:
+                    self._spool.release(item)
+                self._spool.release_upload(upload_id)
+
+    async def _parse_spooled_file(
+        self,
+        item: SpooledFile,
+        form_id: str,
+        form_info: FormInfo,
+        options: UploadOptions | None,
+        upload_id: str,
+        progress: UploadProgress | None = None,
+        *,
+        keep_spool: bool = False,
+    ) -> "FileResponse | _ParsedFile":
+        """
+        Фаза парсинга под слотом планировщика. Возвращает _ParsedFile, если
+        файл нужно записать, иначе — итоговый FileResponse (ошибка / пропуск).
+        Слот держится до конца записи: разобранные данные тоже занимают память.
+        """
+        parsed = _ParsedFile(item=item, upload_file=item.to_upload_file(), keep_spool=keep_spool)
+        try:
+            if progress is not None:
+                progress.update_stage(item.filename, step="queued")
+            parsed.ticket = await self._scheduler.acquire(upload_id, form_id, item.size, item.filename)
+            parsed.ctx = self._file_processor.create_context(
+                parsed.upload_file,
+                form_id,
+                form_info,
+                options=options,
+                content_hash=item.content_hash,
+                file_path=item.path,
+            )
+            if progress is not None:
+                parsed.ctx.on_stage = partial(progress.update_stage, parsed.ctx.filename)
+            await self._file_processor.parse(parsed.ctx)
+            if self._file_processor.needs_persist(parsed.ctx):
+                # Содержимое книги для записи не нужно — не держим его в очереди.
+                parsed.ctx.file_content = None
+                handed_over, parsed = parsed, None
+                return handed_over
+            return self._file_processor.build_response(parsed.ctx)
+        except Exception as exc:
+            logger.error("Unexpected error for file '%s': %s", item.filename, exc)
+            return _internal_error_response(item.filename, exc)
+        finally:
+            if parsed is not None:
+                await self._release_parsed_file(parsed)
+
+    async def _persist_parsed_file(self, parsed: "_ParsedFile") -> FileResponse:
+        try:
+            await self._file_processor.persist(parsed.ctx)
+            return self._file_processor.build_response(parsed.ctx)
+        except Exception as exc:
+            logger.error("Unexpected error for file '%s': %s", parsed.item.filename, exc)
+            return _internal_error_response(parsed.item.filename, exc)
+        finally:
+            await self._release_parsed_file(parsed)
+
+    async def _release_parsed_file(self, parsed: "_ParsedFile") -> None:
+        # Файл дошёл до терминального статуса — spool и слот больше не нужны
+        await parsed.upload_file.close()
+        if not parsed.keep_spool:
+            self._spool.release(parsed.item)
+        if parsed.ticket is not None:
+            self._scheduler.release(parsed.ticket)
+
+
+def _internal_error_response(filename: str, exc: Exception) -> FileResponse:
+    return FileResponse(
+        filename=filename,
+        status=FileStatus.FAILED,
+        error=f"Internal file processing error: {exc}",
+    )
+
+
+@dataclass
+class _ParsedFile:
+    """Файл между фазами парсинга и записи."""
+
+    item: SpooledFile
+    upload_file: UploadFile
+    ctx: UploadPipelineContext | None = None
+    ticket: IngestTicket | None = None
+    keep_spool: bool = False
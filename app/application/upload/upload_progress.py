@@ -1,7 +1,8 @@
 # app/application/upload/upload_progress.py
+import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from app.api.v2.schemas.files import FileResponse
 
@@ -17,6 +18,9 @@ class UploadProgress:
     После перехода в терминальный статус поле `file_responses`
     содержит итоговые результаты по каждому файлу и может быть
     использовано для формирования финального UploadResponse.
+
+    Каждая мутация увеличивает `version` и будит ожидающих в
+    wait_for_change() — SSE-поток не опрашивает состояние по таймеру.
     """
 
     upload_id: str
@@ -29,10 +33,17 @@ class UploadProgress:
     current_file: int = 0
     processed_files: List[str] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
+    # Текущий этап по файлам в работе: filename → {"step", "sheet", "rows"}
+    stages: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Результаты по индексу файла в запросе — в порядке завершения, а не в порядке файлов
+    file_results: Dict[int, FileResponse] = field(default_factory=dict)
+    version: int = 0
 
     # Итоговые данные — заполняются только после завершения
     file_responses: List[FileResponse] = field(default_factory=list)
 
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False, compare=False)
+
     # ------------------------------------------------------------------
     # Свойства
     # ------------------------------------------------------------------
@@ -43,10 +54,71 @@ class UploadProgress:
             return 0.0
         return (self.current_file / self.total_files) * 100
 
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    # ------------------------------------------------------------------
+    # Ожидание изменений
+    # ------------------------------------------------------------------
+
+    async def wait_for_change(self, since_version: int, timeout: float) -> bool:
+        """
+        Ждёт, пока version станет отличной от since_version.
+
+        Returns:
+            False — за timeout секунд ничего не изменилось
+        """
+        if self.version != since_version:
+            return True
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    def _touch(self) -> None:
+        self.version += 1
+        # Будим всех текущих ожидающих и готовим новое событие для следующих.
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
     # ------------------------------------------------------------------
     # Мутации (вызываются из фоновой задачи)
     # ------------------------------------------------------------------
 
+    def update_stage(self, filename: str, **stage: Any) -> None:
+        """Обновляет этап обработки файла (шаг, лист, число записей)."""
+        current = self.stages.setdefault(filename, {})
+        if all(current.get(key) == value for key, value in stage.items()):
+            return
+        current.update(stage)
+        self._touch()
+
+    def record_file_result(self, index: int, response: FileResponse) -> None:
+        """Фиксирует результат файла сразу по завершении (для сохранения в UploadJobs)."""
+        self.file_results[index] = response
+        self._touch()
+
+    def replace_state(
+        self,
+        *,
+        status: str,
+        current_file: int,
+        processed_files: List[str],
+        errors: List[str],
+        stages: Dict[str, Dict[str, Any]],
+        file_responses: List[FileResponse],
+    ) -> None:
+        """Заменяет состояние целиком — прогресс задачи, выполняемой в другом процессе."""
+        self.status = status
+        self.current_file = current_file
+        self.processed_files = processed_files
+        self.errors = errors
+        self.stages = stages
+        self.file_responses = file_responses
+        self._touch()
+
     def add_processed_file(
         self,
         filename: str,
@@ -56,8 +128,10 @@ class UploadProgress:
         """Фиксирует результат обработки одного файла."""
         self.processed_files.append(filename)
         self.current_file += 1
+        self.stages.pop(filename, None)
         if not success and error:
             self.errors.append(error)
+        self._touch()
 
     def complete(self, file_responses: List[FileResponse]) -> None:
         """
@@ -66,7 +140,9 @@ class UploadProgress:
         """
         self.file_responses = file_responses
         self.current_file = self.total_files
+        self.stages.clear()
         self.status = "completed"
+        self._touch()
 
     def fail(self, file_responses: Optional[List[FileResponse]] = None) -> None:
         """
@@ -75,4 +151,6 @@ class UploadProgress:
         """
         if file_responses:
             self.file_responses = file_responses
-        self.status = "failed"
\ No newline at end of file
+        self.stages.clear()
+        self.status = "failed"
+        self._touch()
@@ -13,13 +13,20 @@ from app.domain.flat_data import FlatDataRepository, FlatDataService
 from app.domain.form import FormRepository, FormService
 from app.domain.log import LogRepository, LogService
 from app.domain.sheet import SheetService
+from app.domain.upload_job import UploadJobRepository, UploadJobService
 from app.application.upload import UploadManager
+from app.application.upload.job_queue import UploadJobQueue
+from app.application.upload.pipeline.parse_cache import ParseCache, build_parse_cache
+from app.application.upload.pipeline.parse_executor import ParseExecutor, build_parse_executor
+from app.application.upload.scheduler import IngestScheduler
+from app.application.upload.spool import UploadSpool
 from app.application.data import (
     DataDeleteService,
     DataSaveService,
 )
 from app.application.forms import FormMaintenanceService
 from app.application.parsing.registry import get_parsing_strategy_registry
+from config.config import config
 
 @lru_cache
 def get_database() -> AsyncIOMotorDatabase:
@@ -48,6 +55,11 @@ def get_logs_repository() -> LogRepository:
     return LogRepository(get_database().get_collection("Logs"))
 
 
+@lru_cache
+def get_upload_job_repository() -> UploadJobRepository:
+    return UploadJobRepository(get_database().get_collection("UploadJobs"))
+
+
 # --- Domain: сервисы агрегатов ---
 @lru_cache
 def get_file_service() -> FileService:
@@ -61,7 +73,10 @@ def get_flat_data_service() -> FlatDataService:
 
 @lru_cache
 def get_form_service() -> FormService:
-    return FormService(get_form_repository())
+    service = FormService(get_form_repository())
+    # Планы парсинга листов зависят от реквизитов формы — сбрасываем их при изменении формы.
+    service.add_update_listener(get_parsing_strategy_registry().invalidate_form)
+    return service
 
 
 @lru_cache
@@ -69,6 +84,11 @@ def get_log_service() -> LogService:
     return LogService(get_logs_repository())
 
 
+@lru_cache
+def get_upload_job_service() -> UploadJobService:
+    return UploadJobService(get_upload_job_repository())
+
+
 @lru_cache
 def get_sheet_service() -> SheetService:
     return SheetService()
@@ -103,6 +123,37 @@ def get_form_maintenance_service() -> FormMaintenanceService:
     )
 
 
+@lru_cache
+def get_parse_executor() -> ParseExecutor:
+    """Исполнитель чтения/парсинга книг; пул процессов останавливается в lifespan."""
+    return build_parse_executor(get_parsing_strategy_registry())
+
+
+@lru_cache
+def get_parse_cache() -> ParseCache | None:
+    """Дисковый кэш результатов парсинга; None, если PARSE_CACHE_ENABLED=false."""
+    return build_parse_cache()
+
+
+@lru_cache
+def get_ingest_scheduler() -> IngestScheduler:
+    """Общий для всех загрузок процесса планировщик обработки файлов."""
+    return IngestScheduler()
+
+
+@lru_cache
+def get_upload_spool() -> UploadSpool:
+    return UploadSpool()
+
+
+@lru_cache
+def get_upload_job_queue() -> UploadJobQueue | None:
+    """Очередь задач в UploadJobs; None, если файлы обрабатываются в процессе API."""
+    if config.UPLOAD_EXECUTION_MODE != "queue":
+        return None
+    return UploadJobQueue(get_upload_job_service(), get_upload_spool())
+
+
 @lru_cache
 def get_upload_manager() -> UploadManager:
     from app.application.parsing.registry import get_parsing_strategy_registry
@@ -111,6 +162,11 @@ def get_upload_manager() -> UploadManager:
         form_service=get_form_service(),
         data_save_service=get_data_save_service(),
         parsing_registry=get_parsing_strategy_registry(),
+        parse_executor=get_parse_executor(),
+        parse_cache=get_parse_cache(),
+        spool=get_upload_spool(),
+        scheduler=get_ingest_scheduler(),
+        job_queue=get_upload_job_queue(),
     )
 
 
@@ -125,12 +181,19 @@ def clear_dependency_caches() -> None:
     get_flat_data_repository.cache_clear()
     get_form_repository.cache_clear()
     get_logs_repository.cache_clear()
+    get_upload_job_repository.cache_clear()
     get_file_service.cache_clear()
     get_flat_data_service.cache_clear()
     get_form_service.cache_clear()
     get_log_service.cache_clear()
+    get_upload_job_service.cache_clear()
     get_sheet_service.cache_clear()
     get_data_save_service.cache_clear()
     get_data_delete_service.cache_clear()
     get_form_maintenance_service.cache_clear()
+    get_parse_executor.cache_clear()
+    get_parse_cache.cache_clear()
+    get_ingest_scheduler.cache_clear()
+    get_upload_spool.cache_clear()
+    get_upload_job_queue.cache_clear()
     get_upload_manager.cache_clear()
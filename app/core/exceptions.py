@@ -75,6 +75,26 @@ class RequestValidationError(AppError):
         )
 
 
+class UploadBackpressureError(RequestValidationError):
+    """
+    Очередь обработки загрузок переполнена.
+
+    Отдаётся как 429 с заголовком Retry-After (секунды).
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        retry_after: int,
+        domain: str = "upload.scheduler",
+        meta: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(message=message, http_status=429, domain=domain, meta=meta)
+        self.retry_after = retry_after
+        self.headers = {"Retry-After": str(retry_after)}
+
+
 # ============= Ошибки загрузки =============
 
 
@@ -239,6 +259,7 @@ def to_http_exception(error: AppError) -> HTTPException:
             "domain": error.domain,
             "level": error.level,
         },
+        headers=getattr(error, "headers", None),
     )
 
 
@@ -36,6 +36,7 @@ class FileModel(BaseModel):
     upload_timestamp: datetime = Field(default_factory=datetime.now)
     sheets: List[str] = []
     flat_data_size: int = 0
+    content_hash: Optional[str] = None  # SHA-256 содержимого файла (hex)
     updated_at: datetime = Field(default_factory=datetime.now)
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -38,6 +38,21 @@ class FileRepository(BaseRepository):
             query["form_id"] = form_id
         return await self.find_one(query, session=session)
 
+    async def find_by_content_hash(
+        self,
+        content_hash: str,
+        status: FileStatus,
+        form_id: Optional[str] = None,
+        session: Any = None,
+    ) -> Optional[Dict[str, Any]]:
+        query: Dict[str, Any] = {
+            "content_hash": content_hash,
+            "status": status.value,
+        }
+        if form_id is not None:
+            query["form_id"] = form_id
+        return await self.find_one(query, session=session)
+
     async def list_by_form_id(
         self,
         form_id: str,
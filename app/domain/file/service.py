@@ -165,3 +165,13 @@ class FileService:
     ) -> Optional[FileModel]:
         doc = await self._repo.find_by_filename_and_status(filename, status, form_id)
         return FileModel(**doc) if doc else None
+
+    async def get_by_content_hash(
+        self,
+        content_hash: str,
+        status: FileStatus,
+        form_id: Optional[str] = None,
+    ) -> Optional[FileModel]:
+        """Ищет файл формы с тем же содержимым (SHA-256) и статусом."""
+        doc = await self._repo.find_by_content_hash(content_hash, status, form_id)
+        return FileModel(**doc) if doc else None
@@ -1,4 +1,5 @@
 """Агрегат FlatData: модели, репозиторий, сервис (сохранение, удаление, фильтрация)."""
+from app.domain.flat_data.batch import FileFlatData, SheetFlatBatch
 from app.domain.flat_data.models import (
     FILTER_MAP,
     TABLE_FIELDS,
@@ -13,6 +14,8 @@ __all__ = [
     "TABLE_FIELDS",
     "FlatDataRecord",
     "FilterSpec",
+    "FileFlatData",
+    "SheetFlatBatch",
     "FlatDataRepository",
     "FlatDataService",
 ]
@@ -0,0 +1,144 @@
+"""Колоночное представление flat_data: лист (SheetFlatBatch) и файл целиком (FileFlatData)."""
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.domain.flat_data.models import FlatDataRecord
+
+
+def _object_array(items: Any = ()) -> np.ndarray:
+    array = np.empty(len(items), dtype=object)
+    array[:] = items
+    return array
+
+
+def _codes(items: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """Словарное кодирование меток: (таблица уникальных меток, int32-коды)."""
+    labels: Dict[Any, int] = {}
+    codes = [labels.setdefault(item, len(labels)) for item in items]
+    return _object_array(list(labels)), np.array(codes, dtype=np.int32)
+
+
+@dataclass(eq=False, slots=True)
+class SheetFlatBatch:
+    """
+    Плоские данные листа в колоночном виде.
+
+    Метки строк и колонок хранятся таблицами (row_labels / column_labels), ячейка
+    ссылается на них int32-кодами; значения — object-массив той же длины.
+    Раздел общий для всех ячеек; метаданные файла здесь не хранятся — их
+    подставляет FileFlatData при сериализации.
+    """
+
+    section: str
+    row_labels: np.ndarray
+    column_labels: np.ndarray
+    row_codes: np.ndarray
+    column_codes: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def empty(cls, section: str = "") -> "SheetFlatBatch":
+        no_codes = np.empty(0, dtype=np.int32)
+        return cls(section, _object_array(), _object_array(), no_codes, no_codes, _object_array())
+
+    @classmethod
+    def from_lists(cls, section: str, rows: List[Any], columns: List[Any], values: List[Any]) -> "SheetFlatBatch":
+        if not len(rows) == len(columns) == len(values):
+            raise ValueError("rows, columns и values должны быть одной длины")
+        row_labels, row_codes = _codes(rows)
+        column_labels, column_codes = _codes(columns)
+        return cls(section, row_labels, column_labels, row_codes, column_codes, _object_array(values))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def rows(self) -> np.ndarray:
+        return self.row_labels[self.row_codes]
+
+    @property
+    def columns(self) -> np.ndarray:
+        return self.column_labels[self.column_codes]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SheetFlatBatch):
+            return NotImplemented
+        return (
+            self.section == other.section
+            and self.rows.tolist() == other.rows.tolist()
+            and self.columns.tolist() == other.columns.tolist()
+            and self.values.tolist() == other.values.tolist()
+        )
+
+    def to_mongo_docs(
+        self,
+        *,
+        year: Optional[int] = None,
+        reporter: Optional[str] = None,
+        file_id: Optional[str] = None,
+        form: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Документы коллекции FlatData в порядке полей FlatDataRecord.to_mongo_doc."""
+        section = self.section
+        for row, column, value in zip(self.rows.tolist(), self.columns.tolist(), self.values.tolist()):
+            yield {
+                "year": year,
+                "reporter": reporter,
+                "section": section,
+                "row": row,
+                "column": column,
+                "value": value,
+                "file_id": file_id,
+                "form": form,
+            }
+
+    def records(self, **file_meta: Any) -> List[FlatDataRecord]:
+        """FlatDataRecord для API и отчётов; в pipeline не используется."""
+        return [FlatDataRecord(**doc) for doc in self.to_mongo_docs(**file_meta)]
+
+
+class FileFlatData:
+    """
+    flat_data загружаемого файла: батчи листов и метаданные файла, хранимые один раз.
+
+    Метаданные (year, reporter, file_id, form) подставляются в документы только
+    при сериализации; число ячеек считается один раз при создании.
+    """
+
+    __slots__ = ("batches", "_size", "year", "reporter", "file_id", "form")
+
+    def __init__(self, batches: Iterable[SheetFlatBatch] = ()) -> None:
+        self.batches: Tuple[SheetFlatBatch, ...] = tuple(batches)
+        self._size = sum(len(batch) for batch in self.batches)
+        self.year: Optional[int] = None
+        self.reporter: Optional[str] = None
+        self.file_id: Optional[str] = None
+        self.form: Optional[str] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"FileFlatData(sheets={len(self.batches)}, size={self._size}, file_id={self.file_id!r})"
+
+    def stamp(self, *, file_id: Optional[str], form: Optional[str], year: Optional[int], reporter: Optional[str]) -> None:
+        """Задаёт метаданные файла для всех ячеек."""
+        self.file_id = file_id
+        self.form = form
+        self.year = year
+        self.reporter = reporter
+
+    def _file_meta(self) -> Dict[str, Any]:
+        return {"year": self.year, "reporter": self.reporter, "file_id": self.file_id, "form": self.form}
+
+    def to_mongo_docs(self) -> Iterator[Dict[str, Any]]:
+        file_meta = self._file_meta()
+        for batch in self.batches:
+            yield from batch.to_mongo_docs(**file_meta)
+
+    def records(self) -> List[FlatDataRecord]:
+        """FlatDataRecord всех листов с метаданными файла (API, отчёты, тесты)."""
+        file_meta = self._file_meta()
+        return [record for batch in self.batches for record in batch.records(**file_meta)]
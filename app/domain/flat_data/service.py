@@ -6,11 +6,13 @@ import hashlib
 import json
 import logging
 import math
-from typing import Any, Dict, List, Set, Tuple, Union
+from itertools import islice
+from typing import Any, Dict, List, Tuple, Union
 
 from pymongo import InsertOne
 
 from app.core.exceptions import CriticalUploadError
+from app.domain.flat_data.batch import FileFlatData
 from app.domain.flat_data.models import FILTER_MAP, FlatDataRecord, TABLE_FIELDS
 from app.domain.flat_data.repository import FlatDataRepository
 from config.config import config
@@ -107,32 +109,26 @@ class FlatDataService:
         self._filter_cache[cache_key] = values
         return values
 
-    async def save_flat_data(self, records: List[FlatDataRecord], *, session: Any = None) -> int:
+    async def save_flat_data(self, flat_data: FileFlatData, *, session: Any = None) -> int:
         """
         Пакетно сохраняет строки FlatData чанками фиксированного размера.
 
+        Документы собираются из колоночного FileFlatData по чанку за раз, полный список не материализуется.
+
         Возвращает число фактически вставленных документов. При ошибке дубликата по уникальному индексу
         выбрасывает CriticalUploadError. Параметр session связывает операции с транзакцией MongoDB.
         """
-        if not records:
+        if not len(flat_data):
             logger.info("FlatDataService.save_flat_data: пустой список")
             return 0
 
-        normalized_records: List[Dict[str, Any]] = []
-        file_ids: Set[str] = set()
-        for rec in records:
-            doc = rec.to_mongo_doc()
-            new_rec = {k: _to_builtin(v) for k, v in doc.items()}
-            normalized_records.append(new_rec)
-            fid = new_rec.get("file_id")
-            if fid:
-                file_ids.add(str(fid))
-
+        file_ids = [str(flat_data.file_id)] if flat_data.file_id else []
+        docs = flat_data.to_mongo_docs()
         total_inserted = 0
         chunk_size = config.FLATDATA_BULK_CHUNK_SIZE
 
-        for i in range(0, len(normalized_records), chunk_size):
-            chunk = normalized_records[i : i + chunk_size]
+        for i in range(0, len(flat_data), chunk_size):
+            chunk = [{k: _to_builtin(v) for k, v in doc.items()} for doc in islice(docs, chunk_size)]
             try:
                 operations = [InsertOne(doc) for doc in chunk]
                 result = await self._repo.bulk_write_ops(
@@ -162,7 +158,7 @@ class FlatDataService:
                                     "error": error,
                                     "duplicate_document": duplicate_info,
                                     "chunk_range": f"{i}-{i + len(chunk) - 1}",
-                                    "file_id": list(file_ids),
+                                    "file_id": file_ids,
                                 },
                             )
                         logger.error("Bulk write error: %s", error)
@@ -1,5 +1,5 @@
 """Агрегат Form: модели, репозиторий, сервис."""
-from app.domain.form.models import FormInfo, FormType, detect_form_type
+from app.domain.form.models import FormInfo, FormType, detect_form_type, requisites_hash
 from app.domain.form.repository import FormRepository
 from app.domain.form.service import FormService, validate_form_id
 
@@ -7,6 +7,7 @@ __all__ = [
     "FormInfo",
     "FormType",
     "detect_form_type",
+    "requisites_hash",
     "FormRepository",
     "FormService",
     "validate_form_id",
@@ -1,4 +1,6 @@
 """Модели агрегата Form: тип формы, информация о форме."""
+import hashlib
+import json
 from datetime import datetime
 from enum import Enum
 from typing import Optional
@@ -37,6 +39,17 @@ class FormInfo(BaseModel):
         )
 
 
+def requisites_hash(form_info: FormInfo) -> str:
+    """Хэш всего, что в форме влияет на парсинг: тип и реквизиты."""
+    payload = json.dumps(
+        {"type": form_info.type.value, "requisites": form_info.requisites or {}},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
 def detect_form_type(form_name: str) -> FormType:
     if not form_name or not isinstance(form_name, str):
         return FormType.UNKNOWN
@@ -1,5 +1,6 @@
 """Сервис агрегата Form: валидация form_id, получение формы, CRUD."""
-from typing import Any, Dict, List, Optional
+import logging
+from typing import Any, Callable, Dict, List, Optional
 
 
 from uuid import uuid4
@@ -9,6 +10,11 @@ from app.core.exceptions import FormValidationError
 from app.domain.form.models import FormInfo
 from app.domain.form.repository import FormRepository
 
+logger = logging.getLogger(__name__)
+
+# Вызывается с form_id после изменения или удаления формы.
+FormUpdateListener = Callable[[str], None]
+
 
 def validate_form_id(form_id: Any) -> str:
     """
@@ -33,6 +39,18 @@ class FormService:
 
     def __init__(self, repository: FormRepository):
         self._repo = repository
+        self._update_listeners: List[FormUpdateListener] = []
+
+    def add_update_listener(self, listener: FormUpdateListener) -> None:
+        """Подписка на изменения форм (например, сброс кэша планов парсинга)."""
+        self._update_listeners.append(listener)
+
+    def _notify_updated(self, form_id: str) -> None:
+        for listener in self._update_listeners:
+            try:
+                listener(form_id)
+            except Exception:
+                logger.exception("Form update listener failed for form '%s'", form_id)
 
     async def get_form(self, form_id: str) -> Optional[FormInfo]:
         """
@@ -101,6 +119,8 @@ class FormService:
 
         merged = {**(default_requisites or {}), **requisites}
         updated = await self._repo.update_form(existing["id"], {"$set": {"requisites": merged}})
+        if updated:
+            self._notify_updated(existing["id"])
         return updated or existing
 
     async def update_form(
@@ -126,7 +146,13 @@ class FormService:
         if not update_doc:
             return await self._repo.get_form(form_id)
 
-        return await self._repo.update_form(form_id, {"$set": update_doc})
+        updated = await self._repo.update_form(form_id, {"$set": update_doc})
+        if updated:
+            self._notify_updated(form_id)
+        return updated
 
     async def delete_form(self, form_id: str) -> bool:
-        return await self._repo.delete_form(form_id)
+        deleted = await self._repo.delete_form(form_id)
+        if deleted:
+            self._notify_updated(form_id)
+        return deleted
@@ -7,43 +7,53 @@
 from app.domain.parsing.models import (
     TableStructure,
     ParsedHeaders,
-    CellValue,
     ExtractedColumn,
     ExtractedSheetData,
     SERVICE_EMPTY,
+    PARSER_VERSION,
 )
 from app.domain.parsing.structure_detection import (
     detect_table_structure,
     StructureDetectionStrategy,
     FixedStructureStrategy,
     AutoDetectStructureStrategy,
+    EMPTY_CELL_STRINGS,
+    INT64_FLOAT_LIMIT,
+    cell_types,
 )
 from app.domain.parsing.header_parsing import parse_headers
 from app.domain.parsing.workbook_source import ParsingWorkbookSource
 from app.domain.parsing.vertical_hierarchy_config import (
     DEFAULT_VERTICAL_HIERARCHY_HEURISTICS,
     VerticalHierarchyHeuristicConfig,
+    VerticalHierarchyOptions,
+    hierarchy_options_from_requisites,
 )
 from app.domain.parsing.data_extraction import extract_sheet_data
-from app.domain.parsing.flat_data_builder import build_flat_data_records
+from app.domain.parsing.flat_data_builder import build_sheet_flat_batch
 from app.domain.parsing.notes import process_notes_1fk
 
 __all__ = [
     "TableStructure",
     "ParsedHeaders",
-    "CellValue",
     "ExtractedColumn",
     "ExtractedSheetData",
     "SERVICE_EMPTY",
+    "PARSER_VERSION",
     "detect_table_structure",
     "StructureDetectionStrategy",
     "FixedStructureStrategy",
     "AutoDetectStructureStrategy",
+    "EMPTY_CELL_STRINGS",
+    "INT64_FLOAT_LIMIT",
+    "cell_types",
     "parse_headers",
     "ParsingWorkbookSource",
     "VerticalHierarchyHeuristicConfig",
     "DEFAULT_VERTICAL_HIERARCHY_HEURISTICS",
+    "VerticalHierarchyOptions",
+    "hierarchy_options_from_requisites",
     "extract_sheet_data",
-    "build_flat_data_records",
+    "build_sheet_flat_batch",
     "process_notes_1fk",
 ]
@@ -3,20 +3,28 @@
 Поддерживает простой режим (1ФК) и режим с дедупликацией колонок (5ФК).
 """
 import logging
+import math
 import re
 from collections import Counter
 from typing import List
 
+import numpy as np
 import pandas as pd
 
 from app.domain.parsing.models import (
-    CellValue,
     ExtractedColumn,
     ExtractedSheetData,
     ParsedHeaders,
     TableStructure,
 )
-from app.domain.parsing.structure_detection import _is_empty_or_nan, _is_numeric_value
+from app.domain.parsing.structure_detection import (
+    EMPTY_CELL_STRINGS,
+    INT64_FLOAT_LIMIT,
+    cell_types,
+    _NOT_DIGITS,
+    _is_empty_or_nan,
+    _is_numeric_value,
+)
 from app.domain.parsing.header_fixer import fix_header
 
 logger = logging.getLogger(__name__)
@@ -77,6 +85,72 @@ def _append_row_number_for_duplicates(
     return out
 
 
+def _data_block(sheet: pd.DataFrame, start_row: int, n_rows: int, n_cols: int) -> np.ndarray:
+    """
+    Блок данных [start_row : start_row + n_rows, 0 : n_cols] как object-массив.
+    Ячейки за границами листа — None (как IndexError при поячеечном чтении).
+    """
+    block = np.full((n_rows, n_cols), None, dtype=object)
+    available = sheet.iloc[start_row : start_row + n_rows, :n_cols].to_numpy(dtype=object)
+    block[: available.shape[0], : available.shape[1]] = available
+    return block
+
+
+def _coerce_cell(value: object) -> object:
+    """Поячеечное приведение (для редких типов): число → int/float, пустое → None."""
+    if _is_empty_or_nan(value):
+        return None
+    if _is_numeric_value(value):
+        try:
+            num = float(str(value).strip().replace(",", ".").replace(" ", ""))
+            if math.isfinite(num):
+                return int(num) if num == int(num) else num
+        except (ValueError, TypeError):
+            pass
+    return value
+
+
+def _coerce_numeric_block(block: np.ndarray) -> np.ndarray:
+    """
+    Приводит ячейки блока: числа и числовые строки («1 234,5») → int, если
+    значение целое, иначе float; пустые/NaN → None; остальное без изменений.
+
+    int/float приводятся по типу векторно (через float64, как float(str(x))),
+    строки — векторный отбор похожих на число, точный разбор только для них.
+    """
+    result = block.copy()
+    if block.size == 0:
+        return result
+    types = cell_types(block)
+
+    numbers = (types == int) | (types == float)
+    if numbers.any():
+        as_float = block[numbers].astype(np.float64)
+        coerced = as_float.astype(object)
+        coerced[np.isnan(as_float)] = None
+        integral = np.isfinite(as_float) & (np.floor(as_float) == as_float)
+        small = integral & (np.abs(as_float) < INT64_FLOAT_LIMIT)
+        coerced[small] = as_float[small].astype(np.int64).astype(object)
+        for index in np.flatnonzero(integral & ~small):
+            coerced[index] = int(as_float[index])
+        result[numbers] = coerced
+
+    strings = types == str
+    if strings.any():
+        text = block[strings].astype(str)
+        normalized = np.char.lower(np.char.strip(text))
+        coerced = block[strings].copy()
+        coerced[np.isin(normalized, list(EMPTY_CELL_STRINGS))] = None
+        for index in np.flatnonzero(np.char.isdecimal(np.char.translate(text, _NOT_DIGITS))):
+            coerced[index] = _coerce_cell(coerced[index])
+        result[strings] = coerced
+
+    other = ~(numbers | strings | (types == bool) | (types == type(None)))
+    for row, col in zip(*np.nonzero(other)):
+        result[row, col] = _coerce_cell(block[row, col])
+    return result
+
+
 def extract_sheet_data(
     sheet: pd.DataFrame,
     structure: TableStructure,
@@ -85,7 +159,8 @@ def extract_sheet_data(
     deduplicate_columns: bool = False,
 ) -> ExtractedSheetData:
     """
-    Извлекает данные в структурированном виде.
+    Извлекает данные в структурированном виде: блок данных читается из
+    DataFrame один раз, колонки — срезы этого блока.
 
     Args:
         sheet: DataFrame листа
@@ -94,105 +169,40 @@ def extract_sheet_data(
         sheet_name: Имя листа (для логов)
         deduplicate_columns: Если True, оставлять только первое вхождение каждой колонки (5ФК)
     """
+    n_rows = len(headers.vertical)
+    # колонка 0 — вертикальные заголовки, 1 — номер строки и далее данные
+    block = _data_block(sheet, structure.data_start_row, n_rows, max(len(headers.horizontal) + 1, 2))
+    row_numbers = [_parse_row_number(value) for value in block[:, 1]]
+    row_headers = _append_row_number_for_duplicates(list(headers.vertical), row_numbers)
+
     if deduplicate_columns:
-        return _extract_with_column_dedup(sheet, structure, headers, sheet_name)
-    return _extract_simple(sheet, structure, headers, sheet_name)
+        columns = _extract_with_column_dedup(block, headers)
+    else:
+        columns = _extract_simple(block, headers)
+    return ExtractedSheetData(columns=columns, row_headers=row_headers, row_numbers=row_numbers)
 
 
-def _extract_simple(
-    sheet: pd.DataFrame,
-    structure: TableStructure,
-    headers: ParsedHeaders,
-    sheet_name: str,
-) -> ExtractedSheetData:
-    """Простое извлечение по позициям (1ФК)."""
-    columns: List[ExtractedColumn] = []
-    start_row = structure.data_start_row
-    row_numbers: List[int | str | None] = []
-    for row_idx in range(len(headers.vertical)):
-        try:
-            raw_row_number = sheet.iloc[start_row + row_idx, 1]
-        except IndexError:
-            raw_row_number = None
-        row_numbers.append(_parse_row_number(raw_row_number))
-    unique_vertical_headers = _append_row_number_for_duplicates(headers.vertical, row_numbers)
-
-    for col_idx, col_header in enumerate(headers.horizontal, start=1):
-        values: List[CellValue] = []
-        for row_idx, row_header in enumerate(unique_vertical_headers):
-            try:
-                cell_val = sheet.iloc[start_row + row_idx, col_idx]
-            except IndexError:
-                cell_val = None
-            values.append(
-                CellValue(
-                    row_header=row_header,
-                    row_number=row_numbers[row_idx],
-                    value=cell_val,
-                )
-            )
-        columns.append(ExtractedColumn(column_header=col_header, values=values))
-
-    return ExtractedSheetData(columns=columns)
-
-
-def _extract_with_column_dedup(
-    sheet: pd.DataFrame,
-    structure: TableStructure,
-    headers: ParsedHeaders,
-    sheet_name: str,
-) -> ExtractedSheetData:
+def _extract_simple(block: np.ndarray, headers: ParsedHeaders) -> List[ExtractedColumn]:
+    """Простое извлечение по позициям (1ФК): значения как есть."""
+    return [
+        ExtractedColumn(column_header=col_header, values=block[:, col_idx])
+        for col_idx, col_header in enumerate(headers.horizontal, start=1)
+    ]
+
+
+def _extract_with_column_dedup(block: np.ndarray, headers: ParsedHeaders) -> List[ExtractedColumn]:
     """
     Извлечение с дедупликацией колонок: только первое вхождение каждого имени колонки.
     Используется для 5ФК (дубликаты типа «из них крытые»).
     """
-    # Строим таблицу: колонки по позиции, имена из headers.horizontal
-    start_row = structure.data_start_row
-    vertical_headers = list(headers.vertical)
-    horizontal_headers = list(headers.horizontal)
-    row_numbers: List[int | str | None] = []
-    for row_idx in range(len(vertical_headers)):
-        try:
-            raw_row_number = sheet.iloc[start_row + row_idx, 1]
-        except IndexError:
-            raw_row_number = None
-        row_numbers.append(_parse_row_number(raw_row_number))
-    unique_vertical_headers = _append_row_number_for_duplicates(vertical_headers, row_numbers)
-
     # Маппинг: имя колонки -> позиция первого вхождения
     column_map: dict[str, int] = {}
-    for pos in range(len(horizontal_headers)):
-        name = horizontal_headers[pos]
-        if name not in column_map:
-            column_map[name] = pos
-
-    columns: List[ExtractedColumn] = []
-    for col_name, col_pos in column_map.items():
-        values: List[CellValue] = []
-        for row_idx in range(len(vertical_headers)):
-            try:
-                cell_val = sheet.iloc[start_row + row_idx, col_pos + 1]  # +1 т.к. колонка 0 — вертикальные заголовки
-            except IndexError:
-                cell_val = None
-
-            if not _is_empty_or_nan(cell_val) and _is_numeric_value(cell_val):
-                try:
-                    s = str(cell_val).strip().replace(",", ".").replace(" ", "")
-                    num = float(s)
-                    cell_val = int(num) if num == int(num) else num
-                except (ValueError, TypeError):
-                    pass
-            elif _is_empty_or_nan(cell_val):
-                cell_val = None
-
-            values.append(
-                CellValue(
-                    row_header=unique_vertical_headers[row_idx],
-                    row_number=row_numbers[row_idx],
-                    value=cell_val,
-                )
-            )
-        columns.append(ExtractedColumn(column_header=col_name.strip(), values=values))
-
-    return ExtractedSheetData(columns=columns)
-
+    for pos, name in enumerate(headers.horizontal):
+        column_map.setdefault(name, pos)
+
+    positions = [pos + 1 for pos in column_map.values()]  # +1 т.к. колонка 0 — вертикальные заголовки
+    values = _coerce_numeric_block(block[:, positions])
+    return [
+        ExtractedColumn(column_header=col_name.strip(), values=values[:, index])
+        for index, col_name in enumerate(column_map)
+    ]
@@ -1,74 +1,98 @@
 """
-Универсальная сборка FlatDataRecord из извлечённых данных листа.
+Универсальная сборка flat_data листа (SheetFlatBatch) из извлечённых данных.
 """
 import math
-from typing import List, Optional
+from decimal import Decimal
+from typing import Any, Union
 
-from app.domain.flat_data.models import FlatDataRecord
+import numpy as np
+
+from app.domain.flat_data.batch import SheetFlatBatch
 from app.domain.parsing.models import ExtractedSheetData, SERVICE_EMPTY
 
 from app.domain.parsing.notes_processor import _SERVICE_EMPTY as LEGACY_SERVICE_EMPTY
 
 
-def build_flat_data_records(
+def _is_blank(value: Any) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, float) and math.isnan(value):
+        return True
+    return isinstance(value, str) and value.strip() in ("", "nan", "none")
+
+
+def _flat_value(value: Any) -> Union[int, float, str]:
+    """
+    Значение ячейки для FlatData.value (int | float | str), как его принимала FlatDataRecord.
+
+    bool → int; прочие типы (даты, время, интервалы и т.п.) — ValueError: лист с такими
+    ячейками не сохраняется, как и при валидации FlatDataRecord.
+    """
+    if value is None:
+        # Пустые значения в ячейках считаем нулём для flat_data.
+        return 0
+    if isinstance(value, (bool, np.bool_)):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        if math.isnan(value):
+            return 0
+        if math.isfinite(value) and value == int(value):
+            return int(value)
+        return float(value)
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode("utf-8", errors="replace")
+    raise ValueError(f"Недопустимое значение ячейки для flat_data: {value!r} ({type(value).__name__})")
+
+
+_is_blank_ufunc = np.frompyfunc(_is_blank, 1, 1)
+_flat_value_ufunc = np.frompyfunc(_flat_value, 1, 1)
+
+
+def build_sheet_flat_batch(
     data: ExtractedSheetData,
     *,
-    year: Optional[int] = None,
-    reporter: Optional[str] = None,
     section: str = "",
-    file_id: Optional[str] = None,
-    form_id: Optional[str] = None,
     skip_empty: bool = False,
-) -> List[FlatDataRecord]:
+) -> SheetFlatBatch:
     """
-    Строит список FlatDataRecord из извлечённых данных.
+    Строит SheetFlatBatch из извлечённых данных: колонки листа склеиваются
+    в один массив значений (по колонкам, внутри — по строкам); таблицы меток —
+    row_headers и заголовки колонок, коды ячеек — позиции в них.
 
     Args:
         data: Извлечённые данные листа
-        year, reporter, section, file_id, form_id: Метаданные для записей
+        section: Раздел (имя листа) — общий для всех ячеек
         skip_empty: Пропускать ячейки с пустым/служебным значением
-        :param section:
-        :param year:
-        :param file_id:
-        :param form_id:
-        :param skip_empty:
-        :param data:
-        :param reporter:
     """
-    records: List[FlatDataRecord] = []
-    reporter_upper = (reporter or "").upper()
-
-    for col in data.columns:
-        col_header = col.column_header
-        for cell in col.values:
-            value = cell.value
-            if value == SERVICE_EMPTY or value == LEGACY_SERVICE_EMPTY:
-                continue
-            if skip_empty:
-                if value is None:
-                    continue
-                if isinstance(value, float) and math.isnan(value):
-                    continue
-                if isinstance(value, str) and value.strip() in ("", "nan", "none"):
-                    continue
-            if value is None:
-                # Пустые значения в ячейках считаем нулём для flat_data.
-                value = 0
-            if isinstance(value, float) and math.isnan(value):
-                value = 0
-            if isinstance(value, float) and value == int(value):
-                value = int(value)
-            records.append(
-                FlatDataRecord(
-                    year=year,
-                    reporter=reporter_upper or None,
-                    section=section,
-                    row=cell.row_header,
-                    column=col_header,
-                    value=value,
-                    file_id=file_id,
-                    form=form_id,
-                )
-            )
-    return records
+    row_labels = np.empty(len(data.row_headers), dtype=object)
+    row_labels[:] = data.row_headers
+    lengths = [min(len(row_labels), len(col.values)) for col in data.columns]
+    if not sum(lengths):
+        return SheetFlatBatch.empty(section)
+
+    column_labels = np.empty(len(data.columns), dtype=object)
+    column_labels[:] = [col.column_header for col in data.columns]
+    values = np.concatenate([col.values[:n] for col, n in zip(data.columns, lengths)]).astype(object, copy=False)
+    row_codes = np.concatenate([np.arange(n, dtype=np.int32) for n in lengths])
+    column_codes = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+
+    keep = (values != SERVICE_EMPTY) & (values != LEGACY_SERVICE_EMPTY)
+    if skip_empty:
+        keep &= ~_is_blank_ufunc(values).astype(bool)
+    if not keep.all():
+        values, row_codes, column_codes = values[keep], row_codes[keep], column_codes[keep]
 
+    return SheetFlatBatch(
+        section=section,
+        row_labels=row_labels,
+        column_labels=column_labels,
+        row_codes=row_codes,
+        column_codes=column_codes,
+        values=_flat_value_ufunc(values).astype(object, copy=False),
+    )
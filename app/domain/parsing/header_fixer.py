@@ -1,12 +1,17 @@
-﻿import json
+﻿import atexit
+import hashlib
+import json
 import logging
+import multiprocessing.util
 import re
 from functools import lru_cache
-from io import TextIOWrapper
+from importlib import metadata
 from pathlib import Path
 
 from pymorphy3 import MorphAnalyzer
 
+from app.domain.parsing.header_memo import HeaderMemo
+from app.domain.parsing.manual_map_store import ManualMapStore
 from config import config
 
 logging.getLogger("pymorphy3").setLevel(logging.WARNING)
@@ -17,15 +22,78 @@ _PUNCT_BEFORE = frozenset(',.;:!?)»–—…"\'')
 # Символы после которых \n — точно join
 _HYPHEN = frozenset('-­')  # обычный дефис + мягкий перенос
 
+# Увеличивать при изменении алгоритма fix: входит в версию памяти заголовков
+_FIX_VERSION = "1"
 
-def _build_word_set(morph: MorphAnalyzer) -> frozenset:
-    """Извлекает все известные словоформы из внутреннего словаря pymorphy3."""
+
+class _DawgLexicon:
+    """
+    Словоформы словаря pymorphy3: проверка идёт напрямую по DAWG словаря,
+    без копии всех ключей в Python-строки.
+    """
+
+    __slots__ = ("_words",)
+
+    def __init__(self, morph: MorphAnalyzer):
+        self._words = morph.dictionary.words
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._words
+
+
+@lru_cache(maxsize=1)
+def _morph_analyzer() -> MorphAnalyzer:
+    """Один MorphAnalyzer на процесс, создаётся при первом неоднозначном разрыве."""
+    return MorphAnalyzer()
+
+
+@lru_cache(maxsize=1)
+def _lexicon() -> _DawgLexicon | None:
     try:
-        dawg = morph._dictionary.words
-        return frozenset(dawg.keys())
+        return _DawgLexicon(_morph_analyzer())
     except AttributeError:
-        # fallback: пустой сет, алгоритм просто перейдёт к pymorphy3
-        return frozenset()
+        # словарь без DAWG словоформ: алгоритм просто перейдёт к pymorphy3
+        return None
+
+
+def _memo_version(manual_map: dict) -> str:
+    """Версия памяти заголовков: алгоритм, словарь pymorphy3 и содержимое manual_map."""
+    try:
+        dicts_version = metadata.version("pymorphy3-dicts-ru")
+    except metadata.PackageNotFoundError:
+        dicts_version = ""
+    raw = json.dumps([_FIX_VERSION, dicts_version, manual_map], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+_map_versions: dict[Path, tuple[tuple[int, ...], str]] = {}
+
+
+def _file_signature(path: Path) -> tuple[int, int]:
+    try:
+        stat = path.stat()
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return 0, 0
+
+
+def header_fixer_version(map_file: str | Path | None = None) -> str:
+    """
+    Версия исправлений HeaderFixer (для ключа кэша парсинга): алгоритм, словарь
+    pymorphy3 и ручные правки manual_map.json.
+
+    Выученные случаи в версию не входят — они повторяют ответ pymorphy3, и
+    новый заголовок в загрузке не сбрасывает весь кэш. Файлы перечитываются
+    только при изменении mtime/размера.
+    """
+    store = ManualMapStore(Path(map_file) if map_file else config.MANUAL_MAP_PATH, flush_interval_seconds=0)
+    signature = _file_signature(store.path) + _file_signature(store.learned_path)
+    cached = _map_versions.get(store.path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    version = _memo_version(store.overrides())
+    _map_versions[store.path] = (signature, version)
+    return version
 
 
 def _heuristic(prev_tail: str, curr_head: str) -> str | None:
@@ -69,40 +137,32 @@ def _heuristic(prev_tail: str, curr_head: str) -> str | None:
 class HeaderFixer:
     """
     Удаляет переносы '\n' в заголовках с учётом морфологии
-    и ручного маппинга с автоматическим сохранением новых кейсов.
+    и ручного маппинга с пакетным сохранением новых кейсов (ManualMapStore).
 
     Порядок приоритетов для каждого разрыва:
       1. manual_map        — явные ручные override-ы
       2. Эвристика         — символьный контекст вокруг \n (O(1))
-      3. Словарь-сет       — проверка склеенного слова (O(1))
+      3. Словарь (DAWG)    — проверка склеенного слова (O(длина слова))
       4. pymorphy3 + cache — морфологический fallback
+
+    MorphAnalyzer и словарь общие для процесса и загружаются лениво —
+    только когда эвристика не решила разрыв.
+
+    Результат fix для полного текста заголовка запоминается в HeaderMemo
+    (память + файл на диске): повторяющиеся заголовки до разбора не доходят.
     """
 
-    def __init__(self, map_file: str = None):
-        self.morph = MorphAnalyzer()
+    def __init__(self, map_file: str = None, memo_file: str | Path | None = None):
         self.map_file = Path(map_file) if map_file else config.MANUAL_MAP_PATH
-        self.manual_map = self._load_manual_map()
-        self._word_set = _build_word_set(self.morph)
-        self._new_cases: dict[str, str] = {}
-
-    def _load_manual_map(self) -> dict:
-        if self.map_file.exists():
-            try:
-                with self.map_file.open("r", encoding="utf-8") as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
-                return {}
-        return {}
-
-    def _save_manual_map(self):
-        if not self._new_cases:
-            return
-        self.manual_map.update(self._new_cases)
-        self.map_file.parent.mkdir(parents=True, exist_ok=True)
-
-        with self.map_file.open("w", encoding="utf-8") as f:  # type: TextIOWrapper
-            json.dump(self.manual_map, f, ensure_ascii=False, indent=2)
-        print(f"[HeaderFixer] Saved manual_map to {self.map_file}")
+        self._store = ManualMapStore(self.map_file, config.HEADER_FIXER_FLUSH_SECONDS)
+        self.manual_map = self._store.load()
+        if memo_file is None and config.HEADER_MEMO_ENABLED:
+            memo_file = config.HEADER_MEMO_PATH
+        self._memo = HeaderMemo(memo_file, config.HEADER_MEMO_MAX_ENTRIES, _memo_version(self.manual_map))
+
+    @property
+    def morph(self) -> MorphAnalyzer:
+        return _morph_analyzer()
 
     @lru_cache(maxsize=4096)
     def _morph_is_known(self, word: str) -> bool:
@@ -126,10 +186,11 @@ class HeaderFixer:
         if heuristic_result is not None:
             return heuristic_result
 
-        # 3. Словарь-сет — O(1) lookup
-        if self._word_set:
+        # 3. Словарь (DAWG) — lookup без загрузки словоформ в память
+        lexicon = _lexicon()
+        if lexicon is not None:
             for candidate in (combo, combo.lower(), combo.capitalize()):
-                if candidate in self._word_set:
+                if candidate in lexicon:
                     return "join"
             # Слово не найдено в словаре — скорее граница
             # Но всё же передаём в pymorphy3 для точности
@@ -139,12 +200,21 @@ class HeaderFixer:
 
         # Сохраняем только то, что дошло до pymorphy3 — реальные edge cases
         if combo:
-            self._new_cases[combo] = action
+            self.manual_map[combo] = action
+            self._store.add(combo, action)
 
         return action
 
     def fix(self, text: str) -> str:
-        parts = str(text).strip().split("\n")
+        raw = str(text)
+        fixed = self._memo.get(raw)
+        if fixed is None:
+            fixed = self._fix(raw)
+            self._memo.put(raw, fixed)
+        return fixed
+
+    def _fix(self, text: str) -> str:
+        parts = text.strip().split("\n")
         if not parts:
             return ""
 
@@ -170,18 +240,39 @@ class HeaderFixer:
         return merged
 
     def finalize(self):
-        """Сохраняет накопленные новые случаи в файл маппинга."""
-        self._save_manual_map()
+        """Конец листа: сбрасывает новые случаи и память заголовков на диск, если подошёл интервал."""
+        if self._store.flush_due():
+            self.flush()
+
+    def flush(self):
+        """Сливает новые случаи с manual_map на диске и сохраняет память заголовков."""
+        known = dict(self.manual_map)
+        merged = self._store.flush()
+        if merged is not None:
+            version = _memo_version(merged)
+            if merged == known:
+                # Маппинг дополнен теми же решениями, что уже в памяти, — записи остаются верными.
+                self._memo.rebase(version)
+            else:
+                self._memo.reset(version)
+            self.manual_map = merged
+        self._memo.save()
 
 
-_fixer = HeaderFixer()
+@lru_cache(maxsize=1)
+def _default_fixer() -> HeaderFixer:
+    fixer = HeaderFixer()
+    # atexit — обычный процесс; Finalize — процессы пула multiprocessing (завершаются через os._exit)
+    atexit.register(fixer.flush)
+    multiprocessing.util.Finalize(fixer, fixer.flush, exitpriority=0)
+    return fixer
 
 
 def fix_header(text: str) -> str:
     """Убирает переносы строк в заголовке с учётом морфологии и ручного маппинга."""
-    return _fixer.fix(text)
+    return _default_fixer().fix(text)
 
 
 def finalize_header_fixing():
     """Сохраняет накопленные новые случаи в маппинг."""
-    _fixer.finalize()
\ No newline at end of file
+    _default_fixer().finalize()
\ No newline at end of file
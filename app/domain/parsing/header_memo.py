@@ -0,0 +1,118 @@
+"""
+Память результатов HeaderFixer.fix: полный исходный текст заголовка → исправленный.
+
+В памяти — LRU ограниченного размера; на диске — JSON-файл, общий для процессов
+(API, пул парсинга, worker). Запись атомарная (временный файл + os.replace),
+при сохранении записи, уже лежащие на диске с той же версией, объединяются
+с новыми. Версия включает хэш manual_map: после его изменения файл памяти
+не используется.
+"""
+
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HeaderMemo:
+    """
+    LRU-память исправленных заголовков с сохранением на диск.
+
+    path=None — только память процесса. Методы потокобезопасны.
+    """
+
+    def __init__(self, path: Optional[Path], max_entries: int, version: str) -> None:
+        self._path = Path(path) if path is not None else None
+        self._max_entries = max(1, max_entries)
+        self._version = version
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._dirty = False
+        for text, fixed in self._read_disk().items():
+            self._store(text, fixed)
+
+    @property
+    def version(self) -> str:
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, text: str) -> Optional[str]:
+        with self._lock:
+            fixed = self._entries.get(text)
+            if fixed is not None:
+                self._entries.move_to_end(text)
+            return fixed
+
+    def put(self, text: str, fixed: str) -> None:
+        with self._lock:
+            self._store(text, fixed)
+            self._dirty = True
+
+    def rebase(self, version: str) -> None:
+        """Переводит записи на новую версию (когда manual_map дополнен теми же решениями)."""
+        with self._lock:
+            if version != self._version:
+                self._version = version
+                self._dirty = bool(self._entries)
+
+    def reset(self, version: str) -> None:
+        """Начинает новую версию без старых записей (manual_map изменён извне)."""
+        with self._lock:
+            self._version = version
+            self._entries.clear()
+            self._dirty = False
+
+    def save(self) -> None:
+        """Объединяет записи с файлом на диске и атомарно перезаписывает его."""
+        if self._path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            merged = self._read_disk()
+            merged.update(self._entries)
+            if len(merged) > self._max_entries:
+                merged = dict(islice(merged.items(), len(merged) - self._max_entries, None))
+            payload = {"version": self._version, "entries": merged}
+            try:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+                tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+                os.replace(tmp_path, self._path)
+            except OSError as exc:
+                logger.warning("Header memo %s is not saved: %s", self._path, exc)
+                return
+            self._dirty = False
+
+    # ------------------------------------------------------------------
+
+    def _store(self, text: str, fixed: str) -> None:
+        self._entries[text] = fixed
+        self._entries.move_to_end(text)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_disk(self) -> Dict[str, str]:
+        if self._path is None:
+            return {}
+        try:
+            payload = json.loads(self._path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning("Header memo %s is unreadable, ignoring: %s", self._path, exc)
+            return {}
+        if not isinstance(payload, dict) or payload.get("version") != self._version:
+            return {}
+        entries = payload.get("entries")
+        if not isinstance(entries, dict):
+            return {}
+        return {str(text): str(fixed) for text, fixed in entries.items()}
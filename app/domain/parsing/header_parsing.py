@@ -3,17 +3,17 @@
 Общая логика из BaseSheetParser; используется для 1ФК и 5ФК.
 """
 import re
-from io import BytesIO
 from typing import Any, List, Mapping, Optional
 
+import numpy as np
 import pandas as pd
 
 from app.domain.parsing.models import ParsedHeaders, TableStructure
 from app.domain.parsing.header_fixer import fix_header, finalize_header_fixing
 from app.domain.parsing.vertical_hierarchy_config import (
     VerticalHierarchyHeuristicConfig,
-    heuristic_config_from_requisites,
-    max_vertical_path_segments_from_requisites,
+    VerticalHierarchyOptions,
+    hierarchy_options_from_requisites,
     PATH_SEPARATOR,
 )
 from app.domain.parsing.workbook_source import ParsingWorkbookSource
@@ -113,42 +113,51 @@ def drop_leading_horizontal_path_segments(
     return separator.join(parts[effective_drop:])
 
 
-def _get_header_rows(sheet: pd.DataFrame, structure: TableStructure) -> pd.DataFrame:
-    """Срезы строк заголовков по структуре."""
-    return sheet.iloc[structure.header_start_row : structure.header_end_row + 1].fillna("")
-
-
-def _fill_empty_cells_in_headers(header_rows: pd.DataFrame, structure: TableStructure) -> None:
-    """Заполняет пустые ячейки в заголовках (проброс сверху и слева)."""
-    n = len(header_rows)
-    for row_idx in range(n - 1, 0, -1):
-        for col_idx in range(header_rows.shape[1]):
-            if header_rows.iloc[row_idx, col_idx] == "":
-                for search_row in range(row_idx - 1, -1, -1):
-                    if header_rows.iloc[search_row, col_idx] != "":
-                        header_rows.iloc[row_idx, col_idx] = header_rows.iloc[search_row, col_idx]
-                        break
-    for row_idx in range(n):
-        for col_idx in range(1, header_rows.shape[1]):
-            if header_rows.iloc[row_idx, col_idx] == "":
-                header_rows.iloc[row_idx, col_idx] = header_rows.iloc[row_idx, col_idx - 1]
-
-
-def _get_horizontal_headers(header_rows: pd.DataFrame) -> List[str]:
-    """Формирует горизонтальные заголовки (колонки) из многоуровневых строк."""
-    horizontal = []
-    n = len(header_rows)
-    for col_idx in range(1, header_rows.shape[1]):
-        path = []
-        current = header_rows.iloc[n - 1, col_idx]
-        path.append(current)
-        for row_idx in range(n - 2, -1, -1):
-            val = header_rows.iloc[row_idx, col_idx]
-            if val != current:
-                path.insert(0, val)
-                current = val
-        horizontal.append(PATH_SEPARATOR.join(str(p) for p in path))
-    return horizontal
+def _get_header_matrix(sheet: pd.DataFrame, structure: TableStructure) -> np.ndarray:
+    """Строки заголовков по структуре как object-матрица; пустые ячейки — ""."""
+    header_rows = sheet.iloc[structure.header_start_row : structure.header_end_row + 1]
+    return header_rows.fillna("").to_numpy(dtype=object)
+
+
+def _forward_fill_empty(matrix: np.ndarray, axis: int) -> np.ndarray:
+    """Пустые ("") ячейки получают ближайшее непустое значение выше (axis=0) или левее (axis=1)."""
+    positions = np.arange(matrix.shape[axis])
+    positions = positions[:, None] if axis == 0 else positions[None, :]
+    source = np.where(matrix == "", -1, positions)
+    np.maximum.accumulate(source, axis=axis, out=source)
+    found = source >= 0
+    filled = np.full(matrix.shape, "", dtype=object)
+    if axis == 0:
+        columns = np.broadcast_to(np.arange(matrix.shape[1]), matrix.shape)
+        filled[found] = matrix[source[found], columns[found]]
+    else:
+        rows = np.broadcast_to(np.arange(matrix.shape[0])[:, None], matrix.shape)
+        filled[found] = matrix[rows[found], source[found]]
+    return filled
+
+
+def _fill_empty_cells_in_headers(header_matrix: np.ndarray) -> np.ndarray:
+    """Заполняет пустые ячейки в заголовках (проброс сверху, затем слева)."""
+    if header_matrix.size == 0:
+        return header_matrix
+    return _forward_fill_empty(_forward_fill_empty(header_matrix, axis=0), axis=1)
+
+
+def _get_horizontal_headers(header_matrix: np.ndarray) -> List[str]:
+    """
+    Формирует горизонтальные заголовки (колонки) из многоуровневых строк.
+
+    Путь столбца — значения сверху вниз без повторов подряд (объединённая
+    ячейка, размноженная заполнением, входит в путь один раз).
+    """
+    if header_matrix.shape[1] <= 1:
+        return []
+    keep = np.ones(header_matrix.shape, dtype=bool)
+    keep[:-1] = header_matrix[:-1] != header_matrix[1:]
+    return [
+        PATH_SEPARATOR.join(map(str, column[mask]))
+        for column, mask in zip(header_matrix.T[1:], keep.T[1:])
+    ]
 
 
 def _get_vertical_header_values_and_row_indices(
@@ -352,66 +361,45 @@ def _estimate_depths_heuristic(
     return depths
 
 
-def _try_get_vertical_indent_levels_from_openpyxl(
+def _try_get_vertical_indent_levels(
     *,
-    file_content: bytes,
+    workbook_source: ParsingWorkbookSource,
     sheet_name: str,
     structure: TableStructure,
     values_df_row_indices: List[int],
     vertical_header_column_hint: int = 0,
 ) -> Optional[List[int]]:
     """
-    Пытается прочитать indent-уровни для вертикальной колонки через openpyxl.
+    Indent-уровни вертикальной колонки из индекса стилей книги (строится один раз на файл).
+
+    Колонка заголовков — первая ячейка со значением 1 в строке нумерации
+    (+ vertical_header_column_hint).
     """
-    try:
-        from openpyxl import load_workbook
-    except Exception:
+    style_index = workbook_source.style_index()
+    if style_index is None:
         return None
 
     try:
-        wb = load_workbook(BytesIO(file_content), data_only=True)
+        sheet_styles = style_index.sheet(sheet_name)
     except Exception:
         return None
-
-    if sheet_name not in wb.sheetnames:
+    if sheet_styles is None:
         return None
 
-    ws = wb[sheet_name]
-
     numbering_excel_row = structure.data_start_row
     if numbering_excel_row < 1:
         return None
 
-    first_col_excel: Optional[int] = None
-    try:
-        for cell in ws[numbering_excel_row]:
-            if cell.value is None:
-                continue
-            if cell.value == 1 or str(cell.value).strip() == "1":
-                if first_col_excel is None:
-                    first_col_excel = cell.column
-                else:
-                    first_col_excel = min(first_col_excel, cell.column)
-    except Exception:
-        return None
-
+    first_col_excel = sheet_styles.first_one_column(numbering_excel_row)
     if first_col_excel is None:
         return None
 
     vertical_header_col_excel = first_col_excel + int(vertical_header_column_hint)
-
-    indent_levels: List[int] = []
-    for df_row_idx in values_df_row_indices:
-        excel_row = int(df_row_idx) + 1  # df index -> Excel row (1-based)
-        try:
-            cell = ws.cell(row=excel_row, column=vertical_header_col_excel)
-            indent = cell.alignment.indent if cell.alignment else 0
-            indent = indent or 0
-            indent_levels.append(int(indent))
-        except Exception:
-            indent_levels.append(0)
-
-    return indent_levels
+    # df index -> Excel row (1-based)
+    return [
+        sheet_styles.indent(int(df_row_idx) + 1, vertical_header_col_excel)
+        for df_row_idx in values_df_row_indices
+    ]
 
 
 def _normalize_headers(headers: List[str]) -> List[str]:
@@ -427,6 +415,7 @@ def parse_headers(
     workbook_source: Optional[ParsingWorkbookSource] = None,
     vertical_hierarchy_mode: str = "auto",
     form_requisites: Mapping[str, Any] | None = None,
+    vertical_hierarchy: Optional[VerticalHierarchyOptions] = None,
 ) -> ParsedHeaders:
     """
     Парсит горизонтальные и вертикальные заголовки по заданной структуре.
@@ -436,40 +425,38 @@ def parse_headers(
 
     workbook_source — единый снимок байтов и расширения файла (граница upload → parsing).
 
+    vertical_hierarchy — настройки иерархии, заранее собранные из requisites (план листа);
+    если не переданы, собираются из form_requisites.
+
     Вызов finalize_header_fixing() — ответственность вызывающего (один раз после всех листов).
     """
-    header_rows = _get_header_rows(sheet, structure)
-    _fill_empty_cells_in_headers(header_rows, structure)
-
-    horizontal = _get_horizontal_headers(header_rows)
+    header_matrix = _fill_empty_cells_in_headers(_get_header_matrix(sheet, structure))
+    horizontal = _get_horizontal_headers(header_matrix)
 
     vertical_values, vertical_df_row_indices = _get_vertical_header_values_and_row_indices(
         sheet,
         structure,
     )
 
-    heuristic_cfg = heuristic_config_from_requisites(form_requisites)
-    max_path_segments = max_vertical_path_segments_from_requisites(form_requisites)
+    if vertical_hierarchy is None:
+        vertical_hierarchy = hierarchy_options_from_requisites(form_requisites)
+    heuristic_cfg = vertical_hierarchy.heuristics
+    max_path_segments = vertical_hierarchy.max_path_segments
 
     mode = (vertical_hierarchy_mode or "auto").strip().lower()
     if mode not in {"auto", "indent", "heuristics"}:
         mode = "auto"
 
-    ext = ""
-    file_content: Optional[bytes] = None
-    if workbook_source is not None:
-        ext = (workbook_source.extension or "").lower().strip()
-        file_content = workbook_source.content
-
-    is_xlsm_like = ext in {".xlsm", "xlsm"}
-    is_xlsx_like = ext in {".xlsx", "xlsx"}
-
-    attempt_indent = mode in {"indent", "auto"} and (is_xlsx_like or is_xlsm_like)
+    attempt_indent = (
+        mode in {"indent", "auto"}
+        and workbook_source is not None
+        and workbook_source.is_excel
+    )
 
     indent_levels: Optional[List[int]] = None
-    if attempt_indent and file_content:
-        indent_levels = _try_get_vertical_indent_levels_from_openpyxl(
-            file_content=file_content,
+    if attempt_indent and workbook_source.content:
+        indent_levels = _try_get_vertical_indent_levels(
+            workbook_source=workbook_source,
             sheet_name=sheet_name,
             structure=structure,
             values_df_row_indices=vertical_df_row_indices,
@@ -0,0 +1,155 @@
+"""
+Хранилище manual_map.json для HeaderFixer: ручные override-ы и выученные случаи.
+
+Новые случаи копятся в памяти и сбрасываются на диск пакетом (периодически или
+при завершении процесса). Сброс идёт под файловой блокировкой: файл перечитывается,
+в него добавляются только отсутствующие ключи (записи на диске — ручные правки
+и случаи других процессов — имеют приоритет), запись атомарная
+(временный файл + os.replace).
+
+Выученные случаи дополнительно записываются в manual_map.json.learned: по нему
+override() отличает ручные правки от выученного — решение выученного случая
+совпадает с ответом pymorphy3 и результат разбора не меняет.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+logger = logging.getLogger(__name__)
+
+
+@contextmanager
+def _file_lock(lock_path: Path) -> Iterator[None]:
+    """Эксклюзивная блокировка между процессами на время чтения-слияния-записи."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class ManualMapStore:
+    """
+    Буферизованная запись выученных случаев в manual_map.json.
+
+    Методы потокобезопасны; flush можно вызывать из нескольких процессов одновременно.
+    """
+
+    def __init__(self, path: Path, flush_interval_seconds: float) -> None:
+        self._path = Path(path)
+        self._lock_path = self._path.with_name(f"{self._path.name}.lock")
+        self._learned_path = self._path.with_name(f"{self._path.name}.learned")
+        self._flush_interval = flush_interval_seconds
+        self._lock = threading.Lock()
+        self._pending: Dict[str, str] = {}
+        self._last_flush = time.monotonic()
+        self.learned_total = 0
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def learned_path(self) -> Path:
+        return self._learned_path
+
+    def load(self) -> Dict[str, str]:
+        return self._read(self._path)
+
+    def load_learned(self) -> Dict[str, str]:
+        """Случаи, записанные в manual_map самим HeaderFixer (а не вручную)."""
+        return self._read(self._learned_path)
+
+    def overrides(self) -> Dict[str, str]:
+        """Записи manual_map, которые не совпадают с выученными: ручные правки."""
+        learned = self.load_learned()
+        return {combo: action for combo, action in self.load().items() if learned.get(combo) != action}
+
+    def add(self, combo: str, action: str) -> None:
+        with self._lock:
+            self._pending[combo] = action
+
+    def flush_due(self) -> bool:
+        return time.monotonic() - self._last_flush >= self._flush_interval
+
+    def flush(self) -> Optional[Dict[str, str]]:
+        """
+        Сливает накопленные случаи с файлом на диске.
+
+        Возвращает итоговый manual_map (как записан на диск) или None, если сбрасывать нечего.
+        """
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return None
+            try:
+                with _file_lock(self._lock_path):
+                    merged = self.load()
+                    learned = {combo: action for combo, action in self._pending.items() if combo not in merged}
+                    if learned:
+                        merged.update(learned)
+                        self._write(self._path, merged)
+                        # После manual_map: при сбое между записями случай считается ручным.
+                        self._write(self._learned_path, {**self.load_learned(), **learned})
+            except OSError as exc:
+                logger.warning("manual_map %s is not saved, %d cases kept in memory: %s", self._path, len(self._pending), exc)
+                return None
+            self._pending.clear()
+            self.learned_total += len(learned)
+        if learned:
+            logger.info(
+                "HeaderFixer: learned %d new cases (%d in this process), manual_map saved to %s",
+                len(learned),
+                self.learned_total,
+                self._path,
+            )
+        return merged
+
+    @staticmethod
+    def _read(path: Path) -> Dict[str, str]:
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as exc:
+            logger.warning("manual_map %s is unreadable, using empty map: %s", path, exc)
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @staticmethod
+    def _write(path: Path, manual_map: Dict[str, str]) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(manual_map, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
@@ -1,9 +1,15 @@
 """
 Контракты агрегата Parsing: типизированные модели для парсинга листов Excel.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Union
 
+import numpy as np
+
+# Версия результата парсинга. Увеличивать при любом изменении, влияющем на
+# заголовки или flat_data: входит в ключ кэша результатов парсинга.
+PARSER_VERSION = "2"
+
 
 @dataclass(frozen=True)
 class TableStructure:
@@ -27,27 +33,24 @@ class ParsedHeaders:
     vertical: List[str]   # заголовки строк (боковые)
 
 
-@dataclass
-class CellValue:
-    """Значение ячейки с контекстом строки."""
-
-    row_header: str
-    row_number: Optional[Union[int, str]]
-    value: Union[str, int, float, None]
-
-
 @dataclass
 class ExtractedColumn:
-    """Одна колонка извлечённых данных."""
+    """Одна колонка извлечённых данных: значения по строкам (object-массив, порядок row_headers)."""
 
     column_header: str
-    values: List[CellValue]
+    values: np.ndarray
 
 
 @dataclass
 class ExtractedSheetData:
-    """Извлечённые данные листа в структурированном виде."""
+    """
+    Извлечённые данные листа в колоночном виде: заголовки и номера строк
+    хранятся один раз, колонки — массивы значений той же длины.
+    """
+
     columns: List[ExtractedColumn]
+    row_headers: List[str] = field(default_factory=list)
+    row_numbers: List[Optional[Union[int, str]]] = field(default_factory=list)
 
 
 # Служебное значение для пустых ячеек (1ФК, notes)
@@ -1,151 +1,156 @@
-﻿import pandas as pd
+﻿"""
+Разворачивание блока «Справочно:» листа 1ФК в строки таблицы.
+
+Тело листа просматривается одним проходом сверху вниз: каждая ячейка
+классифицируется один раз (код «(NN)», число, текст), а для каждого маркера
+«Справочно:» ведётся свой текущий label. Строки примечаний собираются
+в заранее выделенный массив и добавляются в конец тела листа.
+"""
+from typing import List, Optional, Tuple
+
 import numpy as np
+import pandas as pd
 
 # Служебное значение для пустых ячеек
 _SERVICE_EMPTY = "__EMPTY__"
 ROWS_QUANTITY = 0
 
+_MARKER = "Справочно:"
+_NOTES_COLUMN = "Справочно"
 
-class NotesProcessor:
-    @staticmethod
-    def process_notes(sheet: pd.DataFrame, raw_quantity: int) -> pd.DataFrame:
-
-        if not isinstance(sheet, pd.DataFrame):
-            return sheet
-
-        if sheet.shape[0] <= raw_quantity:
-            return sheet
+_LABEL, _CODE, _NUMBER = 0, 1, 2
 
-        header_df = sheet.iloc[:raw_quantity].copy()
-
-        if "Справочно" not in header_df.columns:
-            header_df["Справочно"] = "Справочно"
-        else:
-            header_df["Справочно"] = "Справочно"
+# (колонка, текст ячейки без пробелов по краям, вид)
+_Cell = Tuple[int, str, int]
+# (label, код, значение)
+_NoteRow = Tuple[str, Optional[str], str]
 
-        # исправлено: раньше было sheet.iloc[7:]
-        body_df = sheet.iloc[raw_quantity:].copy().reset_index(drop=True)
-
-        if "Справочно" not in body_df.columns:
-            body_df["Справочно"] = _SERVICE_EMPTY
-
-        # переводим dataframe в numpy для ускорения
-        data = body_df.to_numpy(dtype=object)
-
-        # быстрый поиск координат "Справочно:"
-        coords = np.argwhere(data == "Справочно:")
-
-        if len(coords) == 0:
-            return sheet
-
-        new_rows = []
-
-        max_row, max_col = data.shape
-
-        first_col = body_df.columns[0]
-        code_col = body_df.columns[1] if body_df.shape[1] > 1 else None
 
-        def is_code(e):
-            return isinstance(e, str) and e.startswith("(") and e.endswith(")") and e[1:-1].isdigit()
+def _is_code(e: str) -> bool:
+    return e.startswith("(") and e.endswith(")") and e[1:-1].isdigit()
 
-        def is_number(e):
-            if not isinstance(e, str):
-                return False
-            e = e.replace(",", ".")
-            return any(ch.isdigit() for ch in e) and e.replace(".", "", 1).isdigit()
 
-        for row, col in coords:
+def _is_number(e: str) -> bool:
+    e = e.replace(",", ".")
+    return any(ch.isdigit() for ch in e) and e.replace(".", "", 1).isdigit()
 
-            prev_label = None
 
-            for dr in range(0, max_row - row):
+def _row_cells(row: np.ndarray, start: int) -> List[_Cell]:
+    """Непустые ячейки строки начиная с колонки start (без маркеров), классифицированные."""
+    cells = []
+    for c in range(start, len(row)):
+        val = row[c]
+        if pd.isna(val) or val == _SERVICE_EMPTY:
+            continue
+        text = str(val).strip()
+        if text == _MARKER:
+            continue
+        kind = _CODE if _is_code(text) else _NUMBER if _is_number(text) else _LABEL
+        cells.append((c, text, kind))
+    return cells
 
-                r = row + dr
 
-                for c in range(col, max_col):
+class _MarkerScan:
+    """Состояние разбора строк, следующих за одним маркером «Справочно:»."""
 
-                    val = data[r, c]
+    __slots__ = ("col", "label", "rows")
 
-                    if pd.isna(val) or val == _SERVICE_EMPTY or str(val).strip() == "Справочно:":
-                        continue
+    def __init__(self, col: int) -> None:
+        self.col = col
+        self.label: Optional[str] = None
+        self.rows: List[_NoteRow] = []
 
-                    entries = [
-                        str(x).strip()
-                        for x in data[r, c:]
-                        if x is not None and x != _SERVICE_EMPTY and not pd.isna(x)
-                    ]
+    def feed(self, entries: List[_Cell]) -> None:
+        # Если у строки нет label, разбор повторяется с её следующей ячейки.
+        for k in range(len(entries)):
+            tail = entries[k:]
+            if all(kind == _LABEL for _, _, kind in tail):
+                self.label = tail[0][1]
+                return
 
-                    entries = [e for e in entries if e != "Справочно:"]
+            row_label = tail[0][1] if tail[0][2] == _LABEL else self.label
+            code = None
+            value = None
+            unit = None
+            for _, text, kind in tail:
+                if kind == _CODE:
+                    code = text
+                elif kind == _NUMBER:
+                    value = float(text.replace(",", "."))
+                elif text != row_label:
+                    unit = text
 
-                    if not entries:
-                        continue
+            if not row_label:
+                continue
 
-                    # строка только с текстом → это label
-                    if all(not (is_code(e) or is_number(e)) for e in entries):
-                        prev_label = entries[0]
+            # исправление: если значение отсутствует
+            if value is None:
+                value = 0.0
+            self.rows.append((f"{row_label} ({unit})" if unit else row_label, code, str(value)))
+            return
 
-                    else:
 
-                        code = None
-                        value = None
-                        unit = None
-
-                        if entries and not (is_code(entries[0]) or is_number(entries[0])):
-                            row_label = entries[0]
-                        else:
-                            row_label = prev_label
-
-                        for e in entries:
-
-                            if is_code(e):
-                                code = e
-
-                            elif is_number(e):
-                                value = float(e.replace(",", "."))
-
-                            else:
-                                if e != row_label:
-                                    unit = e
-
-                        if not row_label:
-                            continue
-
-                        # исправление: если значение отсутствует
-                        if value is None:
-                            value = 0.0
-
-                        row_label = f"{row_label} ({unit})" if unit else row_label
-
-                        row_dict = {col_name: _SERVICE_EMPTY for col_name in body_df.columns}
-
-                        row_dict[first_col] = row_label
+class NotesProcessor:
+    @staticmethod
+    def process_notes(sheet: pd.DataFrame, raw_quantity: int) -> pd.DataFrame:
 
-                        if code_col:
-                            row_dict[code_col] = code or _SERVICE_EMPTY
+        if not isinstance(sheet, pd.DataFrame):
+            return sheet
 
-                        row_dict["Справочно"] = str(value)
+        if sheet.shape[0] <= raw_quantity:
+            return sheet
 
-                        new_rows.append(row_dict)
+        header_df = sheet.iloc[:raw_quantity].copy()
+        header_df[_NOTES_COLUMN] = _NOTES_COLUMN
 
-                    break
+        # исправлено: раньше было sheet.iloc[7:]
+        body_df = sheet.iloc[raw_quantity:].copy().reset_index(drop=True)
 
-        if new_rows:
+        if _NOTES_COLUMN not in body_df.columns:
+            body_df[_NOTES_COLUMN] = _SERVICE_EMPTY
 
-            new_df = pd.DataFrame(new_rows, columns=body_df.columns)
+        data = body_df.to_numpy(dtype=object)
+        coords = np.argwhere(data == _MARKER)
 
-            combined_body = pd.concat([body_df, new_df], ignore_index=True)
+        if len(coords) == 0:
+            return sheet
 
-            # ускоренная фильтрация
-            mask_not_marker = ~combined_body.eq("Справочно:").any(axis=1)
+        # Один проход по строкам: маркер начинает свой разбор со своей строки и колонки.
+        scans: List[_MarkerScan] = []
+        first_marker = 0
+        for r in range(coords[0][0], data.shape[0]):
+            while first_marker < len(coords) and coords[first_marker][0] == r:
+                scans.append(_MarkerScan(int(coords[first_marker][1])))
+                first_marker += 1
+            start = min(scan.col for scan in scans)
+            cells = _row_cells(data[r], start)
+            if not cells:
+                continue
+            for scan in scans:
+                scan.feed(cells if scan.col == start else [cell for cell in cells if cell[0] >= scan.col])
+
+        note_rows = [row for scan in scans for row in scan.rows]
+        if not note_rows:
+            return sheet
 
-            mask_label = combined_body[first_col].notna() & (~combined_body[first_col].eq(_SERVICE_EMPTY))
+        new_values = np.full((len(note_rows), data.shape[1]), _SERVICE_EMPTY, dtype=object)
+        labels, codes, values = zip(*note_rows)
+        new_values[:, 0] = labels
+        code_col = body_df.columns[1] if body_df.shape[1] > 1 else None
+        if code_col:
+            new_values[:, 1] = [code or _SERVICE_EMPTY for code in codes]
+        new_values[:, body_df.columns.get_loc(_NOTES_COLUMN)] = values
+        new_df = pd.DataFrame(new_values, columns=body_df.columns)
 
-            mask_value = combined_body["Справочно"].notna() & (~combined_body["Справочно"].eq(_SERVICE_EMPTY))
+        combined_body = pd.concat([body_df, new_df], ignore_index=True)
 
-            filtered_body = combined_body.loc[
-                mask_not_marker & (mask_label | mask_value)
-            ].reset_index(drop=True)
+        first_col = body_df.columns[0]
+        mask_not_marker = ~combined_body.eq(_MARKER).any(axis=1)
+        mask_label = combined_body[first_col].notna() & (~combined_body[first_col].eq(_SERVICE_EMPTY))
+        mask_value = combined_body[_NOTES_COLUMN].notna() & (~combined_body[_NOTES_COLUMN].eq(_SERVICE_EMPTY))
 
-            sheet = pd.concat([header_df, filtered_body], ignore_index=True)
+        filtered_body = combined_body.loc[
+            mask_not_marker & (mask_label | mask_value)
+        ].reset_index(drop=True)
 
-        return sheet
\ No newline at end of file
+        return pd.concat([header_df, filtered_body], ignore_index=True)
@@ -5,21 +5,25 @@
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 from app.domain.parsing.models import TableStructure
 
 logger = logging.getLogger(__name__)
 
+# Строковые значения, которые считаются пустой ячейкой (после strip().lower())
+EMPTY_CELL_STRINGS = ("", "nan", "none", "null", "nat", "_x0000_", "_x000d_")
+
 
 def _is_empty_or_nan(value: object) -> bool:
     """Проверяет, является ли значение пустым или NaN."""
     if pd.isna(value) or value is None:
         return True
     s = str(value).strip().lower()
-    return s in ("", "nan", "none", "null", "nat", "_x0000_", "_x000d_")
+    return s in EMPTY_CELL_STRINGS
 
 
 def _is_numeric_value(value: object) -> bool:
@@ -64,7 +68,8 @@ def _to_positive_int(value: object) -> Optional[int]:
         return None
 
     s_compact = s.replace(" ", "")
-    if s_compact.isdigit():
+    # isdecimal, а не isdigit: int("²") падает
+    if s_compact.isdecimal():
         parsed = int(s_compact)
         return parsed if parsed > 0 else None
 
@@ -80,61 +85,115 @@ def _to_positive_int(value: object) -> Optional[int]:
     return None
 
 
-def _find_1_to_n_run(row: pd.Series, min_sequence_len: int) -> Optional[Tuple[int, int, int]]:
+# Тип каждой ячейки object-массива (векторно); общий для reader'а и парсинга.
+cell_types = np.frompyfunc(type, 1, 1)
+_INT64_MAX = np.iinfo(np.int64).max
+# Граница float, ниже которой целое значение помещается в int64.
+INT64_FLOAT_LIMIT = float(2**63)
+# Пробельные символы и то, что float() допускает в числе помимо цифр ("1.5e3", "-1,0", "1_000.0"):
+# строка, у которой после их удаления остаются только цифры, может оказаться числом.
+_NOT_DIGITS = str.maketrans(
+    "", "", "".join(chr(code) for code in range(0x3000 + 1) if chr(code).isspace()) + ".,+-eE_"
+)
+
+
+def _positive_int_matrix(values: np.ndarray) -> np.ndarray:
+    """
+    Векторный _to_positive_int для 2-D object-массива.
+
+    Возвращает int64-матрицу: натуральное число ячейки или 0 (вместо None).
+    Числа больше int64 (которые всё равно не могут быть номером столбца)
+    ограничиваются int64 max. Редкие типы (numpy-скаляры, Decimal и т.п.)
+    приводятся поштучно через _to_positive_int.
+    """
+    result = np.zeros(values.shape, dtype=np.int64)
+    if values.size == 0:
+        return result
+    types = cell_types(values)
+
+    ints = types == int
+    if ints.any():
+        as_float = values[ints].astype(np.float64)
+        positive = as_float > 0
+        in_range = positive & (as_float < _INT64_MAX)
+        parsed = np.where(positive, _INT64_MAX, 0)
+        parsed[in_range] = values[ints][in_range].astype(np.int64)
+        result[ints] = parsed
+
+    floats = types == float
+    if floats.any():
+        as_float = values[floats].astype(np.float64)
+        natural = (as_float > 0) & np.isfinite(as_float) & (np.floor(as_float) == as_float)
+        parsed = np.zeros(as_float.shape, dtype=np.int64)
+        in_range = natural & (as_float < _INT64_MAX)
+        parsed[in_range] = as_float[in_range].astype(np.int64)
+        parsed[natural & ~in_range] = _INT64_MAX
+        result[floats] = parsed
+
+    strings = types == str
+    if strings.any():
+        result[strings] = _positive_ints_from_strings(values[strings])
+
+    other = ~(ints | floats | strings | (types == bool))
+    for row, col in zip(*np.nonzero(other)):
+        parsed_value = _to_positive_int(values[row, col])
+        if parsed_value is not None:
+            result[row, col] = min(parsed_value, _INT64_MAX)
+    return result
+
+
+def _positive_ints_from_strings(strings: np.ndarray) -> np.ndarray:
+    """
+    Строковая ветка _to_positive_int: "12", " 1 2 ", "12.0", "12,00" → 12.
+
+    Векторно отбираются строки, похожие на число; точно (как _to_positive_int)
+    разбираются только они.
+    """
+    result = np.zeros(strings.shape, dtype=np.int64)
+    candidates = np.char.isdecimal(np.char.translate(strings.astype(str), _NOT_DIGITS))
+    for index in np.flatnonzero(candidates):
+        parsed = _to_positive_int(strings[index])
+        if parsed is not None:
+            result[index] = min(parsed, _INT64_MAX)
+    return result
+
+
+def _find_1_to_n_runs(numbers: np.ndarray, min_sequence_len: int) -> List[Optional[Tuple[int, int, int]]]:
     """
-    Ищет последовательность натуральных чисел 1..n.
+    Ищет последовательность натуральных чисел 1..n в каждой строке матрицы
+    _positive_int_matrix.
 
     Правила:
     - последовательность начинается с первой найденной 1
     - далее строго 2,3,4...
     - между числами последовательности мусора быть не может
     - мусор может быть только до 1 и после окончания последовательности
+      (первой после неё должна идти пустая/нечисловая ячейка или конец строки)
     """
+    rows, cols = numbers.shape
+    if rows == 0 or cols == 0:
+        return [None] * rows
 
-    values = row.tolist()
-
-    start_col = None
-    end_col = None
-    expected = 1
-    in_sequence = False
-    finished = False
+    is_one = numbers == 1
+    has_one = is_one.any(axis=1)
+    start = is_one.argmax(axis=1)
 
-    for col_idx, v in enumerate(values):
-        parsed = _to_positive_int(v)
+    column = np.arange(cols)
+    offset = column[None, :] - start[:, None]
+    broken = (offset >= 0) & (numbers != offset + 1)
+    has_break = broken.any(axis=1)
+    end = np.where(has_break, broken.argmax(axis=1), cols)
+    length = end - start
 
-        if not in_sequence:
-            if parsed == 1:
-                in_sequence = True
-                start_col = col_idx
-                end_col = col_idx
-                expected = 2
-            continue
-
-        if not finished:
-            if parsed == expected:
-                end_col = col_idx
-                expected += 1
-                continue
-
-            if parsed is None:
-                finished = True
-                continue
-
-            return None
-
-        if finished:
-            # После окончания последовательности (NaN) игнорируем всё что дальше
-            break
+    after = numbers[np.arange(rows), np.minimum(end, cols - 1)]
+    garbage_after = has_break & (after != 0)
+    valid = has_one & ~garbage_after & (length >= min_sequence_len)
 
-    if start_col is None:
-        return None
-
-    length = expected - 1
-
-    if length < min_sequence_len:
-        return None
+    return [
+        (int(start[row]), int(end[row]) - 1, int(length[row])) if valid[row] else None
+        for row in range(rows)
+    ]
 
-    return start_col, end_col, length
 
 def _find_numbering_row_and_bounds(
     df: pd.DataFrame,
@@ -147,6 +206,7 @@ def _find_numbering_row_and_bounds(
 
     Идея: ищем строку, в которой присутствует прогон натуральных чисел 1..n.
     Всё, что вне прогона, считаем невалидными столбцами и отрезаем.
+    Верхний блок листа приводится к числам одним векторным проходом.
 
     Возвращает (numbering_row, first_col, last_col, n) или None.
     """
@@ -154,17 +214,14 @@ def _find_numbering_row_and_bounds(
         return None
 
     search_rows = min(max_rows_to_check, len(df))
+    numbers = _positive_int_matrix(df.iloc[:search_rows].to_numpy(dtype=object))
     best: Optional[Tuple[int, int, int, int]] = None
 
-    for row_idx in range(search_rows):
-        run = _find_1_to_n_run(df.iloc[row_idx], min_sequence_len)
+    for row_idx, run in enumerate(_find_1_to_n_runs(numbers, min_sequence_len)):
         if run is None:
             continue
 
         start_col, end_col, seq_len = run
-        if seq_len < min_sequence_len:
-            continue
-
         if best is None:
             best = (row_idx, start_col, end_col, seq_len)
             continue
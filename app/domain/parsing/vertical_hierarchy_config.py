@@ -108,3 +108,19 @@ def max_vertical_path_segments_from_requisites(requisites: Mapping[str, Any] | N
     if raw <= 0:
         return None
     return raw
+
+
+@dataclass(frozen=True)
+class VerticalHierarchyOptions:
+    """Всё, что requisites формы задают для вертикальной иерархии: эвристики и лимит пути."""
+
+    heuristics: VerticalHierarchyHeuristicConfig = DEFAULT_VERTICAL_HIERARCHY_HEURISTICS
+    max_path_segments: int | None = DEFAULT_MAX_VERTICAL_PATH_SEGMENTS
+
+
+def hierarchy_options_from_requisites(requisites: Mapping[str, Any] | None) -> VerticalHierarchyOptions:
+    """Собирает VerticalHierarchyOptions из requisites формы (см. функции выше)."""
+    return VerticalHierarchyOptions(
+        heuristics=heuristic_config_from_requisites(requisites),
+        max_path_segments=max_vertical_path_segments_from_requisites(requisites),
+    )
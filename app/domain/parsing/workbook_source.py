@@ -1,7 +1,19 @@
 """Снимок входных данных рабочей книги для доменного парсинга (без зависимости от upload-контекста)."""
 from __future__ import annotations
 
-from dataclasses import dataclass
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Optional, Union
+
+if TYPE_CHECKING:
+    from app.domain.parsing.workbook_styles import WorkbookStyleIndex
+    from app.domain.parsing.xls_styles import XlsStyleIndex
+
+logger = logging.getLogger(__name__)
+
+_EXCEL_EXTENSIONS = {"xlsx", "xlsm", "xls"}
+_ZIP_SIGNATURE = b"PK\x03\x04"
+_CFB_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
 
 
 @dataclass(frozen=True)
@@ -12,7 +24,39 @@ class ParsingWorkbookSource:
     Заполняется один раз в ProcessSheetsStep из UploadPipelineContext
     (file_content + file_info.extension), чтобы не дублировать по отдельности
     поля в ParsingPipelineContext и не рисковать рассинхроном.
+
+    Индекс стилей (style_index) строится один раз на файл при первом обращении
+    и переиспользуется всеми листами. Формат индекса выбирается по сигнатуре
+    содержимого, а не по расширению: встречаются .xls, сохранённые как OOXML.
     """
 
     content: bytes
     extension: str
+    _cache: Dict[str, object] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    @property
+    def is_excel(self) -> bool:
+        return (self.extension or "").lower().strip().lstrip(".") in _EXCEL_EXTENSIONS
+
+    def style_index(self) -> Optional[Union["WorkbookStyleIndex", "XlsStyleIndex"]]:
+        """Индекс стилей .xlsx/.xlsm/.xls (BIFF8); None для других форматов и нечитаемых файлов."""
+        if "style_index" not in self._cache:
+            index = None
+            if self.is_excel and self.content:
+                from app.domain.parsing.workbook_styles import WorkbookStyleIndex
+                from app.domain.parsing.xls_styles import XlsStyleIndex
+
+                try:
+                    if self.content.startswith(_ZIP_SIGNATURE):
+                        index = WorkbookStyleIndex(self.content)
+                    elif self.content.startswith(_CFB_SIGNATURE):
+                        index = XlsStyleIndex(self.content)
+                except Exception as exc:
+                    logger.debug("Не удалось построить индекс стилей книги: %s", exc)
+            self._cache["style_index"] = index
+        return self._cache["style_index"]  # type: ignore[return-value]
+
+    def close(self) -> None:
+        index = self._cache.pop("style_index", None)
+        if index is not None:
+            index.close()
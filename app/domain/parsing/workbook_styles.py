@@ -0,0 +1,315 @@
+"""
+Индекс стилей .xlsx/.xlsm для indent-режима вертикальных заголовков.
+
+Заменяет полную загрузку книги через openpyxl на каждый лист: XML листа
+читается потоково один раз, а из ячеек сохраняется только то, что нужно
+вертикальной колонке:
+- indent выравнивания (cellXfs/xf/alignment@indent) — только ненулевые;
+- по строкам — столбцы ячеек со значением 1 (поиск строки нумерации).
+
+Значения и стили трактуются так же, как openpyxl.load_workbook(data_only=True):
+кэшированные значения формул, числа с форматом даты — даты, объединённые
+ячейки кроме левой верхней — пустые и без стиля.
+"""
+from __future__ import annotations
+
+import posixpath
+import re
+import zipfile
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+from xml.etree.ElementTree import Element, iterparse
+
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG_REL = "http://schemas.openxmlformats.org/package/2006/relationships"
+_REL_TYPE_WORKSHEET = f"{_NS_REL}/worksheet"
+_REL_TYPE_STYLES = f"{_NS_REL}/styles"
+_REL_TYPE_SHARED_STRINGS = f"{_NS_REL}/sharedStrings"
+_REL_TYPE_OFFICE_DOCUMENT = f"{_NS_REL}/officeDocument"
+
+_TAG_ROW = f"{{{_NS_MAIN}}}row"
+_TAG_CELL = f"{{{_NS_MAIN}}}c"
+_TAG_VALUE = f"{{{_NS_MAIN}}}v"
+_TAG_TEXT = f"{{{_NS_MAIN}}}t"
+_TAG_RUN = f"{{{_NS_MAIN}}}r"
+_TAG_INLINE = f"{{{_NS_MAIN}}}is"
+_TAG_SI = f"{{{_NS_MAIN}}}si"
+_TAG_MERGE = f"{{{_NS_MAIN}}}mergeCell"
+
+_CELL_REF_RE = re.compile(r"^\$?([A-Za-z]{1,3})\$?(\d+)$")
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for char in letters.upper():
+        index = index * 26 + (ord(char) - 64)
+    return index
+
+
+def _parse_ref(ref: str) -> Optional[Tuple[int, int]]:
+    match = _CELL_REF_RE.match(ref)
+    if match is None:
+        return None
+    return int(match.group(2)), _column_index(match.group(1))
+
+
+def _text_content(node: Element) -> str:
+    """Текст <si>/<is> без форматирования: <t> и <r>/<t>, без фонетики (как openpyxl Text.content)."""
+    parts: List[str] = []
+    plain = node.find(_TAG_TEXT)
+    if plain is not None and plain.text is not None:
+        parts.append(plain.text)
+    for run in node.findall(_TAG_RUN):
+        text = run.find(_TAG_TEXT)
+        if text is not None and text.text is not None:
+            parts.append(text.text)
+    return "".join(parts)
+
+
+def is_date_number_format(fmt_id: int, custom_formats: Dict[int, str]) -> bool:
+    """Числовой формат (встроенный или из книги) — дата/время."""
+    from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+
+    fmt = custom_formats.get(fmt_id, BUILTIN_FORMATS.get(fmt_id))
+    return bool(fmt) and is_date_format(fmt)
+
+
+def _is_number_one(raw: str) -> bool:
+    try:
+        if "." in raw or "E" in raw or "e" in raw:
+            return float(raw) == 1
+        return int(raw) == 1
+    except ValueError:
+        return False
+
+
+@dataclass
+class SheetStyleIndex:
+    """Indent и строка нумерации одного листа; координаты Excel (с 1)."""
+
+    indents: Dict[Tuple[int, int], int] = field(default_factory=dict)
+    # строка → столбцы ячеек со значением 1
+    one_columns: Dict[int, List[int]] = field(default_factory=dict)
+
+    def indent(self, row: int, column: int) -> int:
+        return self.indents.get((row, column), 0)
+
+    def first_one_column(self, row: int) -> Optional[int]:
+        columns = self.one_columns.get(row)
+        return min(columns) if columns else None
+
+    def exclude_merged(self, merged: List[Tuple[int, int, int, int]]) -> None:
+        """
+        Ячейки объединений (min_row, min_col, max_row, max_col), кроме левой
+        верхней, пусты и без стиля (как MergedCell в openpyxl).
+        """
+        def covered(row: int, column: int) -> bool:
+            return any(
+                min_row <= row <= max_row
+                and min_col <= column <= max_col
+                and (row, column) != (min_row, min_col)
+                for min_row, min_col, max_row, max_col in merged
+            )
+
+        if not merged:
+            return
+        for key in [key for key in self.indents if covered(*key)]:
+            del self.indents[key]
+        for row, columns in list(self.one_columns.items()):
+            kept = [column for column in columns if not covered(row, column)]
+            if kept:
+                self.one_columns[row] = kept
+            else:
+                del self.one_columns[row]
+
+
+class WorkbookStyleIndex:
+    """
+    Индекс стилей книги. Общие части (workbook.xml, styles.xml, sharedStrings)
+    читаются при создании, лист — при первом обращении к нему.
+    """
+
+    def __init__(self, content: bytes) -> None:
+        self._zip = zipfile.ZipFile(BytesIO(content))
+        self._sheet_paths: Dict[str, str] = {}
+        self._sheets: Dict[str, Optional[SheetStyleIndex]] = {}
+
+        workbook_path = self._office_document_path()
+        rels = self._read_rels(workbook_path)
+        self._read_sheet_paths(workbook_path, rels)
+        styles_path = self._first_target(rels, _REL_TYPE_STYLES)
+        self._xf_indents, self._date_xfs = self._read_styles(styles_path)
+        strings_path = self._first_target(rels, _REL_TYPE_SHARED_STRINGS)
+        self._one_strings = self._read_one_strings(strings_path)
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self._sheet_paths)
+
+    def sheet(self, sheet_name: str) -> Optional[SheetStyleIndex]:
+        """Индекс листа или None, если такого рабочего листа нет."""
+        if sheet_name not in self._sheets:
+            path = self._sheet_paths.get(sheet_name)
+            self._sheets[sheet_name] = self._read_sheet(path) if path else None
+        return self._sheets[sheet_name]
+
+    def close(self) -> None:
+        self._zip.close()
+
+    # ------------------------------------------------------------------
+    # Части пакета
+    # ------------------------------------------------------------------
+
+    def _office_document_path(self) -> str:
+        return self._first_target(self._read_rels(""), _REL_TYPE_OFFICE_DOCUMENT) or "xl/workbook.xml"
+
+    def _read_rels(self, part_path: str) -> List[Tuple[str, str, str]]:
+        folder, name = posixpath.split(part_path)
+        rels_path = posixpath.join(folder, "_rels", f"{name}.rels")
+        if rels_path not in self._zip.namelist():
+            return []
+        with self._zip.open(rels_path) as stream:
+            return [
+                (node.get("Id", ""), node.get("Type", ""), self._resolve(folder, node.get("Target", "")))
+                for _, node in iterparse(stream)
+                if node.tag == f"{{{_NS_PKG_REL}}}Relationship"
+            ]
+
+    @staticmethod
+    def _resolve(folder: str, target: str) -> str:
+        if target.startswith("/"):
+            return target.lstrip("/")
+        return posixpath.normpath(posixpath.join(folder, target))
+
+    @staticmethod
+    def _first_target(rels: List[Tuple[str, str, str]], rel_type: str) -> Optional[str]:
+        for _, candidate_type, target in rels:
+            if candidate_type == rel_type:
+                return target
+        return None
+
+    def _read_sheet_paths(self, workbook_path: str, rels: List[Tuple[str, str, str]]) -> None:
+        targets = {rel_id: target for rel_id, rel_type, target in rels if rel_type == _REL_TYPE_WORKSHEET}
+        with self._zip.open(workbook_path) as stream:
+            for _, node in iterparse(stream):
+                if node.tag == f"{{{_NS_MAIN}}}sheet":
+                    target = targets.get(node.get(f"{{{_NS_REL}}}id", ""))
+                    if target is not None:
+                        self._sheet_paths[node.get("name", "")] = target
+
+    def _read_styles(self, styles_path: Optional[str]) -> Tuple[List[int], FrozenSet[int]]:
+        """indent по индексу cellXfs и индексы xf с форматом даты/времени."""
+        if styles_path is None:
+            return [], frozenset()
+
+        custom_formats: Dict[int, str] = {}
+        indents: List[int] = []
+        date_xfs: Set[int] = set()
+        with self._zip.open(styles_path) as stream:
+            for _, node in iterparse(stream):
+                if node.tag == f"{{{_NS_MAIN}}}numFmt":
+                    custom_formats[int(node.get("numFmtId", 0))] = node.get("formatCode", "")
+                elif node.tag == f"{{{_NS_MAIN}}}cellXfs":
+                    for index, xf in enumerate(node.findall(f"{{{_NS_MAIN}}}xf")):
+                        alignment = xf.find(f"{{{_NS_MAIN}}}alignment")
+                        indent = alignment.get("indent") if alignment is not None else None
+                        indents.append(int(float(indent)) if indent else 0)
+                        if is_date_number_format(int(xf.get("numFmtId", 0)), custom_formats):
+                            date_xfs.add(index)
+                    node.clear()
+        return indents, frozenset(date_xfs)
+
+    def _read_one_strings(self, strings_path: Optional[str]) -> FrozenSet[int]:
+        """Индексы общих строк, равных «1» после strip()."""
+        if strings_path is None or strings_path not in self._zip.namelist():
+            return frozenset()
+        ones: Set[int] = set()
+        index = 0
+        with self._zip.open(strings_path) as stream:
+            for _, node in iterparse(stream):
+                if node.tag == _TAG_SI:
+                    if _text_content(node).strip() == "1":
+                        ones.add(index)
+                    index += 1
+                    node.clear()
+        return frozenset(ones)
+
+    # ------------------------------------------------------------------
+    # Лист
+    # ------------------------------------------------------------------
+
+    def _read_sheet(self, path: str) -> SheetStyleIndex:
+        index = SheetStyleIndex()
+        merged: List[Tuple[int, int, int, int]] = []
+        row_counter = 0
+        col_counter = 0
+
+        with self._zip.open(path) as stream:
+            for event, node in iterparse(stream, events=("start", "end")):
+                tag = node.tag
+                if event == "start":
+                    if tag == _TAG_ROW:
+                        # Номер строки нужен ячейкам без атрибута r (как в openpyxl).
+                        row_ref = node.get("r")
+                        row_counter = int(row_ref) if row_ref else row_counter + 1
+                        col_counter = 0
+                    continue
+
+                if tag == _TAG_CELL:
+                    ref = node.get("r")
+                    position = _parse_ref(ref) if ref else None
+                    if position is not None:
+                        row, column = position
+                        col_counter = column
+                    else:
+                        col_counter += 1
+                        row, column = row_counter, col_counter
+
+                    style_id = int(node.get("s") or 0)
+                    if style_id < len(self._xf_indents) and self._xf_indents[style_id]:
+                        index.indents[(row, column)] = self._xf_indents[style_id]
+                    if self._is_one(node, style_id):
+                        index.one_columns.setdefault(row, []).append(column)
+                    node.clear()
+                elif tag == _TAG_ROW:
+                    node.clear()
+                elif tag == _TAG_MERGE:
+                    bounds = self._merge_bounds(node.get("ref", ""))
+                    if bounds is not None:
+                        merged.append(bounds)
+
+        index.exclude_merged(merged)
+        return index
+
+    def _is_one(self, node: Element, style_id: int) -> bool:
+        data_type = node.get("t", "n")
+        if data_type == "inlineStr":
+            inline = node.find(_TAG_INLINE)
+            return inline is not None and _text_content(inline).strip() == "1"
+
+        raw = node.findtext(_TAG_VALUE) or None
+        if raw is None:
+            return False
+        if data_type == "n":
+            return style_id not in self._date_xfs and _is_number_one(raw)
+        if data_type == "s":
+            try:
+                return int(raw) in self._one_strings
+            except ValueError:
+                return False
+        if data_type == "b":
+            return raw.strip() not in ("", "0")
+        if data_type in ("str", "e"):
+            return raw.strip() == "1"
+        return False
+
+    @staticmethod
+    def _merge_bounds(ref: str) -> Optional[Tuple[int, int, int, int]]:
+        start, _, end = ref.partition(":")
+        first = _parse_ref(start)
+        last = _parse_ref(end or start)
+        if first is None or last is None:
+            return None
+        return first[0], first[1], last[0], last[1]
@@ -0,0 +1,361 @@
+"""
+Индекс стилей .xls (BIFF8) для indent-режима вертикальных заголовков.
+
+Тот же интерфейс, что у WorkbookStyleIndex для .xlsx: из потока Workbook
+контейнера OLE2 (CFB) читаются только записи, нужные вертикальной колонке —
+XF/FORMAT (indent и форматы дат), SST (строки «1»), BOUNDSHEET и записи
+ячеек листов. Значения ячеек в книгу стилей не загружаются.
+
+Семантика совпадает с путём .xlsx: число 1 с форматом даты не считается «1»,
+ячейки объединений, кроме левой верхней, пусты и без стиля.
+"""
+from __future__ import annotations
+
+import struct
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from app.domain.parsing.workbook_styles import SheetStyleIndex, is_date_number_format
+
+_CFB_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+# Номера секторов от 0xFFFFFFFA — служебные (ENDOFCHAIN, FREESECT и т.п.).
+_MAX_SECTOR = 0xFFFFFFFA
+
+_BIFF8 = 0x0600
+
+_REC_BOF = 0x0809
+_REC_EOF = 0x000A
+_REC_FILEPASS = 0x002F
+_REC_BOUNDSHEET = 0x0085
+_REC_FORMAT = 0x041E
+_REC_XF = 0x00E0
+_REC_SST = 0x00FC
+_REC_CONTINUE = 0x003C
+_REC_NUMBER = 0x0203
+_REC_RK = 0x027E
+_REC_MULRK = 0x00BD
+_REC_LABELSST = 0x00FD
+_REC_LABEL = 0x0204
+_REC_BLANK = 0x0201
+_REC_MULBLANK = 0x00BE
+_REC_BOOLERR = 0x0205
+_REC_FORMULA = 0x0006
+_REC_STRING = 0x0207
+_REC_MERGEDCELLS = 0x00E5
+
+_U16 = struct.Struct("<H")
+_CELL_HEAD = struct.Struct("<HHH")
+
+
+class XlsFormatError(ValueError):
+    """Файл не является книгой BIFF8 (BIFF5 и старше, шифрование, повреждённый CFB)."""
+
+
+def _workbook_stream(content: bytes) -> bytes:
+    """Поток Workbook из контейнера OLE2 (Compound File Binary)."""
+    if content[:8] != _CFB_SIGNATURE:
+        raise XlsFormatError("not an OLE2 compound file")
+
+    sector_size = 1 << _U16.unpack_from(content, 0x1E)[0]
+    mini_sector_size = 1 << _U16.unpack_from(content, 0x20)[0]
+    (num_fat, first_dir, _, mini_cutoff, first_mini_fat, num_mini_fat, first_difat, num_difat) = (
+        struct.unpack_from("<8I", content, 0x2C)
+    )
+
+    def sector(index: int) -> bytes:
+        offset = (index + 1) * sector_size
+        return content[offset:offset + sector_size]
+
+    fat_sectors = list(struct.unpack_from("<109I", content, 0x4C))
+    difat_sector = first_difat
+    for _ in range(num_difat):
+        if difat_sector >= _MAX_SECTOR:
+            break
+        entries = struct.unpack(f"<{sector_size // 4}I", sector(difat_sector))
+        fat_sectors.extend(entries[:-1])
+        difat_sector = entries[-1]
+    fat: List[int] = []
+    for fat_sector in fat_sectors[:num_fat]:
+        data = sector(fat_sector)
+        fat.extend(struct.unpack(f"<{len(data) // 4}I", data))
+
+    def chain(start: int, table: List[int]) -> List[int]:
+        sectors: List[int] = []
+        while start < _MAX_SECTOR:
+            if start >= len(table) or len(sectors) > len(table):
+                raise XlsFormatError("broken sector chain")
+            sectors.append(start)
+            start = table[start]
+        return sectors
+
+    def read(start: int) -> bytes:
+        return b"".join(sector(index) for index in chain(start, fat))
+
+    directory = read(first_dir)
+    entries: Dict[str, Tuple[int, int]] = {}
+    root: Optional[Tuple[int, int]] = None
+    for offset in range(0, len(directory) - 127, 128):
+        name_length = _U16.unpack_from(directory, offset + 64)[0]
+        entry_type = directory[offset + 66]
+        start, size = struct.unpack_from("<II", directory, offset + 116)
+        name = directory[offset:offset + max(name_length - 2, 0)].decode("utf-16-le", "replace")
+        if entry_type == 5:
+            root = (start, size)
+        elif entry_type == 2:
+            entries[name.lower()] = (start, size)
+
+    if "workbook" not in entries:
+        raise XlsFormatError("no BIFF8 Workbook stream")
+    start, size = entries["workbook"]
+    if size >= mini_cutoff:
+        return read(start)[:size]
+
+    # Маленький поток лежит в mini stream корневой записи.
+    if root is None:
+        raise XlsFormatError("no root entry")
+    mini_stream = read(root[0])
+    mini_fat_data = read(first_mini_fat) if num_mini_fat else b""
+    mini_fat = list(struct.unpack(f"<{len(mini_fat_data) // 4}I", mini_fat_data))
+    return b"".join(
+        mini_stream[index * mini_sector_size:(index + 1) * mini_sector_size]
+        for index in chain(start, mini_fat)
+    )[:size]
+
+
+def _unicode_string(data: bytes, pos: int, length_size: int = 2) -> str:
+    """XLUnicodeString / ShortXLUnicodeString (без продолжения в CONTINUE)."""
+    if length_size == 1:
+        chars = data[pos]
+    else:
+        chars = _U16.unpack_from(data, pos)[0]
+    flags = data[pos + length_size]
+    pos += length_size + 1
+    if flags & 0x08:
+        pos += 2
+    if flags & 0x04:
+        pos += 4
+    if flags & 0x01:
+        return data[pos:pos + 2 * chars].decode("utf-16-le", "replace")
+    return data[pos:pos + chars].decode("latin-1")
+
+
+def _read_one_strings(pieces: List[bytes]) -> FrozenSet[int]:
+    """Индексы строк SST, равных «1» после strip(); pieces — SST и его CONTINUE."""
+    ones: Set[int] = set()
+    piece = 0
+    data = pieces[0]
+    count = struct.unpack_from("<i", data, 4)[0]
+    pos = 8
+    for index in range(count):
+        while pos >= len(data):
+            pos -= len(data)
+            piece += 1
+            if piece >= len(pieces):
+                return frozenset(ones)
+            data = pieces[piece]
+        chars = _U16.unpack_from(data, pos)[0]
+        flags = data[pos + 2]
+        pos += 3
+        runs = 0
+        phonetic = 0
+        if flags & 0x08:
+            runs = _U16.unpack_from(data, pos)[0]
+            pos += 2
+        if flags & 0x04:
+            phonetic = struct.unpack_from("<i", data, pos)[0]
+            pos += 4
+
+        parts: List[str] = []
+        got = 0
+        while True:
+            need = chars - got
+            if flags & 0x01:
+                available = min((len(data) - pos) >> 1, need)
+                parts.append(data[pos:pos + 2 * available].decode("utf-16-le", "replace"))
+                pos += 2 * available
+            else:
+                available = min(len(data) - pos, need)
+                parts.append(data[pos:pos + available].decode("latin-1"))
+                pos += available
+            got += available
+            if got == chars:
+                break
+            # Символы продолжаются в следующем CONTINUE, там свой байт флагов.
+            piece += 1
+            if piece >= len(pieces):
+                return frozenset(ones)
+            data = pieces[piece]
+            flags = (flags & ~0x01) | (data[0] & 0x01)
+            pos = 1
+
+        if "".join(parts).strip() == "1":
+            ones.add(index)
+        pos += 4 * runs + phonetic
+    return frozenset(ones)
+
+
+def _rk_value(raw: int) -> float:
+    if raw & 0x02:
+        value = float(struct.unpack("<i", struct.pack("<I", raw))[0] >> 2)
+    else:
+        value = struct.unpack("<d", struct.pack("<Q", (raw & 0xFFFFFFFC) << 32))[0]
+    return value / 100 if raw & 0x01 else value
+
+
+class XlsStyleIndex:
+    """
+    Индекс стилей книги .xls. Глобальные записи читаются при создании,
+    лист — при первом обращении к нему.
+    """
+
+    def __init__(self, content: bytes) -> None:
+        self._stream = _workbook_stream(content)
+        self._sheet_offsets: Dict[str, int] = {}
+        self._sheets: Dict[str, Optional[SheetStyleIndex]] = {}
+        self._xf_indents: List[int] = []
+        self._date_xfs: FrozenSet[int] = frozenset()
+        self._one_strings: FrozenSet[int] = frozenset()
+        self._read_globals()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self._sheet_offsets)
+
+    def sheet(self, sheet_name: str) -> Optional[SheetStyleIndex]:
+        """Индекс листа или None, если такого рабочего листа нет."""
+        if sheet_name not in self._sheets:
+            offset = self._sheet_offsets.get(sheet_name)
+            self._sheets[sheet_name] = self._read_sheet(offset) if offset is not None else None
+        return self._sheets[sheet_name]
+
+    def close(self) -> None:
+        self._sheets.clear()
+
+    def _records(self, pos: int):
+        stream = self._stream
+        end = len(stream) - 3
+        while pos < end:
+            record_type, length = struct.unpack_from("<HH", stream, pos)
+            pos += 4
+            yield record_type, stream[pos:pos + length]
+            pos += length
+
+    def _read_globals(self) -> None:
+        records = self._records(0)
+        record_type, data = next(records, (None, b""))
+        if record_type != _REC_BOF or _U16.unpack_from(data, 0)[0] != _BIFF8:
+            raise XlsFormatError("not a BIFF8 workbook")
+
+        custom_formats: Dict[int, str] = {}
+        xf_formats: List[int] = []
+        sst: List[bytes] = []
+        previous = None
+        for record_type, data in records:
+            if record_type == _REC_EOF:
+                break
+            if record_type == _REC_FILEPASS:
+                raise XlsFormatError("encrypted workbook")
+            if record_type == _REC_XF:
+                self._xf_indents.append(data[8] & 0x0F)
+                xf_formats.append(_U16.unpack_from(data, 2)[0])
+            elif record_type == _REC_FORMAT:
+                custom_formats[_U16.unpack_from(data, 0)[0]] = _unicode_string(data, 2)
+            elif record_type == _REC_BOUNDSHEET:
+                # Только рабочие листы (dt == 0): диаграммы и макролисты не парсятся.
+                if data[5] == 0:
+                    self._sheet_offsets[_unicode_string(data, 6, length_size=1)] = (
+                        struct.unpack_from("<I", data, 0)[0]
+                    )
+            elif record_type == _REC_SST:
+                sst = [data]
+            elif record_type == _REC_CONTINUE and previous == _REC_SST:
+                sst.append(data)
+                continue
+            previous = record_type
+
+        self._date_xfs = frozenset(
+            index
+            for index, fmt_id in enumerate(xf_formats)
+            if is_date_number_format(fmt_id, custom_formats)
+        )
+        if sst:
+            self._one_strings = _read_one_strings(sst)
+
+    def _read_sheet(self, offset: int) -> SheetStyleIndex:
+        index = SheetStyleIndex()
+        merged: List[Tuple[int, int, int, int]] = []
+        xf_indents = self._xf_indents
+        xf_count = len(xf_indents)
+        depth = 0
+        pending_string: Optional[Tuple[int, int]] = None
+
+        def cell(row: int, column: int, xf: int) -> None:
+            if xf < xf_count and xf_indents[xf]:
+                index.indents[(row + 1, column + 1)] = xf_indents[xf]
+
+        def one(row: int, column: int) -> None:
+            index.one_columns.setdefault(row + 1, []).append(column + 1)
+
+        for record_type, data in self._records(offset):
+            if record_type == _REC_BOF:
+                depth += 1
+                continue
+            if record_type == _REC_EOF:
+                depth -= 1
+                if depth <= 0:
+                    break
+                continue
+            if depth > 1:
+                # Вложенный поток (диаграмма на листе).
+                continue
+
+            if record_type == _REC_STRING:
+                if pending_string is not None and _unicode_string(data, 0).strip() == "1":
+                    one(*pending_string)
+                pending_string = None
+                continue
+            pending_string = None
+
+            if record_type in (_REC_NUMBER, _REC_RK, _REC_LABELSST, _REC_LABEL, _REC_BLANK, _REC_BOOLERR, _REC_FORMULA):
+                row, column, xf = _CELL_HEAD.unpack_from(data, 0)
+                cell(row, column, xf)
+                if record_type == _REC_NUMBER:
+                    is_one = struct.unpack_from("<d", data, 6)[0] == 1 and xf not in self._date_xfs
+                elif record_type == _REC_RK:
+                    is_one = _rk_value(struct.unpack_from("<I", data, 6)[0]) == 1 and xf not in self._date_xfs
+                elif record_type == _REC_LABELSST:
+                    is_one = struct.unpack_from("<I", data, 6)[0] in self._one_strings
+                elif record_type == _REC_LABEL:
+                    is_one = _unicode_string(data, 6).strip() == "1"
+                elif record_type == _REC_BOOLERR:
+                    is_one = data[7] == 0 and data[6] == 1
+                elif record_type == _REC_FORMULA:
+                    if data[12:14] != b"\xff\xff":
+                        is_one = struct.unpack_from("<d", data, 6)[0] == 1 and xf not in self._date_xfs
+                    elif data[6] == 0:
+                        # Строковый результат — в следующей записи STRING.
+                        pending_string = (row, column)
+                        is_one = False
+                    else:
+                        is_one = data[6] == 1 and data[8] == 1
+                else:
+                    is_one = False
+                if is_one:
+                    one(row, column)
+            elif record_type == _REC_MULRK:
+                row, first = struct.unpack_from("<HH", data, 0)
+                for i in range((len(data) - 6) // 6):
+                    xf, raw = struct.unpack_from("<HI", data, 4 + 6 * i)
+                    cell(row, first + i, xf)
+                    if _rk_value(raw) == 1 and xf not in self._date_xfs:
+                        one(row, first + i)
+            elif record_type == _REC_MULBLANK:
+                row, first = struct.unpack_from("<HH", data, 0)
+                for i in range((len(data) - 6) // 2):
+                    cell(row, first + i, _U16.unpack_from(data, 4 + 2 * i)[0])
+            elif record_type == _REC_MERGEDCELLS:
+                for i in range(_U16.unpack_from(data, 0)[0]):
+                    first_row, last_row, first_col, last_col = struct.unpack_from("<4H", data, 2 + 8 * i)
+                    merged.append((first_row + 1, first_col + 1, last_row + 1, last_col + 1))
+
+        index.exclude_merged(merged)
+        return index
@@ -2,7 +2,7 @@
 from dataclasses import dataclass, field
 from typing import List, Optional
 
-from app.domain.flat_data.models import FlatDataRecord
+from app.domain.flat_data.batch import SheetFlatBatch
 
 
 @dataclass
@@ -15,7 +15,7 @@ class SheetModel:
     - Передаётся в ParsingPipelineContext — шаги постепенно заполняют поля.
     - DetectTableStructureStep нормализует sheet_fullname → sheet_name.
     - ParseHeadersStep заполняет horizontal_headers / vertical_headers.
-    - GenerateFlatDataStep заполняет flat_data_records.
+    - GenerateFlatDataStep заполняет flat_data.
     - После завершения pipeline — единственный источник правды о листе.
 
     Не содержит raw/промежуточных данных (DataFrame, TableStructure и т.п.) —
@@ -26,7 +26,7 @@ class SheetModel:
     sheet_name: Optional[str] = None                                      # нормализованное имя
     horizontal_headers: List[str] = field(default_factory=list)           # Горизонтальные (боковые) заголовоки
     vertical_headers: List[str] = field(default_factory=list)             # Вертикальные (верхние) заголовоки
-    flat_data_records: List[FlatDataRecord] = field(default_factory=list) # Плоские данные для листа
+    flat_data: SheetFlatBatch = field(default_factory=SheetFlatBatch.empty) # Плоские данные для листа
 
     # Статус и диагностика (накапливаются по ходу pipeline)
     warnings: List[str] = field(default_factory=list)
@@ -1,6 +1,23 @@
-"""Округление числовых данных по листам. Часть pipeline, опционально и переопределяемо по форме."""
-import pandas as pd
+"""
+Округление числовых данных по листам. Часть pipeline, опционально и переопределяемо по форме.
+
+Правило — ROUND_HALF_UP над десятичной записью числа (str(x)), как в Decimal.
+Основная часть значений округляется векторно над float64; значения, у которых
+масштабированная дробная часть близка к 0.5 (где двоичное представление может
+увести решение не в ту сторону), а также нечисловые float (inf) и очень большие
+числа идут через Decimal. Результат совпадает с поэлементным Decimal-округлением.
+"""
 from decimal import Decimal, ROUND_HALF_UP
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Допуск около границы 0.5 относительно масштабированного значения: с запасом
+# покрывает погрешность str(x) → x и умножения на 10**ndigits (~2**-52).
+_TIE_TOLERANCE = 2.0 ** -40
+# Выше этой величины float64 не различает дробную часть — только через Decimal.
+_MAX_VECTOR_SCALED = 2.0 ** 51
 
 
 class RoundingService:
@@ -15,30 +32,78 @@ class RoundingService:
         rounded = d.quantize(quant, rounding=ROUND_HALF_UP)
         return float(rounded)
 
+    @staticmethod
+    def _ndigits(sheet_name: str) -> Optional[int]:
+        if sheet_name in RoundingService.SHEETS_INT:
+            return 0
+        if sheet_name in RoundingService.SHEETS_ONE_DECIMAL:
+            return 1
+        if sheet_name in RoundingService.SHEETS_TWO_DECIMALS:
+            return 2
+        return None
+
+    @staticmethod
+    def round_values(values: np.ndarray, ndigits: int) -> np.ndarray:
+        """
+        Округляет float-элементы object-массива (NaN и прочие типы не трогает).
+
+        ndigits=0 даёт int, иначе float. Возвращает новый object-массив.
+        """
+        result = values.copy()
+        positions = np.flatnonzero([isinstance(v, float) for v in values])
+        if not len(positions):
+            return result
+        x = values[positions].astype(np.float64)
+        finite = ~np.isnan(x)
+        positions, x = positions[finite], x[finite]
+
+        scale = 10.0 ** ndigits
+        with np.errstate(invalid="ignore", over="ignore"):
+            scaled = np.abs(x) * scale
+            whole = np.floor(scaled)
+            frac = scaled - whole
+            exact = (scaled < _MAX_VECTOR_SCALED) & (np.abs(frac - 0.5) > scaled * _TIE_TOLERANCE + _TIE_TOLERANCE)
+        units = np.copysign(whole[exact] + (frac[exact] > 0.5), x[exact])
+
+        if ndigits == 0:
+            result[positions[exact]] = units.astype(np.int64).tolist()
+        else:
+            result[positions[exact]] = (units / scale).tolist()
+
+        for pos in positions[~exact]:
+            rounded = RoundingService._round_half_up(values[pos], ndigits)
+            result[pos] = int(rounded) if ndigits == 0 else rounded
+        return result
+
     @staticmethod
     def round_dataframe(sheet_name: str, df: pd.DataFrame) -> pd.DataFrame:
-        df = df.copy()
-
-        def to_int_nearest(x):
-            if isinstance(x, float) and not pd.isna(x):
-                return int(RoundingService._round_half_up(x, 0))
-            return x
-
-        def to_one_decimal(x):
-            if isinstance(x, float) and not pd.isna(x):
-                return float(Decimal(str(x)).quantize(Decimal("0.1"), rounding=ROUND_HALF_UP))
-            return x
-
-        def to_two_decimals(x):
-            if isinstance(x, float) and not pd.isna(x):
-                return float(Decimal(str(x)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
-            return x
-
-        for col in df.columns:
-            if sheet_name in RoundingService.SHEETS_INT:
-                df[col] = df[col].apply(to_int_nearest)
-            elif sheet_name in RoundingService.SHEETS_ONE_DECIMAL:
-                df[col] = df[col].apply(to_one_decimal)
-            elif sheet_name in RoundingService.SHEETS_TWO_DECIMALS:
-                df[col] = df[col].apply(to_two_decimals)
+        """
+        Округляет числа листа по правилу его раздела. Столбцы заменяются в самом df
+        (без копии всего DataFrame); тип столбца выводится так же, как у Series.apply.
+
+        Сначала округляются все столбцы, и только потом они записываются в df:
+        при ошибке df остаётся неизменным.
+        """
+        ndigits = RoundingService._ndigits(sheet_name)
+        if ndigits is None or df.empty:
+            return df
+
+        rounded_columns = []
+        for i in range(df.shape[1]):
+            column = df.iloc[:, i]
+            if isinstance(column.dtype, pd.api.extensions.ExtensionDtype):
+                rounded_columns.append(column.apply(lambda x: RoundingService._round_scalar(x, ndigits)))
+                continue
+            rounded = RoundingService.round_values(column.to_numpy(dtype=object), ndigits)
+            rounded_columns.append(pd.Series(rounded, index=column.index).infer_objects())
+
+        for i, rounded in enumerate(rounded_columns):
+            df.isetitem(i, rounded)
         return df
+
+    @staticmethod
+    def _round_scalar(x, ndigits: int):
+        if isinstance(x, float) and not pd.isna(x):
+            rounded = RoundingService._round_half_up(x, ndigits)
+            return int(rounded) if ndigits == 0 else rounded
+        return x
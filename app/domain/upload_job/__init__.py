@@ -0,0 +1,6 @@
+"""Агрегат UploadJob: задача загрузки в очереди для ingest worker'а."""
+from app.domain.upload_job.models import UploadJob, UploadJobFile, UploadJobStatus
+from app.domain.upload_job.repository import UploadJobRepository
+from app.domain.upload_job.service import UploadJobService
+
+__all__ = ["UploadJob", "UploadJobFile", "UploadJobStatus", "UploadJobRepository", "UploadJobService"]
@@ -0,0 +1,69 @@
+"""Модели агрегата UploadJob: задача, её файлы и аренда worker'ом."""
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class UploadJobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class UploadJobFile(BaseModel):
+    """Файл задачи: где лежит содержимое в spool и чем закончилась его обработка."""
+
+    filename: str
+    content_type: str = "application/octet-stream"
+    size: int = 0
+    path: Optional[str] = None
+    content_hash: Optional[str] = None
+    # FileResponse в виде словаря; None — файл ещё не обработан
+    result: Optional[Dict[str, Any]] = None
+
+
+class UploadJob(BaseModel):
+    """
+    Документ коллекции UploadJobs.
+
+    Пока задача в работе, worker держит аренду (lease_owner / lease_expires_at)
+    и продлевает её; задачу с истёкшей арендой забирает другой worker.
+    version растёт на каждое изменение прогресса — по нему API отдаёт SSE.
+    """
+
+    upload_id: str
+    form_id: str
+    status: UploadJobStatus = UploadJobStatus.QUEUED
+    options: Dict[str, Any] = Field(default_factory=dict)
+    files: List[UploadJobFile] = Field(default_factory=list)
+
+    # Прогресс в формате UploadProgress
+    current_file: int = 0
+    processed_files: List[str] = Field(default_factory=list)
+    errors: List[str] = Field(default_factory=list)
+    stages: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    version: int = 0
+
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    attempts: int = 0
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in (UploadJobStatus.COMPLETED, UploadJobStatus.FAILED)
+
+    def pending_indexes(self) -> List[int]:
+        """Индексы файлов, для которых ещё нет результата."""
+        return [index for index, item in enumerate(self.files) if item.result is None]
+
+    def to_mongo_doc(self) -> dict:
+        data = self.model_dump()
+        data["status"] = self.status.value
+        return data
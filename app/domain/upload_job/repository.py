@@ -0,0 +1,89 @@
+"""Репозиторий агрегата UploadJob: работа с коллекцией UploadJobs."""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from pymongo import ReturnDocument
+
+from app.domain.base import BaseRepository
+from app.domain.upload_job.models import UploadJobStatus
+
+
+class UploadJobRepository(BaseRepository):
+    async def find_by_upload_id(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        return await self.find_one({"upload_id": upload_id})
+
+    async def find_newer(self, upload_id: str, version: int) -> Optional[Dict[str, Any]]:
+        return await self.find_one({"upload_id": upload_id, "version": {"$gt": version}})
+
+    async def count_pending(self) -> int:
+        return await self.count_documents(
+            {"status": {"$in": [UploadJobStatus.QUEUED.value, UploadJobStatus.RUNNING.value]}}
+        )
+
+    async def claim_next(
+        self,
+        worker_id: str,
+        lease_seconds: int,
+        max_attempts: int,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Атомарно забирает самую старую задачу из очереди или задачу с истёкшей
+        арендой, у которой ещё остались попытки (исчерпавшие их завершает
+        ошибкой recover_expired_leases worker'а).
+        """
+        now = datetime.utcnow()
+        return await self.collection.find_one_and_update(
+            {
+                "$or": [
+                    {"status": UploadJobStatus.QUEUED.value},
+                    {
+                        "status": UploadJobStatus.RUNNING.value,
+                        "lease_expires_at": {"$lt": now},
+                        "attempts": {"$lt": max_attempts},
+                    },
+                ]
+            },
+            {
+                "$set": {
+                    "status": UploadJobStatus.RUNNING.value,
+                    "lease_owner": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=lease_seconds),
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1, "version": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def find_expired(self) -> List[Dict[str, Any]]:
+        return await self.find(
+            {"status": UploadJobStatus.RUNNING.value, "lease_expires_at": {"$lt": datetime.utcnow()}}
+        )
+
+    async def update_leased(
+        self,
+        upload_id: str,
+        worker_id: str,
+        update: Dict[str, Any],
+    ) -> bool:
+        """Обновление от владельца аренды; False — аренда потеряна."""
+        result = await self.update_one({"upload_id": upload_id, "lease_owner": worker_id}, update)
+        return result.matched_count > 0
+
+    async def update_expired(
+        self,
+        upload_id: str,
+        lease_expires_at: Optional[datetime],
+        update: Dict[str, Any],
+    ) -> bool:
+        """Обновление задачи с истёкшей арендой; False — её уже забрал другой worker."""
+        result = await self.update_one(
+            {
+                "upload_id": upload_id,
+                "status": UploadJobStatus.RUNNING.value,
+                "lease_expires_at": lease_expires_at,
+            },
+            update,
+        )
+        return result.matched_count > 0
@@ -0,0 +1,132 @@
+"""Сервис агрегата UploadJob: постановка в очередь, аренда, прогресс."""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.domain.upload_job.models import UploadJob, UploadJobFile, UploadJobStatus
+from app.domain.upload_job.repository import UploadJobRepository
+
+logger = logging.getLogger(__name__)
+
+
+class UploadJobService:
+    def __init__(self, repository: UploadJobRepository):
+        self._repo = repository
+
+    async def create_job(
+        self,
+        upload_id: str,
+        form_id: str,
+        files: List[UploadJobFile],
+        options: Optional[Dict[str, Any]] = None,
+    ) -> UploadJob:
+        job = UploadJob(upload_id=upload_id, form_id=form_id, files=files, options=options or {})
+        await self._repo.insert_one(job.to_mongo_doc())
+        logger.info("Upload job queued: upload_id=%s, files=%d", upload_id, len(files))
+        return job
+
+    async def get(self, upload_id: str) -> Optional[UploadJob]:
+        doc = await self._repo.find_by_upload_id(upload_id)
+        return UploadJob(**doc) if doc else None
+
+    async def get_if_newer(self, upload_id: str, version: int) -> Optional[UploadJob]:
+        doc = await self._repo.find_newer(upload_id, version)
+        return UploadJob(**doc) if doc else None
+
+    async def count_pending(self) -> int:
+        return await self._repo.count_pending()
+
+    async def claim_next(self, worker_id: str, lease_seconds: int, max_attempts: int) -> Optional[UploadJob]:
+        doc = await self._repo.claim_next(worker_id, lease_seconds, max_attempts)
+        return UploadJob(**doc) if doc else None
+
+    async def list_expired(self) -> List[UploadJob]:
+        return [UploadJob(**doc) for doc in await self._repo.find_expired()]
+
+    async def requeue_expired(self, job: UploadJob) -> bool:
+        """Возвращает задачу с истёкшей арендой в очередь."""
+        return await self._repo.update_expired(
+            job.upload_id,
+            job.lease_expires_at,
+            {
+                "$set": {
+                    "status": UploadJobStatus.QUEUED.value,
+                    "lease_owner": None,
+                    "lease_expires_at": None,
+                    "stages": {},
+                    "updated_at": datetime.utcnow(),
+                },
+                "$inc": {"version": 1},
+            },
+        )
+
+    async def fail_expired(
+        self,
+        job: UploadJob,
+        *,
+        progress: Optional[Dict[str, Any]] = None,
+        file_results: Optional[Dict[int, Dict[str, Any]]] = None,
+    ) -> bool:
+        """Завершает ошибкой задачу с истёкшей арендой, исчерпавшую попытки."""
+        update = self._finish_update(UploadJobStatus.FAILED, progress, file_results)
+        return await self._repo.update_expired(job.upload_id, job.lease_expires_at, update)
+
+    async def save_progress(
+        self,
+        upload_id: str,
+        worker_id: str,
+        *,
+        lease_seconds: int,
+        progress: Dict[str, Any],
+        file_results: Optional[Dict[int, Dict[str, Any]]] = None,
+    ) -> bool:
+        """
+        Записывает прогресс и результаты файлов, продлевая аренду.
+
+        Returns:
+            False — задачу забрал другой worker (аренда истекла)
+        """
+        now = datetime.utcnow()
+        fields: Dict[str, Any] = {
+            **progress,
+            "lease_expires_at": now + timedelta(seconds=lease_seconds),
+            "updated_at": now,
+        }
+        for index, result in (file_results or {}).items():
+            fields[f"files.{index}.result"] = result
+        return await self._repo.update_leased(
+            upload_id, worker_id, {"$set": fields, "$inc": {"version": 1}}
+        )
+
+    async def finish(
+        self,
+        upload_id: str,
+        worker_id: str,
+        status: UploadJobStatus,
+        *,
+        progress: Optional[Dict[str, Any]] = None,
+        file_results: Optional[Dict[int, Dict[str, Any]]] = None,
+    ) -> bool:
+        """Переводит задачу в терминальный статус и снимает аренду."""
+        update = self._finish_update(status, progress, file_results)
+        return await self._repo.update_leased(upload_id, worker_id, update)
+
+    @staticmethod
+    def _finish_update(
+        status: UploadJobStatus,
+        progress: Optional[Dict[str, Any]],
+        file_results: Optional[Dict[int, Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        now = datetime.utcnow()
+        fields: Dict[str, Any] = {
+            **(progress or {}),
+            "status": status.value,
+            "stages": {},
+            "lease_owner": None,
+            "lease_expires_at": None,
+            "finished_at": now,
+            "updated_at": now,
+        }
+        for index, result in (file_results or {}).items():
+            fields[f"files.{index}.result"] = result
+        return {"$set": fields, "$inc": {"version": 1}}
@@ -0,0 +1,4 @@
+"""Ingest worker: обработка задач загрузки из очереди UploadJobs (`python -m app.worker`)."""
+from app.worker.ingest_worker import IngestWorker, build_ingest_worker
+
+__all__ = ["IngestWorker", "build_ingest_worker"]
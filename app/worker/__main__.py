@@ -0,0 +1,38 @@
+"""Точка входа ingest worker'а: `python -m app.worker`."""
+import asyncio
+import logging
+import signal
+
+from app.application.data.indexes import create_indexes
+from app.core.database import mongo_connection
+from app.worker.ingest_worker import build_ingest_worker
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    await create_indexes()
+    from app.application.parsing.registry import get_parsing_strategy_registry
+
+    get_parsing_strategy_registry()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    worker = build_ingest_worker()
+    try:
+        await worker.run(stop)
+    finally:
+        from app.core.dependencies import get_parse_executor
+
+        get_parse_executor().shutdown()
+        await mongo_connection.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
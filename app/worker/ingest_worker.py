@@ -0,0 +1,362 @@
+# app/worker/ingest_worker.py
+import asyncio
+import logging
+import os
+import socket
+from pathlib import Path
+from typing import Dict, List, Set
+from uuid import uuid4
+
+from app.api.v2.schemas.files import FileResponse
+from app.application.data import DataSaveService
+from app.application.upload.options import UploadOptions
+from app.application.upload.spool import SpooledFile, UploadSpool
+from app.application.upload.upload_manager import UploadManager
+from app.application.upload.upload_progress import UploadProgress
+from app.domain.file.models import FileStatus
+from app.domain.file.service import FileService
+from app.domain.upload_job import UploadJob, UploadJobService, UploadJobStatus
+from config.config import config
+
+logger = logging.getLogger(__name__)
+
+_INTERRUPTED_ERROR = "Upload interrupted: worker stopped before the file was processed"
+_MISSING_CONTENT_ERROR = "Uploaded file content is no longer available"
+
+
+class IngestWorker:
+    """
+    Забирает задачи из UploadJobs и обрабатывает их тем же upload pipeline,
+    что и API в inline-режиме (UploadManager.process_upload).
+
+    - Задача берётся атомарно (findOneAndUpdate) вместе с арендой на
+      UPLOAD_JOB_LEASE_SECONDS; пока задача идёт, прогресс и результаты файлов
+      пишутся в документ, и каждая запись продлевает аренду.
+    - Задачу с истёкшей арендой (worker упал) забирает любой worker. Файлы без
+      результата, оставшиеся в PROCESSING, откатываются через
+      DataSaveService.rollback и обрабатываются заново; после
+      UPLOAD_JOB_MAX_ATTEMPTS попыток задачу больше не забирают, а
+      recover_expired_leases (при старте и раз в UPLOAD_JOB_LEASE_SECONDS)
+      завершает её ошибкой.
+    - Spool-файл удаляется только после того, как результат файла записан в
+      задачу, каталог загрузки — когда задача перешла в терминальный статус.
+      При потере аренды файлы остаются для worker'а, забравшего задачу.
+    """
+
+    def __init__(
+        self,
+        job_service: UploadJobService,
+        upload_manager: UploadManager,
+        file_service: FileService,
+        data_save_service: DataSaveService,
+        *,
+        spool: UploadSpool | None = None,
+        worker_id: str | None = None,
+        max_jobs: int | None = None,
+        lease_seconds: int | None = None,
+        heartbeat_seconds: float | None = None,
+        poll_seconds: float | None = None,
+        max_attempts: int | None = None,
+    ) -> None:
+        self._jobs = job_service
+        self._manager = upload_manager
+        self._file_service = file_service
+        self._data_save_service = data_save_service
+        self._spool = spool or upload_manager.spool
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._max_jobs = max(1, max_jobs or config.UPLOAD_WORKER_JOBS)
+        self._lease_seconds = lease_seconds or config.UPLOAD_JOB_LEASE_SECONDS
+        self._heartbeat_seconds = heartbeat_seconds or config.UPLOAD_JOB_HEARTBEAT_SECONDS
+        self._poll_seconds = poll_seconds or config.UPLOAD_WORKER_POLL_SECONDS
+        self._max_attempts = max_attempts or config.UPLOAD_JOB_MAX_ATTEMPTS
+
+    # ------------------------------------------------------------------
+    # Цикл worker'а
+    # ------------------------------------------------------------------
+
+    async def run(self, stop: asyncio.Event) -> None:
+        logger.info("Ingest worker %s started", self.worker_id)
+        loop = asyncio.get_running_loop()
+        next_recovery = loop.time()
+
+        running: Set[asyncio.Task] = set()
+        while not stop.is_set():
+            if loop.time() >= next_recovery:
+                await self.recover_expired_leases()
+                next_recovery = loop.time() + self._lease_seconds
+
+            if len(running) >= self._max_jobs:
+                await asyncio.wait(
+                    running,
+                    timeout=max(0.0, next_recovery - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                continue
+
+            job = await self._jobs.claim_next(self.worker_id, self._lease_seconds, self._max_attempts)
+            if job is None:
+                try:
+                    await asyncio.wait_for(stop.wait(), self._poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self.run_job(job))
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+        # Начатые задачи доводим до конца; остальное заберёт следующий worker.
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        logger.info("Ingest worker %s stopped", self.worker_id)
+
+    async def recover_expired_leases(self) -> None:
+        """Возвращает в очередь (или завершает ошибкой) задачи упавших worker'ов."""
+        for job in await self._jobs.list_expired():
+            recovered = await self._rollback_unfinished(job)
+            if job.attempts >= self._max_attempts:
+                results = dict(recovered)
+                for index in job.pending_indexes():
+                    results.setdefault(
+                        index,
+                        _failed(job.files[index].filename, _INTERRUPTED_ERROR),
+                    )
+                for index, result in results.items():
+                    job.files[index].result = result
+                if await self._jobs.fail_expired(
+                    job, progress=_final_progress(job), file_results=results
+                ):
+                    self._spool.release_upload(job.upload_id)
+                    logger.warning(
+                        "Upload job %s failed after %d attempts", job.upload_id, job.attempts
+                    )
+            elif await self._jobs.requeue_expired(job):
+                logger.warning("Upload job %s requeued after expired lease", job.upload_id)
+
+    # ------------------------------------------------------------------
+    # Обработка задачи
+    # ------------------------------------------------------------------
+
+    async def run_job(self, job: UploadJob) -> None:
+        logger.info(
+            "Upload job claimed: upload_id=%s, files=%d, attempt=%d",
+            job.upload_id,
+            len(job.files),
+            job.attempts,
+        )
+        if job.attempts > 1:
+            for index, result in (await self._rollback_unfinished(job)).items():
+                job.files[index].result = result
+
+        pending: List[int] = []
+        spooled: List[SpooledFile] = []
+        preset: Dict[int, dict] = {}
+        for index in job.pending_indexes():
+            item = job.files[index]
+            if not item.path or not Path(item.path).exists():
+                preset[index] = _failed(item.filename, _MISSING_CONTENT_ERROR)
+                continue
+            pending.append(index)
+            spooled.append(
+                SpooledFile(
+                    item.filename,
+                    item.content_type,
+                    item.size,
+                    path=Path(item.path),
+                    content_hash=item.content_hash,
+                )
+            )
+        for index, result in preset.items():
+            job.files[index].result = result
+
+        progress = UploadProgress(upload_id=job.upload_id, total_files=len(spooled), form_id=job.form_id)
+        work = asyncio.create_task(
+            self._manager.process_upload(
+                spooled,
+                job.form_id,
+                job.upload_id,
+                progress,
+                UploadOptions(**job.options),
+            )
+        )
+        sync = asyncio.create_task(self._sync_progress(job, pending, spooled, progress))
+        await asyncio.wait({work, sync}, return_when=asyncio.FIRST_COMPLETED)
+
+        if sync.done() and not work.done():
+            # Аренду забрал другой worker — прекращаем работу над задачей;
+            # spool-файлы остаются ему.
+            work.cancel()
+            await asyncio.gather(work, return_exceptions=True)
+            logger.error("Lost lease on upload job %s, processing cancelled", job.upload_id)
+            return
+
+        await asyncio.gather(work, return_exceptions=True)
+        await sync
+
+    async def _sync_progress(
+        self,
+        job: UploadJob,
+        pending: List[int],
+        spooled: List[SpooledFile],
+        progress: UploadProgress,
+    ) -> bool:
+        """
+        Переносит прогресс и результаты файлов в документ задачи. Пишет не
+        реже раза в heartbeat — это и есть продление аренды. Spool-файл
+        удаляется, когда его результат записан.
+
+        Returns:
+            False — аренда потеряна
+        """
+        version = -1
+        written: Set[int] = set()
+        while True:
+            await progress.wait_for_change(version, self._heartbeat_seconds)
+            version = progress.version
+
+            results = {
+                pending[local]: response.model_dump()
+                for local, response in progress.file_results.items()
+                if pending[local] not in written
+            }
+            for index, result in results.items():
+                job.files[index].result = result
+
+            if progress.is_terminal:
+                break
+
+            try:
+                ok = await self._jobs.save_progress(
+                    job.upload_id,
+                    self.worker_id,
+                    lease_seconds=self._lease_seconds,
+                    progress=_running_progress(job, pending, progress),
+                    file_results=results,
+                )
+            except Exception as exc:
+                # Повторим при следующем изменении или heartbeat — аренда ещё действует.
+                logger.warning("Failed to save progress of upload job %s: %s", job.upload_id, exc)
+                continue
+            if not ok:
+                return False
+            written.update(results)
+            for local, index in enumerate(pending):
+                if index in results:
+                    self._spool.release(spooled[local])
+            # Не пишем в Mongo на каждое событие — копим изменения.
+            await asyncio.sleep(min(0.5, self._heartbeat_seconds))
+
+        # Файлы, до которых обработка не дошла (например, форма не найдена).
+        for index in pending:
+            if job.files[index].result is None:
+                job.files[index].result = _failed(
+                    job.files[index].filename,
+                    progress.errors[-1] if progress.errors else "Upload processing failed",
+                )
+        final_results = {index: job.files[index].result for index in range(len(job.files))}
+        status = (
+            UploadJobStatus.COMPLETED
+            if all(item.result["status"] == FileStatus.SUCCESS.value for item in job.files)
+            else UploadJobStatus.FAILED
+        )
+        ok = await self._jobs.finish(
+            job.upload_id,
+            self.worker_id,
+            status,
+            progress=_final_progress(job),
+            file_results=final_results,
+        )
+        if ok:
+            for item in spooled:
+                self._spool.release(item)
+            self._spool.release_upload(job.upload_id)
+        logger.info("Upload job %s finished: %s", job.upload_id, status.value)
+        return ok
+
+    async def _rollback_unfinished(self, job: UploadJob) -> Dict[int, dict]:
+        """
+        Файлы без результата после падения worker'а: откатывает оставшиеся в
+        PROCESSING записи Files. Если файл успел сохраниться (SUCCESS с тем же
+        содержимым), возвращает его результат, чтобы не обрабатывать повторно.
+        """
+        recovered: Dict[int, dict] = {}
+        for index in job.pending_indexes():
+            item = job.files[index]
+            existing = await self._file_service.get_by_filename(item.filename.strip(), job.form_id)
+            if existing is None:
+                continue
+            if existing.status == FileStatus.PROCESSING:
+                await self._data_save_service.rollback(existing, _INTERRUPTED_ERROR)
+            elif (
+                existing.status == FileStatus.SUCCESS
+                and item.content_hash
+                and existing.content_hash == item.content_hash
+            ):
+                recovered[index] = FileResponse(
+                    filename=item.filename,
+                    status=FileStatus.SUCCESS,
+                    error="",
+                    file_id=existing.file_id,
+                ).model_dump()
+        return recovered
+
+
+def _failed(filename: str, error: str) -> dict:
+    return FileResponse(filename=filename, status=FileStatus.FAILED, error=error).model_dump()
+
+
+def _running_progress(job: UploadJob, pending: List[int], progress: UploadProgress) -> dict:
+    """Прогресс задачи: файлы, завершённые в прошлых попытках, + текущая попытка."""
+    current = set(pending)
+    earlier = [
+        item
+        for index, item in enumerate(job.files)
+        if index not in current and item.result is not None
+    ]
+    return {
+        "current_file": len(earlier) + progress.current_file,
+        "processed_files": [item.filename for item in earlier] + list(progress.processed_files),
+        "errors": [item.result["error"] for item in earlier if item.result.get("error")] + list(progress.errors),
+        "stages": {name: dict(stage) for name, stage in progress.stages.items()},
+    }
+
+
+def _final_progress(job: UploadJob) -> dict:
+    finished = [item for item in job.files if item.result is not None]
+    return {
+        "current_file": len(finished),
+        "processed_files": [item.filename for item in finished],
+        "errors": [item.result["error"] for item in finished if item.result.get("error")],
+    }
+
+
+def build_ingest_worker() -> IngestWorker:
+    """Собирает worker из тех же зависимостей, что и API, но без очереди в UploadManager."""
+    from app.application.parsing.registry import get_parsing_strategy_registry
+    from app.core.dependencies import (
+        get_data_save_service,
+        get_file_service,
+        get_form_service,
+        get_ingest_scheduler,
+        get_parse_cache,
+        get_parse_executor,
+        get_upload_job_service,
+        get_upload_spool,
+    )
+
+    manager = UploadManager(
+        file_service=get_file_service(),
+        form_service=get_form_service(),
+        data_save_service=get_data_save_service(),
+        parsing_registry=get_parsing_strategy_registry(),
+        spool=get_upload_spool(),
+        parse_executor=get_parse_executor(),
+        parse_cache=get_parse_cache(),
+        scheduler=get_ingest_scheduler(),
+    )
+    return IngestWorker(
+        job_service=get_upload_job_service(),
+        upload_manager=manager,
+        file_service=get_file_service(),
+        data_save_service=get_data_save_service(),
+    )
@@ -1,6 +1,8 @@
-from pydantic_settings import BaseSettings, SettingsConfigDict
+import tempfile
 from pathlib import Path
 
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
 
 class Settings(BaseSettings):
     APP_ENV: str
@@ -15,7 +17,57 @@ class Settings(BaseSettings):
     MONGO_TRANSACTION_MAX_FLAT_RECORDS: int = 30000
     FLATDATA_BULK_CHUNK_SIZE: int = 3000
 
+    # Приём файлов: содержимое пишется потоково на диск, а не в память процесса
+    UPLOAD_SPOOL_ENABLED: bool = True
+    UPLOAD_SPOOL_DIR: Path = Path(tempfile.gettempdir()) / "dwh_upload_spool"
+    UPLOAD_SPOOL_CHUNK_SIZE: int = 1024 * 1024
+    UPLOAD_SPOOL_MAX_BYTES: int = 4 * 1024 * 1024 * 1024
+    UPLOAD_MAX_REQUEST_BYTES: int = 1024 * 1024 * 1024
+
+    # Чтение и парсинг книг: process — пул процессов, inline — в процессе API
+    PARSE_EXECUTOR: str = "process"
+    PARSE_WORKERS: int = 0  # 0 — по числу CPU
+    PARSE_WORKER_MAX_TASKS: int = 50  # файлов на процесс до его пересоздания
+    # Построение DataFrame листа: calamine — напрямую из ячеек, pandas — pd.read_excel
+    EXCEL_READER_ENGINE: str = "calamine"
+    # Отрезать пустые строки/столбцы за последним значением листа при чтении
+    EXCEL_TRIM_USED_RANGE: bool = True
+
+    # Кэш результатов парсинга (ключ: содержимое + реквизиты формы + версия парсера)
+    PARSE_CACHE_ENABLED: bool = True
+    PARSE_CACHE_DIR: Path = Path(tempfile.gettempdir()) / "dwh_parse_cache"
+    PARSE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+
+    # Сколько файлов одной загрузки обрабатываются одновременно
+    UPLOAD_FILE_CONCURRENCY: int = 2
+    # Сколько разобранных файлов может ждать записи в БД
+    UPLOAD_PERSIST_QUEUE_SIZE: int = 2
+
+    # inline — файлы обрабатывает процесс API; queue — задача в UploadJobs,
+    # обработка в отдельном процессе `python -m app.worker` (spool-каталог общий)
+    UPLOAD_EXECUTION_MODE: str = "inline"
+    UPLOAD_JOB_MAX_PENDING: int = 100  # незавершённых задач, сверх — 429
+    UPLOAD_JOB_PROGRESS_POLL_SECONDS: float = 0.5  # как часто API перечитывает прогресс задачи
+    UPLOAD_JOB_TTL_SECONDS: int = 7 * 24 * 3600  # хранение завершённых задач
+    UPLOAD_WORKER_JOBS: int = 2  # задач одновременно на один worker
+    UPLOAD_WORKER_POLL_SECONDS: float = 1.0  # пауза, когда очередь пуста
+    UPLOAD_JOB_LEASE_SECONDS: int = 60
+    UPLOAD_JOB_HEARTBEAT_SECONDS: int = 15
+    UPLOAD_JOB_MAX_ATTEMPTS: int = 3
+
+    # Глобальный планировщик обработки: лимиты на все загрузки процесса
+    INGEST_MAX_RUNNING_FILES: int = 4
+    INGEST_MAX_INFLIGHT_BYTES: int = 256 * 1024 * 1024
+    INGEST_MAX_QUEUED_COST: int = 4 * 1024 * 1024 * 1024  # байты × вес расширения
+    INGEST_RETRY_AFTER_SECONDS: int = 30  # пока пропускная способность не измерена
+
     MANUAL_MAP_PATH: Path = Path(__file__).resolve().parent.parent / "app" / "utils" / "manual_map.json"
+    # Как часто HeaderFixer сбрасывает выученные случаи и память заголовков на диск (и при завершении процесса)
+    HEADER_FIXER_FLUSH_SECONDS: float = 30.0
+    # Память исправленных заголовков HeaderFixer (версия — по содержимому manual_map); выключено — только в памяти процесса
+    HEADER_MEMO_ENABLED: bool = True
+    HEADER_MEMO_PATH: Path = Path(tempfile.gettempdir()) / "dwh_header_memo.json"
+    HEADER_MEMO_MAX_ENTRIES: int = 100_000
 
     model_config = SettingsConfigDict(
         env_file=str(Path(__file__).resolve().parent.parent / ".env"),
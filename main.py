@@ -37,6 +37,9 @@ async def lifespan(_app: FastAPI):
 
     await get_form_maintenance_service().ensure_system_forms_exist()
     yield
+    from app.core.dependencies import get_parse_executor
+
+    get_parse_executor().shutdown()
     await mongo_connection.close()
 
 
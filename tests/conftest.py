@@ -7,6 +7,13 @@ import pytest
 
 from config.config import config
 
+# Память заголовков HeaderFixer по умолчанию лежит во временном каталоге системы и общая
+# для всех процессов: в тестах её выключаем (и для процессов пула — через окружение),
+# чтобы запуски не делились состоянием друг с другом и с локальным сервером.
+# Тесты памяти передают свой memo_file в tmp_path.
+os.environ["HEADER_MEMO_ENABLED"] = "false"
+config.HEADER_MEMO_ENABLED = False
+
 
 @pytest.fixture(autouse=True)
 def _disable_mongo_transactions_in_tests(monkeypatch: pytest.MonkeyPatch) -> None:
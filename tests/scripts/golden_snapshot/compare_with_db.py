@@ -25,6 +25,7 @@ from config.config import config
 from tests.scripts.golden_snapshot.runtime import (
     PROJECT_ROOT,
     compare_record_sets,
+    context_records,
     count_by_section,
     record_to_dict,
     run_upload_pipeline,
@@ -149,7 +150,7 @@ async def main_async() -> int:
 
     db_records_raw, file_doc = await _fetch_db_payload(args.file_id)
 
-    ctx_records = [record_to_dict(record) for record in ctx.flat_data]
+    ctx_records = [record_to_dict(record) for record in context_records(ctx)]
     db_records = [record_to_dict(record) for record in db_records_raw]
 
     comparison = compare_record_sets(ctx_records, db_records, include_file_meta=False)
@@ -23,6 +23,7 @@ from tests.scripts.golden_snapshot.runtime import (
     build_snapshot_payload,
     checkpoint_specs_from_snapshot,
     compare_record_sets,
+    context_records,
     count_by_section,
     load_snapshot,
     record_to_dict,
@@ -90,14 +91,14 @@ def _sheet_payload(sheet) -> dict[str, Any]:
             "horizontal": list(sheet.horizontal_headers),
             "vertical": list(sheet.vertical_headers),
         },
-        "flat_data": [record_to_dict(record) for record in sheet.flat_data_records],
+        "flat_data": [record_to_dict(record) for record in sheet.flat_data.records()],
     }
 
 
 def _render_visual_report(ctx, persisted_records, output_path: Path) -> None:
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    ctx_records = [record_to_dict(record) for record in ctx.flat_data]
+    ctx_records = [record_to_dict(record) for record in context_records(ctx)]
     persisted = [record_to_dict(record) for record in persisted_records]
 
     api_match = compare_record_sets(ctx_records, persisted, include_file_meta=True)
@@ -205,7 +206,7 @@ async def run_snapshot_phase(args: argparse.Namespace) -> int:
         print(f"ERROR: pipeline failed for {fixture_path.name}: {ctx.error}")
         return 2
 
-    api_match = compare_record_sets(ctx.flat_data, capture.saved_flat_data, include_file_meta=True)
+    api_match = compare_record_sets(context_records(ctx), capture.saved_flat_data, include_file_meta=True)
     if args.strict_api and not api_match["equal"]:
         print("ERROR: context data differs from API-equivalent persist payload.")
         print(json.dumps(api_match, ensure_ascii=False, indent=2, default=str))
@@ -50,12 +50,9 @@ class CaptureDataSaveService:
 
     async def process_and_save_all(self, file_model, flat_data=None):
         self.saved_file_model = copy.deepcopy(file_model)
-        self.saved_flat_data = []
-        for record in flat_data or []:
-            if isinstance(record, FlatDataRecord):
-                self.saved_flat_data.append(record.model_copy(deep=True))
-            else:
-                self.saved_flat_data.append(FlatDataRecord(**record))
+        self.saved_flat_data = [
+            FlatDataRecord(**doc) for doc in (flat_data.to_mongo_docs() if flat_data is not None else [])
+        ]
         return None
 
     async def rollback(self, file_model, error: str):
@@ -248,6 +245,10 @@ def normalize_year(value: Any) -> int | None:
         return None
 
 
+def context_records(ctx: UploadPipelineContext) -> list[FlatDataRecord]:
+    return ctx.flat_data.records()
+
+
 def record_to_dict(record: FlatDataRecord | Mapping[str, Any]) -> dict[str, Any]:
     if isinstance(record, FlatDataRecord):
         doc = record.model_dump(exclude_none=False)
@@ -373,7 +374,7 @@ def build_snapshot_payload(
     checkpoints: Sequence[Mapping[str, Any]] | None = None,
     description: str = "Golden snapshot generated from upload pipeline output.",
 ) -> dict[str, Any]:
-    records = list(ctx.flat_data)
+    records = context_records(ctx)
     normalized = [record_to_dict(record) for record in records]
 
     year = next((item["year"] for item in normalized if item.get("year") is not None), None)
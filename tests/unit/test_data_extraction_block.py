@@ -0,0 +1,82 @@
+from datetime import datetime
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from app.domain.parsing import ExtractedSheetData, ParsedHeaders, TableStructure, extract_sheet_data
+from app.domain.parsing.data_extraction import _coerce_numeric_block
+from app.domain.parsing.structure_detection import _is_empty_or_nan, _is_numeric_value
+
+
+TRICKY_VALUES = [
+    None, np.nan, pd.NaT, True, 0, -3, 7, 2**70, 1.0, -0.0, 2.5, 1e20, "5", " 1 234,5 ", "12.0",
+    "1,5", "abc", "", " nan ", "NULL", "_x000D_", "в т.ч. 1", "1.2.3", "+7", "1e3",
+    np.int64(4), np.float64(5.5), Decimal("6.0"), datetime(2020, 1, 1), pd.Timestamp("2021-01-01"),
+]
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _reference_coerce(cell_val: object) -> object:
+    """Прежнее поячеечное приведение из _extract_with_column_dedup."""
+    if not _is_empty_or_nan(cell_val) and _is_numeric_value(cell_val):
+        try:
+            s = str(cell_val).strip().replace(",", ".").replace(" ", "")
+            num = float(s)
+            cell_val = int(num) if num == int(num) else num
+        except (ValueError, TypeError):
+            pass
+    elif _is_empty_or_nan(cell_val):
+        cell_val = None
+    return cell_val
+
+
+def _typed(values) -> list:
+    return [(type(v), v) for v in values]
+
+
+def test_block_coercion_matches_per_cell_coercion() -> None:
+    _banner("data extraction: vectorised block coercion equals the per-cell rules (values and types)")
+    block = np.empty((len(TRICKY_VALUES), 2), dtype=object)
+    block[:, 0] = TRICKY_VALUES
+    block[:, 1] = TRICKY_VALUES[::-1]
+    coerced = _coerce_numeric_block(block)
+    for col in range(block.shape[1]):
+        expected = [_reference_coerce(v) for v in block[:, col]]
+        assert _typed(coerced[:, col]) == _typed(expected)
+
+
+def test_extract_reads_block_once_and_pads_missing_rows() -> None:
+    _banner("data extraction: columnar result, duplicate rows numbered, rows past the sheet are None")
+    sheet = pd.DataFrame(
+        [
+            ["Всего", "01", "1 000", 2.0, "x"],
+            ["Прочие", "02", None, 3.5, "y"],
+            ["Прочие", 3, "nan", 4, "z"],
+        ],
+        dtype=object,
+    )
+    structure = TableStructure(header_start_row=0, header_end_row=0, data_start_row=0, vertical_header_column=0)
+    headers = ParsedHeaders(
+        horizontal=["№", "A", "B", "A", "C"],
+        vertical=["Всего", "Прочие", "Прочие", "Итого"],
+    )
+
+    simple = extract_sheet_data(sheet, structure, headers)
+    assert isinstance(simple, ExtractedSheetData)
+    assert simple.row_headers == ["Всего", "Прочие (2)", "Прочие (3)", "Итого"]
+    assert simple.row_numbers == [1, 2, 3, None]
+    assert [c.column_header for c in simple.columns] == ["№", "A", "B", "A", "C"]
+    assert simple.columns[1].values.tolist() == ["1 000", None, "nan", None]
+    assert simple.columns[4].values.tolist() == [None, None, None, None]
+
+    dedup = extract_sheet_data(sheet, structure, headers, deduplicate_columns=True)
+    assert [c.column_header for c in dedup.columns] == ["№", "A", "B", "C"]
+    assert _typed(dedup.columns[1].values) == _typed([1000, None, None, None])
+    assert _typed(dedup.columns[2].values) == _typed([2, 3.5, 4, None])
+    assert dedup.columns[3].values.tolist() == [None, None, None, None]  # за правой границей листа
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.application.upload.pipeline.readers import ExcelReader, SheetGrid
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FIXTURES = sorted(
+    path
+    for folder in ("1fk", "5fk")
+    for path in (PROJECT_ROOT / "tests" / "fixtures" / folder).iterdir()
+    if path.suffix.lower() in {".xls", ".xlsx", ".xlsm"}
+)
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=lambda path: path.name)
+def test_calamine_engine_matches_pandas_engine(fixture: Path) -> None:
+    _banner(f"excel reader: calamine engine == pandas engine on {fixture.name}")
+    content = fixture.read_bytes()
+    with ExcelReader(engine="pandas").read(content, fixture.name) as expected, ExcelReader(
+        engine="calamine"
+    ).read(content, fixture.name) as actual:
+        assert list(actual) == list(expected)
+        for sheet_name in expected:
+            want, got = expected[sheet_name], actual[sheet_name]
+            pd.testing.assert_frame_equal(got, want)
+            # assert_frame_equal не различает int и float в object-колонках.
+            mismatched = [
+                (a, b)
+                for a, b in zip(got.to_numpy().ravel(), want.to_numpy().ravel())
+                if type(a) is not type(b)
+            ]
+            assert mismatched == [], f"{sheet_name}: {mismatched[:5]}"
+        print(f"sheets compared: {len(expected)}")
+
+
+def test_sheet_grid_cell_coercion() -> None:
+    _banner("sheet grid: pandas-style cell coercion")
+    grid = SheetGrid.from_rows([["Всего", 3.0, 2.5], ["", "N/A", True]])
+
+    assert grid.values[0].tolist() == ["Всего", 3, 2.5]
+    assert type(grid.values[0, 1]) is int
+    assert np.isnan(grid.values[1, 0]) and np.isnan(grid.values[1, 1])
+    assert grid.to_dataframe().shape == (2, 3)
@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import AsyncMock
 
-from app.domain.flat_data.models import FlatDataRecord
+from app.domain.flat_data.batch import FileFlatData, SheetFlatBatch
 from app.domain.flat_data.service import FlatDataService
 
 
@@ -46,8 +46,11 @@ async def test_save_flat_data_returns_actual_inserted_count_on_bulk_partial_succ
     service = FlatDataService(mock_repo)
 
     # Создаем 3842 записи, но 32 из них будут "дублями" (симулируем через mock)
-    records = [FlatDataRecord(year=2023, reporter="TEST", section="Раздел1", row=f"R{i}", column=f"C{i}", value=i,
-                              file_id="f1") for i in range(3842)]
+    batch = SheetFlatBatch.from_lists(
+        "Раздел1", [f"R{i}" for i in range(3842)], [f"C{i}" for i in range(3842)], list(range(3842))
+    )
+    flat_data = FileFlatData([batch])
+    flat_data.stamp(file_id="f1", form=None, year=2023, reporter="TEST")
 
     # Патчим bulk_write так, чтобы он "пропускал" каждый 120-й документ (имитация 32 пропущенных)
     original_bulk = mock_collection.bulk_write
@@ -61,7 +64,7 @@ async def test_save_flat_data_returns_actual_inserted_count_on_bulk_partial_succ
     mock_collection.bulk_write = failing_bulk
     mock_repo.bulk_write_ops = failing_bulk
 
-    inserted_total = await service.save_flat_data(records)
+    inserted_total = await service.save_flat_data(flat_data)
     actual_in_db = await mock_repo.count_documents({"file_id": "f1"})
 
     print(f"📊 Returned by service: {inserted_total}")
@@ -102,7 +105,7 @@ async def test_pipeline_updates_flat_data_size_after_persist():
     file_model.file_id = "test-uuid"
     ctx = AsyncMock()
     ctx.file_model = file_model
-    ctx.flat_data = [AsyncMock() for _ in range(3842)]
+    ctx.flat_data = FileFlatData([SheetFlatBatch.from_lists("Раздел1", ["R"] * 3842, ["C"] * 3842, [0] * 3842)])
 
     await save_svc.process_and_save_all(file_model, ctx.flat_data)
 
@@ -8,6 +8,7 @@ from tests.scripts.golden_snapshot.runtime import (
     build_snapshot_payload,
     checkpoint_specs_from_snapshot,
     compare_record_sets,
+    context_records,
     load_snapshot,
     run_upload_pipeline,
 )
@@ -108,7 +109,7 @@ async def test_pipeline_payload_is_api_equivalent(case: SnapshotCase):
     ctx, capture = await _run_case(case)
 
     comparison = compare_record_sets(
-        ctx.flat_data,
+        context_records(ctx),
         capture.saved_flat_data,
         include_file_meta=True,
     )
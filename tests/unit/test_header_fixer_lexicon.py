@@ -0,0 +1,55 @@
+import json
+from pathlib import Path
+
+from app.domain.parsing import header_fixer
+from app.domain.parsing.header_fixer import HeaderFixer
+
+
+WORDS = [
+    "спортивных", "сооружений", "численность", "занимающихся", "учреждений", "физкультурно",
+    "оздоровительной", "тренеров", "ёлочных", "работников", "инструкторов", "методистов",
+]
+NOT_WORDS = ["спортивныхсооружений", "чел", "всегоиз", "щщщ", "тренерынет", "ёжикдом"]
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _fixer(tmp_path: Path) -> HeaderFixer:
+    map_file = tmp_path / "manual_map.json"
+    map_file.write_text(json.dumps({}), encoding="utf-8")
+    return HeaderFixer(map_file=str(map_file), memo_file=tmp_path / "memo.json")
+
+
+def test_morphology_is_loaded_only_for_ambiguous_breaks(tmp_path: Path) -> None:
+    _banner("header fixer lexicon: no MorphAnalyzer until a break the heuristic cannot decide")
+    header_fixer._lexicon.cache_clear()
+    header_fixer._morph_analyzer.cache_clear()
+    fixer = _fixer(tmp_path)
+    assert fixer.fix("Всего,\nчел.") == "Всего, чел."
+    assert fixer.fix("Числен-\nность") == "Числен-ность"
+    assert header_fixer._morph_analyzer.cache_info().currsize == 0
+
+    assert fixer.fix("спортив\nных") == "спортивных"
+    assert header_fixer._morph_analyzer.cache_info().currsize == 1
+    assert header_fixer._lexicon() is header_fixer._lexicon()
+
+
+def test_lexicon_decisions_match_morphology(tmp_path: Path) -> None:
+    _banner("header fixer lexicon: join/space for every split equals pymorphy3 word_is_known")
+    fixer = _fixer(tmp_path)
+    checked = 0
+    for word in WORDS + NOT_WORDS:
+        for combo in (word, word.capitalize()):
+            for cut in range(1, len(combo)):
+                prev_tail, curr_head = combo[:cut], combo[cut:]
+                if header_fixer._heuristic(prev_tail, curr_head) is not None:
+                    continue
+                expected = "join" if fixer._morph_is_known(combo) else "space"
+                assert fixer._resolve(combo, prev_tail, curr_head) == expected, combo
+                checked += 1
+    print(f"ambiguous breaks checked: {checked}")
+    assert checked > 0
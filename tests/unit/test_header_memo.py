@@ -0,0 +1,86 @@
+import json
+from pathlib import Path
+
+from app.domain.parsing.header_fixer import HeaderFixer
+from app.domain.parsing.header_memo import HeaderMemo
+
+
+HEADERS = [
+    "Числен-\nность занимающихся",
+    "Количество спортив\nных сооружений",
+    "Всего,\nчел.",
+    "из них\nженщин",
+    "в том числе\nв сельской местности",
+]
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _write_map(path: Path, manual_map: dict) -> None:
+    path.write_text(json.dumps(manual_map, ensure_ascii=False), encoding="utf-8")
+
+
+def test_memo_survives_restart_and_skips_morphology(tmp_path: Path) -> None:
+    _banner("header memo: results persisted on disk, a new fixer answers without the resolver")
+    map_file, memo_file = tmp_path / "manual_map.json", tmp_path / "memo.json"
+    _write_map(map_file, {})
+
+    first = HeaderFixer(map_file=str(map_file), memo_file=memo_file)
+    expected = [first.fix(h) for h in HEADERS]
+    first.flush()
+    print("fixed:", expected)
+
+    second = HeaderFixer(map_file=str(map_file), memo_file=memo_file)
+
+    def _no_resolve(*args, **kwargs):
+        raise AssertionError("memo miss: header reached the resolver")
+
+    second._resolve = _no_resolve
+    assert [second.fix(h) for h in HEADERS] == expected
+
+
+def test_manual_map_edit_invalidates_memo(tmp_path: Path) -> None:
+    _banner("header memo: editing manual_map.json changes the version, old entries are ignored")
+    map_file, memo_file = tmp_path / "manual_map.json", tmp_path / "memo.json"
+    _write_map(map_file, {})
+    fixer = HeaderFixer(map_file=str(map_file), memo_file=memo_file)
+    assert fixer.fix("Количество спортив\nных сооружений") == "Количество спортивных сооружений"
+    fixer.flush()
+
+    manual_map = json.loads(map_file.read_text(encoding="utf-8"))
+    manual_map["спортивных"] = "space"
+    _write_map(map_file, manual_map)
+    edited = HeaderFixer(map_file=str(map_file), memo_file=memo_file)
+    assert len(edited._memo) == 0
+    assert edited.fix("Количество спортив\nных сооружений") == "Количество спортив ных сооружений"
+
+
+def test_memo_is_bounded_and_merges_files_of_other_processes(tmp_path: Path) -> None:
+    _banner("header memo: LRU bound in memory, save merges entries already written by another process")
+    path = tmp_path / "memo.json"
+    memo = HeaderMemo(path, max_entries=3, version="v1")
+    for i in range(4):
+        memo.put(f"h{i}", f"H{i}")
+    memo.get("h1")
+    memo.put("h4", "H4")
+    assert [memo.get(k) for k in ("h0", "h1", "h2", "h3", "h4")] == [None, "H1", None, "H3", "H4"]
+
+    memo.save()
+    assert len(json.loads(path.read_text(encoding="utf-8"))["entries"]) == 3
+
+    worker_a = HeaderMemo(path, max_entries=10, version="v1")
+    worker_b = HeaderMemo(path, max_entries=10, version="v1")
+    worker_a.put("a", "A")
+    worker_b.put("b", "B")
+    worker_a.save()
+    worker_b.save()
+    merged = HeaderMemo(path, max_entries=10, version="v1")
+    assert {k: merged.get(k) for k in ("a", "b", "h1", "h3", "h4")} == {
+        "a": "A", "b": "B", "h1": "H1", "h3": "H3", "h4": "H4"
+    }
+    assert len(HeaderMemo(path, max_entries=10, version="v2")) == 0
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,109 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.domain.parsing.header_parsing import (
+    _fill_empty_cells_in_headers,
+    _get_header_matrix,
+    _get_horizontal_headers,
+)
+from app.domain.parsing.models import TableStructure
+from app.domain.parsing.structure_detection import auto_detect_table_layout
+from app.domain.parsing.vertical_hierarchy_config import PATH_SEPARATOR
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FIXTURES = sorted((PROJECT_ROOT / "tests" / "fixtures").glob("[15]fk/*.xls*"))
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _reference_horizontal(sheet: pd.DataFrame, structure: TableStructure) -> list[str]:
+    """Прежняя реализация: поячеечное заполнение через .iloc и обход столбцов."""
+    header_rows = sheet.iloc[structure.header_start_row : structure.header_end_row + 1].fillna("")
+    n = len(header_rows)
+    for row_idx in range(n - 1, 0, -1):
+        for col_idx in range(header_rows.shape[1]):
+            if header_rows.iloc[row_idx, col_idx] == "":
+                for search_row in range(row_idx - 1, -1, -1):
+                    if header_rows.iloc[search_row, col_idx] != "":
+                        header_rows.iloc[row_idx, col_idx] = header_rows.iloc[search_row, col_idx]
+                        break
+    for row_idx in range(n):
+        for col_idx in range(1, header_rows.shape[1]):
+            if header_rows.iloc[row_idx, col_idx] == "":
+                header_rows.iloc[row_idx, col_idx] = header_rows.iloc[row_idx, col_idx - 1]
+
+    horizontal = []
+    for col_idx in range(1, header_rows.shape[1]):
+        current = header_rows.iloc[n - 1, col_idx]
+        path = [current]
+        for row_idx in range(n - 2, -1, -1):
+            val = header_rows.iloc[row_idx, col_idx]
+            if val != current:
+                path.insert(0, val)
+                current = val
+        horizontal.append(PATH_SEPARATOR.join(str(p) for p in path))
+    return horizontal
+
+
+def _engine_horizontal(sheet: pd.DataFrame, structure: TableStructure) -> list[str]:
+    return _get_horizontal_headers(_fill_empty_cells_in_headers(_get_header_matrix(sheet, structure)))
+
+
+def test_header_engine_fills_down_then_right_and_dedupes_paths() -> None:
+    _banner("horizontal headers: fill down, then right; merged cells appear once in a path")
+    sheet = pd.DataFrame(
+        [
+            ["", "Всего", None, "Прочие", None],
+            [None, "мужчины", "женщины", None, "из них"],
+            [None, 2020, "2020", None, None],
+        ],
+        dtype=object,
+    )
+    structure = TableStructure(
+        header_start_row=0,
+        header_end_row=2,
+        data_start_row=3,
+        vertical_header_column=0,
+    )
+
+    expected = _reference_horizontal(sheet, structure)
+    assert _engine_horizontal(sheet, structure) == expected
+    assert expected == [
+        f"Всего{PATH_SEPARATOR}мужчины{PATH_SEPARATOR}2020",
+        f"Всего{PATH_SEPARATOR}женщины{PATH_SEPARATOR}2020",
+        "Прочие",
+        f"Прочие{PATH_SEPARATOR}из них",
+    ]
+
+
+def test_header_engine_matches_reference_on_fixtures() -> None:
+    _banner("horizontal headers: NumPy engine equals the .iloc implementation on every fixture sheet")
+    checked = 0
+    for path in FIXTURES:
+        sheets = pd.read_excel(path, sheet_name=None, header=None, dtype=object, engine="calamine")
+        for name, df in sheets.items():
+            layout = auto_detect_table_layout(df, sheet_name=name)
+            if layout is None or layout.structure.header_end_row < layout.structure.header_start_row:
+                continue
+            sheet = df.iloc[:, layout.first_col : layout.last_col + 1]
+            assert _engine_horizontal(sheet, layout.structure) == _reference_horizontal(sheet, layout.structure), (
+                path.name,
+                name,
+            )
+            checked += 1
+    print(f"sheets checked: {checked}")
+    assert checked > 0
+
+
+def test_header_engine_handles_single_row_and_column() -> None:
+    _banner("horizontal headers: degenerate header blocks")
+    matrix = np.array([["", "a", ""]], dtype=object)
+    assert _get_horizontal_headers(_fill_empty_cells_in_headers(matrix)) == ["a", "a"]
+    assert _get_horizontal_headers(np.array([["x"]], dtype=object)) == []
@@ -0,0 +1,113 @@
+import asyncio
+
+import pytest
+
+from app.application.upload.scheduler import IngestScheduler, estimate_file_cost
+from app.core.exceptions import UploadBackpressureError, to_http_exception
+
+
+MB = 1024 * 1024
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_caps_running_files_and_serves_forms_round_robin() -> None:
+    _banner("ingest scheduler: running cap and fair order across forms")
+    scheduler = IngestScheduler(
+        max_running_files=1,
+        max_inflight_bytes=100 * MB,
+        max_queued_cost=10_000 * MB,
+    )
+    gate = asyncio.Event()
+    order: list[str] = []
+
+    async def run(form_id: str, upload_id: str, name: str, hold: bool = False) -> None:
+        async with scheduler.slot(upload_id, form_id, MB, f"{name}.xlsx"):
+            order.append(name)
+            if hold:
+                await gate.wait()
+
+    # Первый файл занимает единственный слот, остальные встают в очередь:
+    # три файла формы A из одной загрузки и один файл формы B.
+    blocker = asyncio.create_task(run("A", "u1", "a0", hold=True))
+    await asyncio.sleep(0)
+    waiting = [asyncio.create_task(run("A", "u1", f"a{i}")) for i in range(1, 4)]
+    await asyncio.sleep(0)
+    waiting.append(asyncio.create_task(run("B", "u2", "b1")))
+    await asyncio.sleep(0)
+
+    stats = scheduler.stats()
+    print(f"while blocked: {stats}")
+    assert stats.running_files == 1 and stats.queue_depth == 4
+
+    gate.set()
+    await asyncio.gather(blocker, *waiting)
+
+    print(f"start order: {order}")
+    assert order == ["a0", "a1", "b1", "a2", "a3"]
+    stats = scheduler.stats()
+    assert stats.running_files == 0 and stats.inflight_bytes == 0 and stats.queue_depth == 0
+    assert stats.started_files == 5 and stats.max_wait_seconds > 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_rejects_when_queue_is_full_with_retry_after() -> None:
+    _banner("ingest scheduler: saturated queue → 429 with Retry-After")
+    first_cost = estimate_file_cost(10 * MB, "a.xlsx")
+    scheduler = IngestScheduler(max_queued_cost=first_cost + 1, default_retry_after=17)
+
+    # Пустая очередь принимает загрузку любого размера.
+    scheduler.admit("u1", "A", [(10 * MB, "a.xlsx")])
+    assert estimate_file_cost(10 * MB, "a.xls") < first_cost
+
+    with pytest.raises(UploadBackpressureError) as exc_info:
+        scheduler.admit("u2", "B", [(MB, "b.xls")])
+
+    http_exc = to_http_exception(exc_info.value)
+    print(f"status={http_exc.status_code}, headers={http_exc.headers}")
+    assert http_exc.status_code == 429
+    assert http_exc.headers == {"Retry-After": "17"}
+    assert scheduler.stats().rejected_uploads == 1
+
+    # Файл первой загрузки запущен — резерв снят, очередь снова принимает.
+    async with scheduler.slot("u1", "A", 10 * MB, "a.xlsx"):
+        scheduler.admit("u2", "B", [(MB, "b.xls")])
+    scheduler.finish_upload("u1")
+    scheduler.finish_upload("u2")
+    assert scheduler.stats().queued_cost == 0
+
+
+@pytest.mark.asyncio
+async def test_scheduler_drops_cancelled_waiters() -> None:
+    _banner("ingest scheduler: cancelled waiter leaves the queue")
+    scheduler = IngestScheduler(max_running_files=1, max_inflight_bytes=MB, max_queued_cost=MB)
+    gate = asyncio.Event()
+
+    async def hold() -> None:
+        async with scheduler.slot("u1", "A", MB, "a.xls"):
+            await gate.wait()
+
+    async def quick() -> None:
+        async with scheduler.slot("u2", "B", MB, "b.xls"):
+            pass
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(quick())
+    await asyncio.sleep(0)
+    assert scheduler.stats().queue_depth == 1
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.stats().queue_depth == 0
+
+    gate.set()
+    await holder
+    stats = scheduler.stats()
+    assert stats.running_files == 0 and stats.inflight_bytes == 0
@@ -0,0 +1,74 @@
+from io import BytesIO
+from pathlib import Path
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from app.application.upload.pipeline.parse_executor import InlineParseExecutor, WorkbookParseJob
+from app.application.upload.pipeline.readers import ExcelReader, LazyWorkbook
+from app.domain.file.models import FileInfo
+from app.domain.form.models import FormInfo, detect_form_type
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FIXTURE = PROJECT_ROOT / "tests" / "fixtures" / "1fk" / "АЛАПАЕВСК 2020.xls"
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def test_lazy_workbook_matches_eager_read_and_skips_empty_sheets() -> None:
+    _banner("lazy workbook: same sheets and DataFrames as pd.read_excel, empty sheets excluded")
+    wb = openpyxl.Workbook()
+    wb.active.title = "Пустой"
+    wb.create_sheet("Титул")["A1"] = "Отчёт"
+    section = wb.create_sheet("Раздел1")
+    section["B2"] = "строка"
+    section["C3"] = 1.5
+    buffer = BytesIO()
+    wb.save(buffer)
+    content = buffer.getvalue()
+
+    eager = pd.read_excel(BytesIO(content), sheet_name=None, header=None, dtype=object, engine="calamine")
+    with ExcelReader().read(content, "book.xlsx") as workbook:
+        assert list(workbook) == ["Титул", "Раздел1"]
+        assert len(workbook) == 2 and "Пустой" not in workbook
+        assert workbook.loaded == []
+        pd.testing.assert_frame_equal(workbook["Раздел1"], eager["Раздел1"])
+        assert workbook.loaded == ["Раздел1"]
+        with pytest.raises(KeyError):
+            workbook["Пустой"]
+
+
+@pytest.mark.asyncio
+async def test_parse_decodes_only_sheets_accepted_by_strategy(monkeypatch) -> None:
+    _banner("lazy workbook: skip_sheets / rejected sheets are never turned into DataFrames")
+    decoded: list[str] = []
+    original = LazyWorkbook.__getitem__
+
+    def spy(self, sheet_name):
+        decoded.append(sheet_name)
+        return original(self, sheet_name)
+
+    monkeypatch.setattr(LazyWorkbook, "__getitem__", spy)
+    job = WorkbookParseJob(
+        filename=FIXTURE.name,
+        form_info=FormInfo(
+            id="eab639f7-78c4-4e08-bd27-756bac5cf571",
+            name="1ФК",
+            type=detect_form_type("1ФК"),
+            requisites={"skip_sheets": [0]},
+        ),
+        content=FIXTURE.read_bytes(),
+        file_info=FileInfo(reporter="АЛАПАЕВСК", year=2020, extension="xls"),
+    )
+
+    result = await InlineParseExecutor().parse(job)
+
+    print(f"decoded sheets: {decoded}")
+    assert "Раздел0" not in decoded
+    assert decoded == [sheet.sheet_fullname for sheet in result.sheets]
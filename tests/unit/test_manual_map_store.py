@@ -0,0 +1,76 @@
+import json
+import multiprocessing
+from pathlib import Path
+
+from app.domain.parsing.header_fixer import HeaderFixer
+from app.domain.parsing.manual_map_store import ManualMapStore
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _read(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _learn_in_process(path: str, worker: int) -> None:
+    store = ManualMapStore(Path(path), flush_interval_seconds=0)
+    for i in range(20):
+        store.add(f"w{worker}-{i}", "join")
+        if i % 5 == 4:
+            store.flush()
+
+
+def test_cases_are_buffered_until_flush_and_merged_with_disk(tmp_path: Path) -> None:
+    _banner("manual_map store: buffered cases, disk entries win, atomic write, learned count")
+    path = tmp_path / "manual_map.json"
+    path.write_text(json.dumps({"ручной": "space"}, ensure_ascii=False), encoding="utf-8")
+    store = ManualMapStore(path, flush_interval_seconds=3600)
+
+    store.add("ручной", "join")
+    store.add("новый", "join")
+    assert store.pending == 2 and not store.flush_due()
+    assert _read(path) == {"ручной": "space"}
+
+    path.write_text(json.dumps({"ручной": "space", "соседний": "space"}, ensure_ascii=False), encoding="utf-8")
+    merged = store.flush()
+    assert merged == _read(path) == {"ручной": "space", "соседний": "space", "новый": "join"}
+    assert store.learned_total == 1 and store.pending == 0
+    assert store.flush() is None
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_concurrent_processes_do_not_lose_cases(tmp_path: Path) -> None:
+    _banner("manual_map store: parallel processes flush under the file lock, nothing is lost")
+    path = tmp_path / "manual_map.json"
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=_learn_in_process, args=(str(path), worker)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(60)
+        assert process.exitcode == 0
+    saved = _read(path)
+    print(f"cases on disk: {len(saved)}")
+    assert saved == {f"w{worker}-{i}": "join" for worker in range(4) for i in range(20)}
+
+
+def test_fixer_flushes_learned_cases_on_schedule(tmp_path: Path) -> None:
+    _banner("header fixer: finalize writes nothing before the interval, flush persists learned cases")
+    map_file = tmp_path / "manual_map.json"
+    map_file.write_text("{}", encoding="utf-8")
+    fixer = HeaderFixer(map_file=str(map_file), memo_file=tmp_path / "memo.json")
+    fixer._store._flush_interval = 3600
+
+    assert fixer.fix("спортив\nнх") == "спортив нх"
+    fixer.finalize()
+    assert _read(map_file) == {}
+    assert fixer.manual_map["спортивнх"] == "space"
+
+    fixer.flush()
+    assert _read(map_file) == {"спортивнх": "space"}
+    assert fixer._store.learned_total == 1
+    assert HeaderFixer(map_file=str(map_file), memo_file=tmp_path / "memo.json")._memo.get("спортив\nнх") == "спортив нх"
@@ -0,0 +1,202 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+from app.domain.parsing.notes_processor import NotesProcessor, _SERVICE_EMPTY
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FIXTURES = sorted((PROJECT_ROOT / "tests" / "fixtures" / "1fk").glob("*.xls*"))
+HEADER_ROWS = 7
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _reference_process_notes(sheet: pd.DataFrame, raw_quantity: int) -> pd.DataFrame:
+    """Прежняя реализация: отдельный проход до конца листа от каждого маркера «Справочно:»."""
+    if not isinstance(sheet, pd.DataFrame):
+        return sheet
+
+    if sheet.shape[0] <= raw_quantity:
+        return sheet
+
+    header_df = sheet.iloc[:raw_quantity].copy()
+
+    if "Справочно" not in header_df.columns:
+        header_df["Справочно"] = "Справочно"
+    else:
+        header_df["Справочно"] = "Справочно"
+
+    # исправлено: раньше было sheet.iloc[7:]
+    body_df = sheet.iloc[raw_quantity:].copy().reset_index(drop=True)
+
+    if "Справочно" not in body_df.columns:
+        body_df["Справочно"] = _SERVICE_EMPTY
+
+    # переводим dataframe в numpy для ускорения
+    data = body_df.to_numpy(dtype=object)
+
+    # быстрый поиск координат "Справочно:"
+    coords = np.argwhere(data == "Справочно:")
+
+    if len(coords) == 0:
+        return sheet
+
+    new_rows = []
+
+    max_row, max_col = data.shape
+
+    first_col = body_df.columns[0]
+    code_col = body_df.columns[1] if body_df.shape[1] > 1 else None
+
+    def is_code(e):
+        return isinstance(e, str) and e.startswith("(") and e.endswith(")") and e[1:-1].isdigit()
+
+    def is_number(e):
+        if not isinstance(e, str):
+            return False
+        e = e.replace(",", ".")
+        return any(ch.isdigit() for ch in e) and e.replace(".", "", 1).isdigit()
+
+    for row, col in coords:
+
+        prev_label = None
+
+        for dr in range(0, max_row - row):
+
+            r = row + dr
+
+            for c in range(col, max_col):
+
+                val = data[r, c]
+
+                if pd.isna(val) or val == _SERVICE_EMPTY or str(val).strip() == "Справочно:":
+                    continue
+
+                entries = [
+                    str(x).strip()
+                    for x in data[r, c:]
+                    if x is not None and x != _SERVICE_EMPTY and not pd.isna(x)
+                ]
+
+                entries = [e for e in entries if e != "Справочно:"]
+
+                if not entries:
+                    continue
+
+                # строка только с текстом → это label
+                if all(not (is_code(e) or is_number(e)) for e in entries):
+                    prev_label = entries[0]
+
+                else:
+
+                    code = None
+                    value = None
+                    unit = None
+
+                    if entries and not (is_code(entries[0]) or is_number(entries[0])):
+                        row_label = entries[0]
+                    else:
+                        row_label = prev_label
+
+                    for e in entries:
+
+                        if is_code(e):
+                            code = e
+
+                        elif is_number(e):
+                            value = float(e.replace(",", "."))
+
+                        else:
+                            if e != row_label:
+                                unit = e
+
+                    if not row_label:
+                        continue
+
+                    # исправление: если значение отсутствует
+                    if value is None:
+                        value = 0.0
+
+                    row_label = f"{row_label} ({unit})" if unit else row_label
+
+                    row_dict = {col_name: _SERVICE_EMPTY for col_name in body_df.columns}
+
+                    row_dict[first_col] = row_label
+
+                    if code_col:
+                        row_dict[code_col] = code or _SERVICE_EMPTY
+
+                    row_dict["Справочно"] = str(value)
+
+                    new_rows.append(row_dict)
+
+                break
+
+    if new_rows:
+
+        new_df = pd.DataFrame(new_rows, columns=body_df.columns)
+
+        combined_body = pd.concat([body_df, new_df], ignore_index=True)
+
+        # ускоренная фильтрация
+        mask_not_marker = ~combined_body.eq("Справочно:").any(axis=1)
+
+        mask_label = combined_body[first_col].notna() & (~combined_body[first_col].eq(_SERVICE_EMPTY))
+
+        mask_value = combined_body["Справочно"].notna() & (~combined_body["Справочно"].eq(_SERVICE_EMPTY))
+
+        filtered_body = combined_body.loc[
+            mask_not_marker & (mask_label | mask_value)
+        ].reset_index(drop=True)
+
+        sheet = pd.concat([header_df, filtered_body], ignore_index=True)
+
+    return sheet
+
+
+def _assert_same(actual: pd.DataFrame, expected: pd.DataFrame) -> None:
+    assert_frame_equal(actual, expected, check_exact=True)
+    assert [type(v) for v in actual.to_numpy().ravel()] == [type(v) for v in expected.to_numpy().ravel()]
+
+
+def _fixture_sheets():
+    for path in FIXTURES:
+        for name, sheet in pd.read_excel(path, sheet_name=None, header=None, dtype=object, engine="calamine").items():
+            yield f"{path.stem}/{name}", sheet
+
+
+@pytest.mark.parametrize("fill_empty", [False, True])
+def test_notes_match_previous_implementation_on_1fk_fixtures(fill_empty: bool) -> None:
+    _banner(f"notes processor: single pass equals the per-marker scan on 1FK fixtures (empty filled={fill_empty})")
+    with_notes = 0
+    for name, sheet in _fixture_sheets():
+        if fill_empty:
+            sheet = sheet.fillna(_SERVICE_EMPTY)
+        expected = _reference_process_notes(sheet.copy(), HEADER_ROWS)
+        actual = NotesProcessor.process_notes(sheet.copy(), HEADER_ROWS)
+        _assert_same(actual, expected)
+        with_notes += actual.shape != sheet.shape
+    print(f"sheets with expanded notes: {with_notes}")
+    assert with_notes > 0
+
+
+def test_several_markers_and_rows_without_label() -> None:
+    _banner("notes processor: several markers, shifted columns, label-less and unit rows stay identical")
+    rng = np.random.default_rng(24)
+    pool = ["Справочно:", "Число залов", "ед.", "(31)", "(32)", "12", "3,5", "", "  ", None, np.nan,
+            _SERVICE_EMPTY, 7, 2.5, "Площадь", "кв. м", "Справочно: "]
+    for _ in range(200):
+        rows, cols = rng.integers(8, 30), rng.integers(1, 7)
+        cells = rng.integers(0, len(pool), size=(rows, cols))
+        sheet = pd.DataFrame([[pool[i] for i in row] for row in cells], dtype=object)
+        expected = _reference_process_notes(sheet.copy(), HEADER_ROWS)
+        actual = NotesProcessor.process_notes(sheet.copy(), HEADER_ROWS)
+        _assert_same(actual, expected)
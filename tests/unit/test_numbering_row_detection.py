@@ -0,0 +1,109 @@
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.domain.parsing.structure_detection import (
+    _find_numbering_row_and_bounds,
+    _positive_int_matrix,
+    _to_positive_int,
+)
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FIXTURES = sorted((PROJECT_ROOT / "tests" / "fixtures").glob("[15]fk/*.xls*"))
+
+TRICKY_VALUES = [
+    None, np.nan, pd.NaT, True, False, 0, -1, 1, 2, 3, 2**70, -(2**70), 1.0, 2.0, 2.5, -3.0,
+    float("inf"), 1e300, "1", " 2 ", "3\xa0", "1 2", "12.0", "12,00", "1.5e1", "-1,0", "1_0.0",
+    "inf", "nan", "None", "", "  ", "²", "١", "1.2.3", "в том числе, 1", " 4 ",
+    np.int64(4), np.float64(5.0), Decimal("6"), datetime(2020, 1, 1),
+]
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _reference_run(row: pd.Series, min_sequence_len: int) -> Optional[Tuple[int, int, int]]:
+    """Прежняя построчная реализация _find_1_to_n_run."""
+    start_col = end_col = None
+    expected = 1
+    in_sequence = finished = False
+    for col_idx, v in enumerate(row.tolist()):
+        parsed = _to_positive_int(v)
+        if not in_sequence:
+            if parsed == 1:
+                in_sequence = True
+                start_col = end_col = col_idx
+                expected = 2
+            continue
+        if not finished:
+            if parsed == expected:
+                end_col = col_idx
+                expected += 1
+                continue
+            if parsed is None:
+                finished = True
+                continue
+            return None
+        break
+    if start_col is None or expected - 1 < min_sequence_len:
+        return None
+    return start_col, end_col, expected - 1
+
+
+def _reference_bounds(df: pd.DataFrame, max_rows_to_check: int = 80, min_sequence_len: int = 3):
+    if df.empty:
+        return None
+    best = None
+    for row_idx in range(min(max_rows_to_check, len(df))):
+        run = _reference_run(df.iloc[row_idx], min_sequence_len)
+        if run is None:
+            continue
+        start_col, end_col, seq_len = run
+        if best is None or seq_len > best[3] or (seq_len == best[3] and start_col < best[1]):
+            best = (row_idx, start_col, end_col, seq_len)
+    return best
+
+
+def test_positive_int_matrix_matches_scalar_conversion() -> None:
+    _banner("numbering row: vectorised positive-int coercion equals _to_positive_int per cell")
+    values = np.empty((1, len(TRICKY_VALUES)), dtype=object)
+    values[0, :] = TRICKY_VALUES
+    expected = [min(_to_positive_int(v) or 0, np.iinfo(np.int64).max) for v in TRICKY_VALUES]
+    assert _positive_int_matrix(values)[0].tolist() == expected
+
+
+def test_numbering_row_matches_reference_on_synthetic_rows() -> None:
+    _banner("numbering row: runs with garbage before/inside/after, ties and short runs")
+    rows = [
+        ["x", 1, 2, 3, None, 7],            # мусор после пустой ячейки допустим
+        [1, 2, 3, 5, None],                  # мусор сразу после прогона — строка отбрасывается
+        [None, "1", "2.0", "3,00", 4],       # строки и float
+        [1, 2, None, 1, 2, 3],               # короткий первый прогон
+        [None, None, 1, 2, 3, 4],            # тот же n, но правее
+        ["№", 1, 2, 3, 4, "итого"],
+    ]
+    width = max(map(len, rows))
+    df = pd.DataFrame([row + [None] * (width - len(row)) for row in rows], dtype=object)
+    for drop in range(len(rows)):
+        part = df.drop(index=drop).reset_index(drop=True)
+        assert _find_numbering_row_and_bounds(part) == _reference_bounds(part)
+    assert _find_numbering_row_and_bounds(df) == _reference_bounds(df)
+
+
+def test_numbering_row_matches_reference_on_fixtures() -> None:
+    _banner("numbering row: vectorised detection equals the per-cell scan on every fixture sheet")
+    checked = 0
+    for path in FIXTURES:
+        for name, df in pd.read_excel(path, sheet_name=None, header=None, dtype=object, engine="calamine").items():
+            assert _find_numbering_row_and_bounds(df) == _reference_bounds(df), (path.name, name)
+            checked += 1
+    print(f"sheets checked: {checked}")
+    assert checked > 0
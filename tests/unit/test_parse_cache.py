@@ -0,0 +1,187 @@
+import json
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from fastapi import UploadFile
+
+from app.application.upload.options import UploadOptions
+from app.application.upload.pipeline.context import UploadPipelineContext
+from app.application.upload.pipeline.parse_cache import ParseCache, make_cache_key
+from app.application.upload.pipeline.parse_executor import InlineParseExecutor, WorkbookParseJob
+from app.application.upload.pipeline.steps.ParseWorkbookStep import ParseWorkbookStep
+from app.domain.file.models import FileInfo, FileModel
+from app.domain.form.models import FormInfo, detect_form_type
+from app.domain.parsing.header_fixer import HeaderFixer, header_fixer_version
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FIXTURE = PROJECT_ROOT / "tests" / "fixtures" / "1fk" / "АЛАПАЕВСК 2020.xls"
+CONTENT_HASH = "a" * 64
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _form_info(requisites: dict) -> FormInfo:
+    return FormInfo(
+        id="eab639f7-78c4-4e08-bd27-756bac5cf571",
+        name="1ФК",
+        type=detect_form_type("1ФК"),
+        requisites=requisites,
+    )
+
+
+class CountingExecutor(InlineParseExecutor):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def parse(self, job: WorkbookParseJob):
+        self.calls += 1
+        return await super().parse(job)
+
+
+def _context(form_info: FormInfo, options: UploadOptions | None = None) -> UploadPipelineContext:
+    content = FIXTURE.read_bytes()
+    return UploadPipelineContext(
+        form_id=form_info.id,
+        form_info=form_info,
+        file=UploadFile(filename=FIXTURE.name, file=BytesIO(content)),
+        filename=FIXTURE.name,
+        options=options or UploadOptions(),
+        content_hash=CONTENT_HASH,
+        file_content=content,
+        file_info=FileInfo(reporter="АЛАПАЕВСК", year=2020, extension="xls"),
+        file_model=FileModel.create_processing(FIXTURE.name, form_info.id),
+    )
+
+
+@pytest.mark.asyncio
+async def test_parse_cache_hit_returns_identical_sheets(tmp_path) -> None:
+    _banner("parse cache: second upload of the same content skips parsing")
+    cache = ParseCache(tmp_path, max_bytes=64 * 1024 * 1024)
+    executor = CountingExecutor()
+    step = ParseWorkbookStep(executor, cache=cache)
+    form_info = _form_info({"skip_sheets": [0]})
+
+    first = _context(form_info)
+    await step.execute(first)
+    second = _context(form_info)
+    await step.execute(second)
+
+    stats = cache.stats()
+    print(f"executor calls={executor.calls}, stats={stats}")
+    assert executor.calls == 1
+    assert stats.hits == 1 and stats.stores == 1 and stats.entries == 1
+    assert len(second.sheets) == len(first.sheets)
+    for expected, actual in zip(first.sheets, second.sheets):
+        assert actual.sheet_fullname == expected.sheet_fullname
+        assert actual.sheet_name == expected.sheet_name
+        assert actual.horizontal_headers == expected.horizontal_headers
+        assert actual.vertical_headers == expected.vertical_headers
+        assert actual.flat_data == expected.flat_data
+        assert [type(v) for v in actual.flat_data.values] == [
+            type(v) for v in expected.flat_data.values
+        ]
+
+    # Другие реквизиты формы — другой ключ; bypass — парсинг без чтения кэша.
+    await step.execute(_context(_form_info({"skip_sheets": [0, 1]})))
+    await step.execute(_context(form_info, UploadOptions(bypass_parse_cache=True)))
+    assert executor.calls == 3
+    assert cache.stats().hits == 1
+
+
+@pytest.mark.asyncio
+async def test_parse_cache_evicts_least_recently_used_entries(tmp_path) -> None:
+    _banner("parse cache: LRU eviction by total size on disk")
+    form_info = _form_info({"skip_sheets": [0]})
+    job = WorkbookParseJob(
+        filename=FIXTURE.name,
+        form_info=form_info,
+        content=FIXTURE.read_bytes(),
+        file_info=FileInfo(reporter="АЛАПАЕВСК", year=2020, extension="xls"),
+    )
+    sheets = (await InlineParseExecutor().parse(job)).sheets
+
+    probe = ParseCache(tmp_path / "probe", max_bytes=64 * 1024 * 1024)
+    probe.put("probe", sheets)
+    entry_size = probe.stats().total_bytes
+
+    cache = ParseCache(tmp_path / "lru", max_bytes=entry_size * 2 + entry_size // 2)
+    keys = [make_cache_key(h * 64, form_info) for h in "abc"]
+    cache.put(keys[0], sheets)
+    cache.put(keys[1], sheets)
+    assert cache.get(keys[0]) is not None  # keys[0] становится самым свежим
+    cache.put(keys[2], sheets)
+
+    stats = cache.stats()
+    print(f"entry_size={entry_size}, stats={stats}")
+    assert stats.evictions == 1
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[2]) is not None
+
+    reopened = ParseCache(tmp_path / "lru", max_bytes=entry_size * 2 + entry_size // 2)
+    assert reopened.stats().entries == 2
+
+
+def test_manual_map_edit_changes_cache_key(tmp_path) -> None:
+    _banner("parse cache: editing manual_map.json gives new keys, an unchanged map keeps them")
+    map_file = tmp_path / "manual_map.json"
+    map_file.write_text(json.dumps({"спортивных": "join"}, ensure_ascii=False), encoding="utf-8")
+    form_info = _form_info({"skip_sheets": [0]})
+
+    version = header_fixer_version(map_file)
+    assert header_fixer_version(map_file) == version
+    key = make_cache_key(CONTENT_HASH, form_info, version)
+
+    map_file.write_text(json.dumps({"спортивных": "space", "нового": "join"}, ensure_ascii=False), encoding="utf-8")
+    edited = header_fixer_version(map_file)
+    assert edited != version
+    assert make_cache_key(CONTENT_HASH, form_info, edited) != key
+
+
+def test_learned_header_cases_keep_cache_keys(tmp_path) -> None:
+    _banner("parse cache: cases learned by HeaderFixer keep the version, a hand edit of one changes it")
+    map_file = tmp_path / "manual_map.json"
+    map_file.write_text(json.dumps({"ручной": "space"}, ensure_ascii=False), encoding="utf-8")
+    version = header_fixer_version(map_file)
+
+    fixer = HeaderFixer(map_file=str(map_file), memo_file=tmp_path / "memo.json")
+    assert fixer.fix("спортив\nнх") == "спортив нх"
+    fixer.flush()
+    saved = json.loads(map_file.read_text(encoding="utf-8"))
+    assert saved == {"ручной": "space", "спортивнх": "space"}
+    assert header_fixer_version(map_file) == version
+
+    saved["спортивнх"] = "join"
+    map_file.write_text(json.dumps(saved, ensure_ascii=False), encoding="utf-8")
+    assert header_fixer_version(map_file) != version
+
+
+class WarningExecutor(CountingExecutor):
+    async def parse(self, job: WorkbookParseJob):
+        result = await super().parse(job)
+        result.warnings.append("Лист 'Раздел9' пропущен")
+        return result
+
+
+@pytest.mark.asyncio
+async def test_parse_cache_hit_keeps_parse_warnings(tmp_path) -> None:
+    _banner("parse cache: warnings of the original parse come back with a cached result")
+    step = ParseWorkbookStep(WarningExecutor(), cache=ParseCache(tmp_path, max_bytes=64 * 1024 * 1024))
+    form_info = _form_info({"skip_sheets": [0]})
+
+    first = _context(form_info)
+    await step.execute(first)
+    second = _context(form_info)
+    await step.execute(second)
+
+    print(f"warnings: parsed={first.warnings}, cached={second.warnings}")
+    assert step._executor.calls == 1
+    assert second.warnings == first.warnings == ["Лист 'Раздел9' пропущен"]
+    assert [s.flat_data.section for s in second.sheets] == [s.flat_data.section for s in first.sheets]
@@ -0,0 +1,109 @@
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from app.application.upload.pipeline.context import UploadPipelineContext
+from app.application.upload.pipeline.parse_executor import (
+    InlineParseExecutor,
+    ProcessPoolParseExecutor,
+    WorkbookParseJob,
+)
+from app.application.upload.pipeline.steps.ReadFileContentStep import ReadFileContentStep
+from app.core.exceptions import CriticalUploadError
+from app.domain.file.models import FileInfo
+from app.domain.form.models import FormInfo, detect_form_type
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FIXTURE = PROJECT_ROOT / "tests" / "fixtures" / "1fk" / "АЛАПАЕВСК 2020.xls"
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _job(content: bytes, filename: str = FIXTURE.name) -> WorkbookParseJob:
+    form_info = FormInfo(
+        id="eab639f7-78c4-4e08-bd27-756bac5cf571",
+        name="1ФК",
+        type=detect_form_type("1ФК"),
+        requisites={"skip_sheets": [0]},
+    )
+    return WorkbookParseJob(
+        filename=filename,
+        form_info=form_info,
+        content=content,
+        file_info=FileInfo(reporter="АЛАПАЕВСК", year=2020, extension="xls"),
+    )
+
+
+@pytest.mark.asyncio
+async def test_process_pool_executor_matches_inline_result() -> None:
+    _banner("parse executor: process pool returns the same sheets as inline parsing")
+    job = _job(FIXTURE.read_bytes())
+
+    inline = await InlineParseExecutor().parse(job)
+
+    executor = ProcessPoolParseExecutor(max_workers=1, max_tasks_per_child=1)
+    try:
+        pooled = await executor.parse(job)
+        pooled_again = await executor.parse(job)
+    finally:
+        executor.shutdown()
+
+    print(f"sheets: inline={len(inline.sheets)}, pooled={len(pooled.sheets)}")
+    assert [s.sheet_name for s in pooled.sheets] == [s.sheet_name for s in inline.sheets]
+    for expected, actual in zip(inline.sheets, pooled.sheets):
+        assert actual.horizontal_headers == expected.horizontal_headers
+        assert actual.vertical_headers == expected.vertical_headers
+        assert actual.flat_data == expected.flat_data
+    assert [s.flat_data for s in pooled_again.sheets] == [
+        s.flat_data for s in pooled.sheets
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_pool_executor_propagates_upload_errors() -> None:
+    _banner("parse executor: CriticalUploadError from worker keeps domain and status")
+    executor = ProcessPoolParseExecutor(max_workers=1)
+    try:
+        with pytest.raises(CriticalUploadError) as exc_info:
+            await executor.parse(_job(b"not an excel file", filename="BROKEN 2020.xls"))
+    finally:
+        executor.shutdown()
+
+    assert exc_info.value.domain == "upload.read_workbook"
+    assert exc_info.value.http_status == 400
+
+
+@pytest.mark.asyncio
+async def test_spooled_file_is_read_by_the_executor_not_the_upload_step(tmp_path) -> None:
+    _banner("parse executor: spooled workbook passed by path, bytes are read only in the worker")
+    spooled = tmp_path / "0000.part"
+    spooled.write_bytes(FIXTURE.read_bytes())
+    ctx = UploadPipelineContext(
+        form_id="form",
+        form_info=FormInfo(id="form", name="1ФК"),
+        file=None,
+        filename=FIXTURE.name,
+        file_path=spooled,
+    )
+    await ReadFileContentStep().execute(ctx)
+    assert ctx.file_content is None
+
+    inline = await InlineParseExecutor().parse(_job(FIXTURE.read_bytes()))
+    executor = ProcessPoolParseExecutor(max_workers=1)
+    try:
+        pooled = await executor.parse(replace(_job(b""), path=spooled))
+    finally:
+        executor.shutdown()
+    print(f"sheets: inline={len(inline.sheets)}, by path={len(pooled.sheets)}")
+    assert [s.flat_data for s in pooled.sheets] == [s.flat_data for s in inline.sheets]
+
+    spooled.write_bytes(b"")
+    with pytest.raises(CriticalUploadError) as exc_info:
+        await ReadFileContentStep().execute(ctx)
+    assert exc_info.value.http_status == 400
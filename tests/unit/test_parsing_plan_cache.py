@@ -0,0 +1,74 @@
+import pytest
+
+from app.application.parsing.registry import ParsingStrategyRegistry
+from app.application.parsing.steps.common.ParseHeadersStep import ParseHeadersStep
+from app.application.parsing.steps.forms.fk1.RoundingStep import FK1RoundingStep
+from app.domain.form.models import FormInfo, detect_form_type
+from app.domain.form.service import FormService
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _form(requisites: dict, form_id: str = "form-1", name: str = "1ФК") -> FormInfo:
+    return FormInfo(id=form_id, name=name, type=detect_form_type(name), requisites=requisites)
+
+
+class _FormRepository:
+    def __init__(self, docs: dict[str, dict]) -> None:
+        self._docs = docs
+
+    async def get_form(self, form_id: str):
+        return self._docs.get(form_id)
+
+    async def update_form(self, form_id: str, update_doc: dict):
+        if form_id not in self._docs:
+            return None
+        self._docs[form_id].update(update_doc["$set"])
+        return dict(self._docs[form_id])
+
+
+def test_plans_are_reused_per_form_requisites_and_sheet() -> None:
+    _banner("parsing plans: one runner per (form, requisites hash, normalized sheet name)")
+    registry = ParsingStrategyRegistry()
+    form = _form({"skip_sheets": [0]})
+
+    plan = registry.build_pipeline_for_sheet(form, "Раздел1", 1)
+    assert registry.build_pipeline_for_sheet(form, "раздел 1", 3) is plan
+    assert registry.build_pipeline_for_sheet(_form({"skip_sheets": [0]}), "Раздел1", 1) is plan
+    assert isinstance(plan.steps, tuple)
+    assert any(isinstance(step, FK1RoundingStep) for step in plan.steps)
+
+    assert registry.build_pipeline_for_sheet(form, "Раздел0", 0) is None
+    assert registry.build_pipeline_for_sheet(form, "Раздел2", 2) is not plan
+
+    changed = registry.build_pipeline_for_sheet(
+        _form({"skip_sheets": [0], "vertical_hierarchy_max_path_segments": 2}), "Раздел1", 1
+    )
+    assert changed is not plan
+    headers_step = next(step for step in changed.steps if isinstance(step, ParseHeadersStep))
+    assert headers_step._vertical_hierarchy.max_path_segments == 2
+    print(f"plans cached: {registry.plans_count}")
+    assert registry.plans_count == 3
+
+
+@pytest.mark.asyncio
+async def test_form_update_invalidates_plans_of_that_form() -> None:
+    _banner("parsing plans: FormService.update_form drops cached plans of the updated form only")
+    registry = ParsingStrategyRegistry()
+    service = FormService(_FormRepository({"form-1": {"id": "form-1", "name": "1ФК", "requisites": {}}}))
+    service.add_update_listener(registry.invalidate_form)
+
+    plan = registry.build_pipeline_for_sheet(_form({}), "Раздел1", 1)
+    other = registry.build_pipeline_for_sheet(_form({}, form_id="form-2"), "Раздел1", 1)
+
+    assert await service.update_form("missing", {"requisites": {"skip_sheets": [1]}}) is None
+    assert registry.plans_count == 2
+
+    await service.update_form("form-1", {"requisites": {"skip_sheets": [1]}})
+    assert registry.plans_count == 1
+    assert registry.build_pipeline_for_sheet(_form({}, form_id="form-2"), "Раздел1", 1) is other
+    assert registry.build_pipeline_for_sheet(_form({}), "Раздел1", 1) is not plan
@@ -0,0 +1,105 @@
+import math
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.sheet.rounding import RoundingService
+
+
+SHEETS = {"Раздел1": 0, "Раздел4": 1, "Раздел3": 2}
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _reference_round_dataframe(sheet_name: str, df: pd.DataFrame) -> pd.DataFrame:
+    """Прежняя реализация: копия DataFrame и Series.apply с Decimal на каждое значение."""
+    df = df.copy()
+
+    def to_int_nearest(x):
+        if isinstance(x, float) and not pd.isna(x):
+            return int(float(Decimal(str(x)).quantize(Decimal("1"), rounding=ROUND_HALF_UP)))
+        return x
+
+    def to_one_decimal(x):
+        if isinstance(x, float) and not pd.isna(x):
+            return float(Decimal(str(x)).quantize(Decimal("0.1"), rounding=ROUND_HALF_UP))
+        return x
+
+    def to_two_decimals(x):
+        if isinstance(x, float) and not pd.isna(x):
+            return float(Decimal(str(x)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP))
+        return x
+
+    for col in df.columns:
+        if sheet_name in RoundingService.SHEETS_INT:
+            df[col] = df[col].apply(to_int_nearest)
+        elif sheet_name in RoundingService.SHEETS_ONE_DECIMAL:
+            df[col] = df[col].apply(to_one_decimal)
+        elif sheet_name in RoundingService.SHEETS_TWO_DECIMALS:
+            df[col] = df[col].apply(to_two_decimals)
+    return df
+
+
+def _random_floats(rng: np.random.Generator, size: int) -> np.ndarray:
+    """Смесь произвольных float, десятичных «половинок» всех разрядов и их соседей."""
+    digits = rng.integers(0, 6, size)
+    ties = (rng.integers(-10**7, 10**7, size) * 10 + 5) / 10.0 ** (digits + 1)
+    neighbours = np.nextafter(ties, rng.choice([-np.inf, np.inf], size))
+    plain = rng.standard_normal(size) * 10.0 ** rng.integers(-4, 16, size)
+    return np.concatenate([ties, neighbours, plain, rng.integers(-10**6, 10**6, size) / 1000.0])
+
+
+def _assert_identical(actual: pd.DataFrame, expected: pd.DataFrame) -> None:
+    assert list(actual.dtypes) == list(expected.dtypes)
+    for a, e in zip(actual.to_numpy().ravel(), expected.to_numpy().ravel()):
+        assert type(a) is type(e), (a, e)
+        if isinstance(e, float):
+            assert a == e or (math.isnan(a) and math.isnan(e)), (a, e)
+            assert math.copysign(1, a) == math.copysign(1, e), (a, e)
+        else:
+            assert a == e, (a, e)
+
+
+@pytest.mark.parametrize("sheet_name", list(SHEETS))
+def test_vector_rounding_matches_decimal_bit_for_bit(sheet_name: str) -> None:
+    _banner(f"rounding engine: random floats and decimal ties, {SHEETS[sheet_name]} digits, equal to Decimal")
+    rng = np.random.default_rng(2300 + SHEETS[sheet_name])
+    floats = _random_floats(rng, 5000)
+    floats = np.concatenate([floats, [0.5, 1.5, 2.5, -0.5, -2.5, 0.05, 0.15, 2.675, 1.005, -1.005, -0.0, 0.0, -0.04, 1e15 + 0.5]])
+    rng.shuffle(floats)
+    mixed = floats.astype(object)
+    mixed[::7] = "итого"
+    mixed[3::11] = None
+    mixed[5::13] = 42
+    mixed[6::17] = float("nan")
+    mixed[8::19] = np.float64(3.345)
+
+    frame = pd.DataFrame({"mixed": mixed, "floats": floats, "ints": np.arange(len(floats)), "text": "x"})
+    expected = _reference_round_dataframe(sheet_name, frame)
+    actual = RoundingService.round_dataframe(sheet_name, frame.copy())
+    print(f"values: {frame.size}, dtypes: {list(actual.dtypes)}")
+    _assert_identical(actual, expected)
+
+
+def test_rounding_is_in_place_and_keeps_column_inference() -> None:
+    _banner("rounding engine: columns replaced in the same frame, dtype inference as Series.apply")
+    frame = pd.DataFrame({0: ["Всего", 1.5, 2.49999], 1: [0.5, 2.5, float("nan")], 2: [1.25, 2.0, 3.75]}, dtype=object)
+    rounded = RoundingService.round_dataframe("Раздел1", frame)
+    assert rounded is frame
+    assert rounded[0].tolist() == ["Всего", 2, 2]
+    assert rounded[1].dtype == np.float64 and rounded[1].tolist()[:2] == [1.0, 3.0]
+    assert rounded[2].dtype == np.int64 and rounded[2].tolist() == [1, 2, 4]
+
+    other = pd.DataFrame({0: [1.55]}, dtype=object)
+    assert RoundingService.round_dataframe("Титул", other)[0].tolist() == [1.55]
+
+    failing = pd.DataFrame({0: [1.234, 2.345], 1: [0.5, float("inf")]}, dtype=object)
+    with pytest.raises(InvalidOperation):
+        RoundingService.round_dataframe("Раздел3", failing)
+    assert failing[0].tolist() == [1.234, 2.345] and failing[0].dtype == object
@@ -0,0 +1,123 @@
+import datetime
+import math
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.domain.flat_data.batch import FileFlatData, SheetFlatBatch
+from app.domain.flat_data.models import FlatDataRecord
+from app.domain.parsing import SERVICE_EMPTY, ExtractedColumn, ExtractedSheetData, build_sheet_flat_batch
+
+
+COLUMN_VALUES = [
+    [1, None, 2.0, 2.5, float("nan"), "abc", SERVICE_EMPTY, " nan ", "", -0.0],
+    [SERVICE_EMPTY, 0, 1e20, "none", None, 7, 3.25, "x", 12, None],
+    [None] * 10,
+]
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _reference_records(data: ExtractedSheetData, section: str, skip_empty: bool) -> list:
+    """Прежняя поячеечная сборка FlatDataRecord (build_flat_data_records)."""
+    records = []
+    for col in data.columns:
+        for row_header, value in zip(data.row_headers, col.values):
+            if value == SERVICE_EMPTY:
+                continue
+            if skip_empty:
+                if value is None or (isinstance(value, float) and math.isnan(value)):
+                    continue
+                if isinstance(value, str) and value.strip() in ("", "nan", "none"):
+                    continue
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                value = 0
+            if isinstance(value, float) and value == int(value):
+                value = int(value)
+            records.append(FlatDataRecord(section=section, row=row_header, column=col.column_header, value=value))
+    return records
+
+
+def _sheet_data() -> ExtractedSheetData:
+    columns = []
+    for idx, values in enumerate(COLUMN_VALUES):
+        array = np.empty(len(values), dtype=object)
+        array[:] = values
+        columns.append(ExtractedColumn(column_header=f"Графа {idx + 1}", values=array))
+    return ExtractedSheetData(columns=columns, row_headers=[f"Строка {i}" for i in range(10)])
+
+
+def _typed(records: list) -> list:
+    return [(r.row, r.column, type(r.value), r.value) for r in records]
+
+
+def test_batch_matches_per_cell_records() -> None:
+    _banner("flat batch: same cells, labels, values and value types as per-cell FlatDataRecord")
+    data = _sheet_data()
+    for skip_empty in (False, True):
+        batch = build_sheet_flat_batch(data, section="Раздел1", skip_empty=skip_empty)
+        expected = _reference_records(data, "Раздел1", skip_empty)
+        print(f"skip_empty={skip_empty}: cells={len(batch)}")
+        assert len(batch) == len(expected)
+        assert _typed(batch.records()) == _typed(expected)
+
+
+def test_file_flat_data_applies_file_metadata_on_serialisation() -> None:
+    _banner("file flat data: metadata stored once, docs equal FlatDataRecord.to_mongo_doc, O(1) size")
+    sheets = [build_sheet_flat_batch(_sheet_data(), section=name) for name in ("Раздел1", "Раздел2")]
+    flat_data = FileFlatData(sheets)
+    assert len(flat_data) == sum(len(batch) for batch in sheets)
+
+    flat_data.stamp(file_id="file-1", form="form-1", year=2024, reporter="АСБЕСТ")
+    docs = list(flat_data.to_mongo_docs())
+    assert docs == [record.to_mongo_doc() for record in flat_data.records()]
+    assert len(docs) == len(flat_data)
+    assert list(docs[0]) == list(FlatDataRecord().to_mongo_doc())
+    assert {(d["year"], d["reporter"], d["file_id"], d["form"]) for d in docs} == {(2024, "АСБЕСТ", "file-1", "form-1")}
+    assert [d["section"] for d in docs] == ["Раздел1"] * len(sheets[0]) + ["Раздел2"] * len(sheets[1])
+    # Батчи листов метаданные файла не хранят.
+    assert {d["file_id"] for d in sheets[0].to_mongo_docs()} == {None}
+
+
+def test_empty_sheet_gives_empty_batch() -> None:
+    _banner("flat batch: no columns or no rows -> empty batch that keeps the section")
+    for data in (ExtractedSheetData(columns=[]), ExtractedSheetData(columns=_sheet_data().columns)):
+        batch = build_sheet_flat_batch(data, section="Раздел2")
+        assert len(batch) == 0
+        assert batch == SheetFlatBatch.empty("Раздел2")
+        assert list(batch.to_mongo_docs()) == []
+
+
+def test_mongo_docs_hold_validated_value_types() -> None:
+    _banner("flat batch: to_mongo_docs values are int/float/str as FlatDataRecord stored them, bool -> int")
+    values = [True, np.False_, np.int64(5), np.float64(2.5), np.float64(3.0), Decimal("1.5"), np.str_("abc"), None]
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    data = ExtractedSheetData(
+        columns=[ExtractedColumn(column_header="Графа 1", values=array)],
+        row_headers=[f"Строка {i}" for i in range(len(values))],
+    )
+    docs = list(build_sheet_flat_batch(data, section="Раздел1").to_mongo_docs())
+    assert [(type(d["value"]), d["value"]) for d in docs] == [
+        (int, 1), (int, 0), (int, 5), (float, 2.5), (int, 3), (float, 1.5), (str, "abc"), (int, 0)
+    ]
+    assert [doc["value"] for doc in docs] == [FlatDataRecord(**doc).value for doc in docs]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [pd.Timestamp("2024-01-01"), datetime.time(12, 30), pd.Timedelta("1D"), datetime.date(2024, 1, 1)],
+)
+def test_non_scalar_cells_are_rejected(value) -> None:
+    _banner(f"flat batch: {type(value).__name__} cell is rejected instead of being stored as a string")
+    array = np.empty(1, dtype=object)
+    array[0] = value
+    data = ExtractedSheetData(columns=[ExtractedColumn(column_header="Графа 1", values=array)], row_headers=["Строка 1"])
+    with pytest.raises(ValueError):
+        build_sheet_flat_batch(data, section="Раздел1")
@@ -0,0 +1,344 @@
+import asyncio
+from datetime import datetime, timedelta
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+
+from app.application.upload.file_processor import FileProcessor
+from app.application.upload.job_queue import UploadJobQueue
+from app.application.upload.spool import UploadSpool
+from app.application.upload.upload_manager import UploadManager
+from app.domain.file.models import FileModel, FileStatus
+from app.domain.form.models import FormInfo
+from app.domain.upload_job import UploadJob, UploadJobStatus
+from app.worker import IngestWorker
+
+
+FORM_ID = "eab639f7-78c4-4e08-bd27-756bac5cf571"
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+class InMemoryUploadJobService:
+    """UploadJobService поверх словаря — та же семантика аренды, что и в Mongo."""
+
+    def __init__(self) -> None:
+        self.jobs: dict[str, UploadJob] = {}
+
+    async def create_job(self, upload_id, form_id, files, options=None) -> UploadJob:
+        job = UploadJob(upload_id=upload_id, form_id=form_id, files=files, options=options or {})
+        self.jobs[upload_id] = job
+        return job
+
+    async def get(self, upload_id):
+        job = self.jobs.get(upload_id)
+        return job.model_copy(deep=True) if job else None
+
+    async def get_if_newer(self, upload_id, version):
+        job = self.jobs.get(upload_id)
+        return job.model_copy(deep=True) if job and job.version > version else None
+
+    async def count_pending(self) -> int:
+        return sum(1 for job in self.jobs.values() if not job.is_terminal)
+
+    async def claim_next(self, worker_id, lease_seconds, max_attempts):
+        now = datetime.utcnow()
+        for job in sorted(self.jobs.values(), key=lambda j: j.created_at):
+            expired = (
+                job.status == UploadJobStatus.RUNNING
+                and job.lease_expires_at < now
+                and job.attempts < max_attempts
+            )
+            if job.status == UploadJobStatus.QUEUED or expired:
+                job.status = UploadJobStatus.RUNNING
+                job.lease_owner = worker_id
+                job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+                job.attempts += 1
+                job.version += 1
+                return job.model_copy(deep=True)
+        return None
+
+    async def list_expired(self):
+        now = datetime.utcnow()
+        return [
+            job.model_copy(deep=True)
+            for job in self.jobs.values()
+            if job.status == UploadJobStatus.RUNNING and job.lease_expires_at < now
+        ]
+
+    def _apply(self, job, fields, file_results) -> None:
+        for key, value in fields.items():
+            setattr(job, key, value)
+        for index, result in (file_results or {}).items():
+            job.files[index].result = result
+        job.version += 1
+
+    async def save_progress(self, upload_id, worker_id, *, lease_seconds, progress, file_results=None):
+        job = self.jobs[upload_id]
+        if job.lease_owner != worker_id:
+            return False
+        self._apply(job, progress, file_results)
+        return True
+
+    async def finish(self, upload_id, worker_id, status, *, progress=None, file_results=None):
+        job = self.jobs[upload_id]
+        if job.lease_owner != worker_id:
+            return False
+        self._apply(job, {**(progress or {}), "status": status, "stages": {}, "lease_owner": None}, file_results)
+        return True
+
+    async def requeue_expired(self, job) -> bool:
+        self._apply(self.jobs[job.upload_id], {"status": UploadJobStatus.QUEUED, "lease_owner": None}, None)
+        return True
+
+    async def fail_expired(self, job, *, progress=None, file_results=None) -> bool:
+        self._apply(self.jobs[job.upload_id], {**(progress or {}), "status": UploadJobStatus.FAILED}, file_results)
+        return True
+
+
+class StubFormService:
+    async def get_form_or_raise(self, form_id: str) -> FormInfo:
+        return FormInfo(id=form_id, name="Test form")
+
+
+class RecordingPipeline:
+    def __init__(self) -> None:
+        self.parsed: list[str] = []
+
+    async def run_parse_phase(self, ctx) -> None:
+        self.parsed.append(ctx.filename)
+        if "BROKEN" in ctx.filename:
+            ctx.failed = True
+            ctx.error = "broken workbook"
+
+    async def run_persist_phase(self, ctx) -> None:
+        pass
+
+
+class StubFileService:
+    def __init__(self, records: dict[str, FileModel]) -> None:
+        self._records = records
+
+    async def get_by_filename(self, filename, form_id=None):
+        return self._records.get(filename)
+
+
+class RecordingDataSaveService:
+    def __init__(self) -> None:
+        self.rolled_back: list[str] = []
+
+    async def rollback(self, file_model: FileModel, error: str) -> None:
+        self.rolled_back.append(file_model.filename)
+        file_model.status = FileStatus.FAILED
+
+
+def _manager(spool: UploadSpool, **kwargs) -> UploadManager:
+    return UploadManager(
+        file_service=None,
+        form_service=StubFormService(),
+        data_save_service=None,
+        spool=spool,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_queued_upload_is_processed_by_worker_and_progress_is_mirrored(tmp_path) -> None:
+    _banner("upload job queue: API enqueues, worker processes, SSE progress comes from the job")
+    jobs = InMemoryUploadJobService()
+    api_spool = UploadSpool(tmp_path, enabled=True)
+    api = _manager(api_spool, job_queue=UploadJobQueue(jobs, api_spool, poll_interval=0.01))
+
+    files = [
+        UploadFile(filename=name, file=BytesIO(b"payload"), size=7)
+        for name in ["A 2024.xlsx", "BROKEN 2024.xlsx"]
+    ]
+    response = await api.upload_files(files, FORM_ID)
+    upload_id = response.upload_id
+    job = jobs.jobs[upload_id]
+    assert job.status == UploadJobStatus.QUEUED
+    assert api.get_upload_progress(upload_id) is None  # в этом процессе ничего не выполняется
+    assert api_spool.total_bytes == 0 and all((tmp_path / upload_id).iterdir())
+
+    progress = await api.open_upload_progress(upload_id)
+    assert progress is not None and progress.status == "processing"
+
+    pipeline = RecordingPipeline()
+    worker_manager = _manager(UploadSpool(tmp_path, enabled=True))
+    worker_manager._file_processor = FileProcessor(pipeline=pipeline)
+    worker = IngestWorker(
+        jobs,
+        worker_manager,
+        file_service=StubFileService({}),
+        data_save_service=RecordingDataSaveService(),
+        worker_id="w1",
+        heartbeat_seconds=0.05,
+    )
+    claimed = await jobs.claim_next(worker.worker_id, 60, 3)
+    await worker.run_job(claimed)
+
+    job = jobs.jobs[upload_id]
+    print(f"job: status={job.status}, files={[f.result for f in job.files]}")
+    assert pipeline.parsed == ["A 2024.xlsx", "BROKEN 2024.xlsx"]
+    assert job.status == UploadJobStatus.FAILED
+    assert [f.result["status"] for f in job.files] == ["success", "failed"]
+    assert job.processed_files == ["A 2024.xlsx", "BROKEN 2024.xlsx"]
+    assert job.lease_owner is None
+    assert not (tmp_path / upload_id).exists()
+
+    # Копия прогресса в API догоняет документ задачи.
+    await asyncio.wait_for(_until_terminal(progress), timeout=1.0)
+    assert progress.status == "failed"
+    assert [r.filename for r in progress.file_responses] == ["A 2024.xlsx", "BROKEN 2024.xlsx"]
+
+
+async def _until_terminal(progress) -> None:
+    while not progress.is_terminal:
+        await progress.wait_for_change(progress.version, timeout=0.1)
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_rolls_back_stuck_files_and_requeues(tmp_path) -> None:
+    _banner("upload job queue: expired lease → rollback of PROCESSING files, requeue or fail")
+    jobs = InMemoryUploadJobService()
+    stuck = FileModel.create_processing("A 2024.xlsx", FORM_ID)
+    done = FileModel.create_processing("B 2024.xlsx", FORM_ID)
+    done.status = FileStatus.SUCCESS
+    done.content_hash = "h-b"
+
+    def expired_job(upload_id: str, attempts: int) -> UploadJob:
+        job = UploadJob(
+            upload_id=upload_id,
+            form_id=FORM_ID,
+            status=UploadJobStatus.RUNNING,
+            lease_owner="dead-worker",
+            lease_expires_at=datetime.utcnow() - timedelta(seconds=1),
+            attempts=attempts,
+            files=[
+                {"filename": "A 2024.xlsx", "path": str(tmp_path / "a"), "content_hash": "h-a"},
+                {"filename": "B 2024.xlsx", "path": str(tmp_path / "b"), "content_hash": "h-b"},
+            ],
+        )
+        jobs.jobs[upload_id] = job
+        return job
+
+    expired_job("retry", attempts=1)
+    expired_job("give-up", attempts=3)
+    data_save = RecordingDataSaveService()
+    worker = IngestWorker(
+        jobs,
+        _manager(UploadSpool(tmp_path, enabled=True)),
+        file_service=StubFileService({"A 2024.xlsx": stuck, "B 2024.xlsx": done}),
+        data_save_service=data_save,
+        worker_id="w2",
+        max_attempts=3,
+    )
+
+    await worker.recover_expired_leases()
+
+    print(f"rolled back: {data_save.rolled_back}")
+    assert data_save.rolled_back == ["A 2024.xlsx"]
+    assert jobs.jobs["retry"].status == UploadJobStatus.QUEUED
+    give_up = jobs.jobs["give-up"]
+    assert give_up.status == UploadJobStatus.FAILED
+    # B успел сохраниться до падения — его результат восстановлен, а не потерян.
+    assert [f.result["status"] for f in give_up.files] == ["failed", "success"]
+    assert give_up.files[1].result["file_id"] == done.file_id
+
+
+class BlockingPipeline(RecordingPipeline):
+    def __init__(self) -> None:
+        super().__init__()
+        self.started = asyncio.Event()
+
+    async def run_parse_phase(self, ctx) -> None:
+        self.started.set()
+        await asyncio.Event().wait()
+
+
+@pytest.mark.asyncio
+async def test_lost_lease_keeps_spool_for_the_next_worker(tmp_path) -> None:
+    _banner("upload job queue: cancelled after lost lease → spool stays, next worker finishes the job")
+    jobs = InMemoryUploadJobService()
+    api_spool = UploadSpool(tmp_path, enabled=True)
+    api = _manager(api_spool, job_queue=UploadJobQueue(jobs, api_spool, poll_interval=0.01))
+    files = [UploadFile(filename="A 2024.xlsx", file=BytesIO(b"payload"), size=7)]
+    upload_id = (await api.upload_files(files, FORM_ID)).upload_id
+    spooled_path = tmp_path / upload_id / "0000.part"
+
+    def worker(worker_id: str, pipeline) -> IngestWorker:
+        manager = _manager(UploadSpool(tmp_path, enabled=True))
+        manager._file_processor = FileProcessor(pipeline=pipeline)
+        return IngestWorker(
+            jobs,
+            manager,
+            file_service=StubFileService({}),
+            data_save_service=RecordingDataSaveService(),
+            worker_id=worker_id,
+            heartbeat_seconds=0.05,
+        )
+
+    blocking = BlockingPipeline()
+    first = worker("w1", blocking)
+    running = asyncio.create_task(first.run_job(await jobs.claim_next("w1", 60, 3)))
+    await asyncio.wait_for(blocking.started.wait(), timeout=1.0)
+    jobs.jobs[upload_id].lease_owner = "w2"  # аренда истекла, задачу забрал w2
+    await asyncio.wait_for(running, timeout=1.0)
+
+    print(f"after lost lease: spool file exists={spooled_path.exists()}")
+    assert spooled_path.exists()
+
+    pipeline = RecordingPipeline()
+    await worker("w2", pipeline).run_job(jobs.jobs[upload_id].model_copy(deep=True))
+    job = jobs.jobs[upload_id]
+    assert pipeline.parsed == ["A 2024.xlsx"]
+    assert job.status == UploadJobStatus.COMPLETED
+    assert not (tmp_path / upload_id).exists()
+
+
+@pytest.mark.asyncio
+async def test_running_worker_fails_expired_job_without_attempts_left(tmp_path) -> None:
+    _banner("upload job queue: expired job with attempts exhausted is failed, not claimed again")
+    jobs = InMemoryUploadJobService()
+    worker = IngestWorker(
+        jobs,
+        _manager(UploadSpool(tmp_path, enabled=True)),
+        file_service=StubFileService({}),
+        data_save_service=RecordingDataSaveService(),
+        worker_id="w1",
+        lease_seconds=0.1,
+        poll_seconds=0.01,
+        max_attempts=3,
+    )
+    stop = asyncio.Event()
+    running = asyncio.create_task(worker.run(stop))
+    await asyncio.sleep(0.02)
+
+    (tmp_path / "exhausted").mkdir()
+    jobs.jobs["exhausted"] = UploadJob(
+        upload_id="exhausted",
+        form_id=FORM_ID,
+        status=UploadJobStatus.RUNNING,
+        lease_owner="dead-worker",
+        lease_expires_at=datetime.utcnow() - timedelta(seconds=1),
+        attempts=3,
+        files=[{"filename": "A 2024.xlsx", "path": str(tmp_path / "exhausted" / "0000.part")}],
+    )
+    for _ in range(100):
+        if jobs.jobs["exhausted"].status == UploadJobStatus.FAILED:
+            break
+        await asyncio.sleep(0.01)
+    stop.set()
+    await asyncio.wait_for(running, timeout=1.0)
+
+    job = jobs.jobs["exhausted"]
+    print(f"job: status={job.status}, attempts={job.attempts}")
+    assert job.status == UploadJobStatus.FAILED
+    assert job.attempts == 3
+    assert job.files[0].result["status"] == "failed"
+    assert not (tmp_path / "exhausted").exists()
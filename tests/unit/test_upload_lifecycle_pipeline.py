@@ -1,12 +1,15 @@
+import hashlib
 from io import BytesIO
 
 import pytest
 from fastapi import UploadFile
 
+from app.application.upload.options import UploadOptions
 from app.application.upload.pipeline.context import UploadPipelineContext
 from app.application.upload.pipeline.pipeline import UploadPipelineRunner
 from app.application.upload.pipeline.steps.AcquireFileRecordStep import AcquireFileRecordStep
 from app.core.exceptions import CriticalUploadError
+from app.core.profiling_storage import profiling_storage
 from app.domain.file.models import FileModel, FileStatus
 from app.domain.form.models import FormInfo
 
@@ -64,6 +67,17 @@ class InMemoryFileService():
         model = self._records.get(self._key(filename, form_id))
         return model.model_copy(deep=True) if model else None
 
+    async def get_by_content_hash(
+        self,
+        content_hash: str,
+        status: FileStatus,
+        form_id: str | None,
+    ) -> FileModel | None:
+        for model in self._records.values():
+            if model.content_hash == content_hash and model.status == status and model.form_id == form_id:
+                return model.model_copy(deep=True)
+        return None
+
     async def update_or_create(self, file_model: FileModel) -> None:
         self.update_calls += 1
         self._records[self._key(file_model.filename, file_model.form_id)] = file_model.model_copy(deep=True)
@@ -96,13 +110,18 @@ def _build_form_info(form_id: str) -> FormInfo:
     return FormInfo(id=form_id, name=f"Test form {form_id}")
 
 
-def _build_context(filename: str, form_id: str) -> UploadPipelineContext:
+def _build_context(
+    filename: str,
+    form_id: str,
+    options: UploadOptions | None = None,
+) -> UploadPipelineContext:
     upload_file = UploadFile(filename=filename, file=BytesIO(b"123"), size=3)
     return UploadPipelineContext(
         file=upload_file,
         filename=upload_file.filename or "",
         form_id=form_id,
         form_info=_build_form_info(form_id),
+        options=options or UploadOptions(),
     )
 
 
@@ -209,3 +228,87 @@ async def test_upload_lifecycle_pipeline_full_flow_with_pretty_console_output()
     assert record4.file_id == first_file_id
     assert record4.status == FileStatus.SUCCESS
     assert record4.error is None
+
+
+class RecordingStep:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def execute(self, ctx: UploadPipelineContext) -> None:
+        self.calls += 1
+
+
+@pytest.mark.asyncio
+async def test_identical_content_short_circuits_in_skip_mode() -> None:
+    _banner("upload lifecycle: content hash stored, identical content skipped in skip mode")
+    file_service = InMemoryFileService()
+    data_save_service = InMemoryDataSaveService(file_service)
+
+    pipeline = UploadPipelineRunner(
+        steps=[AcquireFileRecordStep(file_service), PersistSuccessStep(data_save_service)],
+        data_save_service=data_save_service,
+    )
+    ctx1 = _build_context(FILENAME, FORM_ID)
+    await pipeline.run_for_file(ctx1)
+    record1 = file_service.snapshot(FILENAME, FORM_ID)
+    assert record1.content_hash == hashlib.sha256(b"123").hexdigest()
+
+    # Same bytes under another name: default mode processes the file again.
+    later_step = RecordingStep()
+    pipeline = UploadPipelineRunner(
+        steps=[AcquireFileRecordStep(file_service), later_step],
+        data_save_service=data_save_service,
+    )
+    ctx2 = _build_context("RENAMED 2025.xlsx", FORM_ID)
+    await pipeline.run_for_file(ctx2)
+    assert later_step.calls == 1
+    assert ctx2.file_model.file_id != record1.file_id
+
+    # Skip mode: existing record is returned, no further steps, no new Files record.
+    later_step = RecordingStep()
+    pipeline = UploadPipelineRunner(
+        steps=[AcquireFileRecordStep(file_service), later_step],
+        data_save_service=data_save_service,
+    )
+    before = file_service.update_calls
+    ctx3 = _build_context("OTHER 2025.xlsx", FORM_ID, UploadOptions(skip_identical_content=True))
+    await pipeline.run_for_file(ctx3)
+    print(f"ctx3.skipped={ctx3.skipped}, file_id={ctx3.file_model.file_id}")
+
+    assert ctx3.skipped is True
+    assert ctx3.failed is False
+    assert ctx3.file_model.file_id == record1.file_id
+    assert later_step.calls == 0
+    assert file_service.update_calls == before
+    assert file_service.snapshot("OTHER 2025.xlsx", FORM_ID) is None
+
+
+@pytest.mark.asyncio
+async def test_each_file_has_its_own_profiler_across_phases(monkeypatch) -> None:
+    _banner("upload lifecycle: overlapping files keep separate profiling state")
+    monkeypatch.setenv("ENABLE_PROFILING", "true")
+    finished: list[tuple[str, int]] = []
+    monkeypatch.setattr(
+        profiling_storage,
+        "add_pipeline_metric",
+        lambda name, duration, steps, memory: finished.append((name, steps)),
+    )
+    pipeline = UploadPipelineRunner(
+        steps=[RecordingStep(), RecordingStep()],
+        data_save_service=None,
+        persist_steps=[RecordingStep()],
+    )
+    first = _build_context("A 2025.xlsx", FORM_ID)
+    second = _build_context("B 2025.xlsx", FORM_ID)
+
+    await pipeline.run_parse_phase(first)
+    first_started = first.profiler.start_time
+    await pipeline.run_parse_phase(second)  # парсинг B идёт, пока A ждёт записи
+    await pipeline.run_persist_phase(first)
+
+    print(f"steps: A={first.profiler.step_count}, B={second.profiler.step_count}")
+    assert first.profiler is not second.profiler
+    assert first.profiler.start_time == first_started
+    assert first.profiler.step_count == 3
+    assert second.profiler.step_count == 2
+    assert finished == [("Upload", 3)]
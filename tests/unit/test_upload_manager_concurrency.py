@@ -0,0 +1,217 @@
+import asyncio
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+
+from app.application.upload.file_processor import FileProcessor
+from app.application.upload.spool import UploadSpool
+from app.application.upload.upload_manager import UploadManager
+from app.application.upload.upload_progress import UploadProgress
+from app.domain.form.models import FormInfo
+from config.config import config
+
+
+FORM_ID = "form-1"
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+class StubFormService:
+    async def get_form_or_raise(self, form_id: str) -> FormInfo:
+        return FormInfo(id=form_id, name="Test form")
+
+
+class SlowPipeline:
+    """Files finish parsing in reverse order; one of them blows up."""
+
+    def __init__(self, delays: dict[str, float], failing: str, persist_delay: float = 0.0) -> None:
+        self._delays = delays
+        self._failing = failing
+        self._persist_delay = persist_delay
+        self.running = 0
+        self.max_running = 0
+        self.events: list[str] = []
+
+    async def run_parse_phase(self, ctx) -> None:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        self.events.append(f"parse+ {ctx.filename}")
+        try:
+            await asyncio.sleep(self._delays[ctx.filename])
+            if ctx.filename == self._failing:
+                raise RuntimeError("boom")
+        finally:
+            self.running -= 1
+            self.events.append(f"parse- {ctx.filename}")
+
+    async def run_persist_phase(self, ctx) -> None:
+        self.events.append(f"persist+ {ctx.filename}")
+        await asyncio.sleep(self._persist_delay)
+        self.events.append(f"persist- {ctx.filename}")
+
+
+@pytest.mark.asyncio
+async def test_files_run_concurrently_and_progress_keeps_request_order(tmp_path) -> None:
+    _banner("upload manager: bounded concurrency, ordered progress, isolated failures")
+    names = ["A 2024.xlsx", "B 2024.xlsx", "C 2024.xlsx", "D 2024.xlsx"]
+    processor = SlowPipeline(
+        delays={"A 2024.xlsx": 0.08, "B 2024.xlsx": 0.06, "C 2024.xlsx": 0.02, "D 2024.xlsx": 0.01},
+        failing="B 2024.xlsx",
+    )
+    manager = UploadManager(
+        file_service=None,
+        form_service=StubFormService(),
+        data_save_service=None,
+        spool=UploadSpool(tmp_path, enabled=True, max_request_bytes=1024),
+        file_concurrency=2,
+    )
+    manager._file_processor = FileProcessor(pipeline=processor)
+
+    files = [UploadFile(filename=name, file=BytesIO(b"x"), size=1) for name in names]
+    spooled = await manager._spool.spool(files, "u1")
+    progress_log: list[list[str]] = []
+    progress = UploadProgress(upload_id="u1", total_files=len(names), form_id=FORM_ID)
+    original_add = progress.add_processed_file
+
+    def tracking_add(filename, success=True, error=None):
+        original_add(filename, success, error)
+        progress_log.append(list(progress.processed_files))
+
+    progress.add_processed_file = tracking_add
+
+    await manager._process_files_background(spooled, FORM_ID, "u1", progress)
+
+    print(f"max concurrent files: {processor.max_running}")
+    print(f"progress snapshots : {progress_log}")
+    assert processor.max_running == 2
+    assert progress.processed_files == names
+    assert all(snapshot == names[: len(snapshot)] for snapshot in progress_log)
+    assert [r.filename for r in progress.file_responses] == names
+    assert [r.status for r in progress.file_responses] == ["success", "failed", "success", "success"]
+    assert progress.status == "failed"
+    assert manager._spool.total_bytes == 0
+    assert not (tmp_path / "u1").exists()
+
+
+@pytest.mark.asyncio
+async def test_next_file_is_parsed_while_previous_one_is_persisted(tmp_path) -> None:
+    _banner("upload manager: parse of file N+1 overlaps persistence of file N")
+    names = ["A 2024.xlsx", "B 2024.xlsx", "C 2024.xlsx"]
+    pipeline = SlowPipeline(delays={name: 0.03 for name in names}, failing="", persist_delay=0.03)
+    manager = UploadManager(
+        file_service=None,
+        form_service=StubFormService(),
+        data_save_service=None,
+        spool=UploadSpool(tmp_path, enabled=True, max_request_bytes=1024),
+        file_concurrency=1,
+    )
+    manager._file_processor = FileProcessor(pipeline=pipeline)
+
+    files = [UploadFile(filename=name, file=BytesIO(b"x"), size=1) for name in names]
+    spooled = await manager._spool.spool(files, "u1")
+    progress = UploadProgress(upload_id="u1", total_files=len(names), form_id=FORM_ID)
+
+    await manager._process_files_background(spooled, FORM_ID, "u1", progress)
+
+    events = pipeline.events
+    print("\n".join(events))
+    assert events.index("parse+ B 2024.xlsx") < events.index("persist- A 2024.xlsx")
+    assert events.index("parse+ C 2024.xlsx") < events.index("persist- B 2024.xlsx")
+    assert pipeline.max_running == 1
+    assert progress.processed_files == names
+    assert progress.status == "completed"
+    stats = manager.scheduler.stats()
+    assert stats.running_files == 0 and stats.inflight_bytes == 0
+
+
+class ExplodingFileProcessor(FileProcessor):
+    async def parse(self, ctx) -> None:
+        raise RuntimeError("boom")
+
+
+@pytest.mark.asyncio
+async def test_stage_and_result_share_the_normalized_filename(tmp_path) -> None:
+    _banner("upload manager: 'queued' stage and failure result use the same stripped filename")
+    manager = UploadManager(
+        file_service=None,
+        form_service=StubFormService(),
+        data_save_service=None,
+        spool=UploadSpool(tmp_path, enabled=True),
+    )
+    manager._file_processor = ExplodingFileProcessor(pipeline=None)
+    spooled = await manager._spool.spool([UploadFile(filename="  A 2024.xlsx ", file=BytesIO(b"x"), size=1)], "u1")
+    progress = UploadProgress(upload_id="u1", total_files=1, form_id=FORM_ID)
+
+    await manager.process_upload(spooled, FORM_ID, "u1", progress)
+
+    print(f"stages: {progress.stages}, processed: {progress.processed_files}")
+    assert progress.processed_files == ["A 2024.xlsx"]
+    assert [r.filename for r in progress.file_responses] == ["A 2024.xlsx"]
+    assert progress.stages == {}
+
+
+def _pipelined_manager(tmp_path, names: list[str]) -> UploadManager:
+    manager = UploadManager(
+        file_service=None,
+        form_service=StubFormService(),
+        data_save_service=None,
+        spool=UploadSpool(tmp_path, enabled=True, max_request_bytes=1024),
+        file_concurrency=1,
+    )
+    manager._file_processor = FileProcessor(pipeline=SlowPipeline(delays={name: 0 for name in names}, failing=""))
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_release_error_after_persist_becomes_file_failure(tmp_path) -> None:
+    _banner("upload manager: error while releasing a persisted file fails only that file")
+    names = ["A 2024.xlsx", "B 2024.xlsx", "C 2024.xlsx"]
+    manager = _pipelined_manager(tmp_path, names)
+    release = manager._release_parsed_file
+
+    async def failing_release(parsed) -> None:
+        await release(parsed)
+        if parsed.item.filename == "A 2024.xlsx":
+            raise OSError("close failed")
+
+    manager._release_parsed_file = failing_release
+    spooled = await manager._spool.spool(
+        [UploadFile(filename=name, file=BytesIO(b"x"), size=1) for name in names], "u1"
+    )
+    progress = UploadProgress(upload_id="u1", total_files=len(names), form_id=FORM_ID)
+
+    await asyncio.wait_for(manager.process_upload(spooled, FORM_ID, "u1", progress), timeout=2.0)
+
+    print(f"responses: {[(r.filename, r.status, r.error) for r in progress.file_responses]}")
+    assert [r.status for r in progress.file_responses] == ["failed", "success", "success"]
+    assert "close failed" in progress.file_responses[0].error
+
+
+@pytest.mark.asyncio
+async def test_dead_writer_does_not_hang_the_upload(tmp_path, monkeypatch) -> None:
+    _banner("upload manager: writer crash cancels parsing instead of blocking on a full queue")
+    monkeypatch.setattr(config, "UPLOAD_PERSIST_QUEUE_SIZE", 1)
+    names = [f"{letter} 2024.xlsx" for letter in "ABCDE"]
+    manager = _pipelined_manager(tmp_path, names)
+    spooled = await manager._spool.spool(
+        [UploadFile(filename=name, file=BytesIO(b"x"), size=1) for name in names], "u1"
+    )
+    progress = UploadProgress(upload_id="u1", total_files=len(names), form_id=FORM_ID)
+
+    def broken_record(index, response) -> None:
+        raise RuntimeError("progress store is broken")
+
+    progress.record_file_result = broken_record
+
+    await asyncio.wait_for(manager._process_files_background(spooled, FORM_ID, "u1", progress), timeout=2.0)
+
+    print(f"status: {progress.status}, errors: {progress.errors}")
+    assert progress.status == "failed"
+    stats = manager.scheduler.stats()
+    assert stats.running_files == 0 and stats.inflight_bytes == 0
+    assert manager._spool.total_bytes == 0
@@ -0,0 +1,90 @@
+import asyncio
+import json
+
+import pytest
+
+from app.api.v2.endpoints import upload_progress as sse
+from app.api.v2.schemas.files import FileResponse
+from app.application.upload.upload_progress import UploadProgress
+from app.domain.file.models import FileStatus
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+class StubUploadManager:
+    def __init__(self, progress: UploadProgress) -> None:
+        self._progress = progress
+        self.cleaned = False
+
+    def get_upload_progress(self, upload_id: str):
+        return None if self.cleaned else self._progress
+
+    def cleanup_upload_progress(self, upload_id: str) -> None:
+        self.cleaned = True
+
+
+def _payload(chunk: str) -> dict:
+    assert chunk.startswith("data: ")
+    return json.loads(chunk[len("data: "):])
+
+
+@pytest.mark.asyncio
+async def test_sse_sends_deltas_on_change_and_heartbeat_when_idle(monkeypatch) -> None:
+    _banner("upload progress SSE: event-driven deltas, stages and heartbeat")
+    monkeypatch.setattr(sse, "_HEARTBEAT_INTERVAL", 0.05)
+    progress = UploadProgress(upload_id="u1", total_files=2)
+    manager = StubUploadManager(progress)
+    stream = sse._event_generator("u1", manager)
+
+    first = _payload(await stream.__anext__())
+    assert first["processed_files"] == [] and first["stages"] == {}
+
+    # Ничего не меняется — приходит только heartbeat-комментарий.
+    assert await stream.__anext__() == ": keep-alive\n\n"
+
+    progress.update_stage("a.xls", step="ParseWorkbookStep")
+    progress.update_stage("a.xls", sheet="Раздел1", rows=10)
+    event = _payload(await stream.__anext__())
+    print(f"stage event: {event}")
+    assert event["stages"] == {"a.xls": {"step": "ParseWorkbookStep", "sheet": "Раздел1", "rows": 10}}
+
+    progress.add_processed_file("a.xls")
+    event = _payload(await stream.__anext__())
+    assert event["processed_files"] == ["a.xls"] and event["stages"] == {}
+
+    progress.add_processed_file("b.xls", success=False, error="broken")
+    event = _payload(await stream.__anext__())
+    assert event["processed_files"] == ["b.xls"]  # только новый файл
+    assert event["errors"] == ["broken"]
+
+    progress.fail([
+        FileResponse(filename="a.xls", status=FileStatus.SUCCESS, error=""),
+        FileResponse(filename="b.xls", status=FileStatus.FAILED, error="broken"),
+    ])
+    final = _payload(await stream.__anext__())
+    print(f"final event: {final}")
+    assert final["status"] == "failed"
+    assert final["processed_files"] == [] and final["errors"] == []
+    assert [d["filename"] for d in final["result"]["details"]] == ["a.xls", "b.xls"]
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert manager.cleaned
+
+
+@pytest.mark.asyncio
+async def test_wait_for_change_wakes_all_waiters() -> None:
+    _banner("upload progress: one change wakes every waiting client")
+    progress = UploadProgress(upload_id="u1", total_files=1)
+    waiters = [asyncio.create_task(progress.wait_for_change(0, timeout=1.0)) for _ in range(3)]
+    await asyncio.sleep(0)
+    progress.update_stage("a.xls", step="PersistStep")
+    assert await asyncio.gather(*waiters) == [True, True, True]
+    assert progress.version == 1
+    # Повторное одинаковое значение не считается изменением.
+    progress.update_stage("a.xls", step="PersistStep")
+    assert progress.version == 1
+    assert await progress.wait_for_change(1, timeout=0.01) is False
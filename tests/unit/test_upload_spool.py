@@ -0,0 +1,74 @@
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+
+from app.application.upload.spool import UploadSpool
+from app.core.exceptions import RequestValidationError
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _upload(name: str, payload: bytes) -> UploadFile:
+    return UploadFile(filename=name, file=BytesIO(payload), size=len(payload))
+
+
+@pytest.mark.asyncio
+async def test_spool_streams_files_to_disk_and_releases_them(tmp_path) -> None:
+    _banner("upload spool: chunked write to disk, read back, release on terminal status")
+    spool = UploadSpool(tmp_path, enabled=True, chunk_size=4, max_request_bytes=1024)
+    payloads = [b"first workbook bytes", b"second"]
+
+    spooled = await spool.spool(
+        [_upload("A 2024.xlsx", payloads[0]), _upload("B 2024.xls", payloads[1])],
+        upload_id="u1",
+    )
+
+    assert [item.filename for item in spooled] == ["A 2024.xlsx", "B 2024.xls"]
+    assert all(item.content is None and item.path.exists() for item in spooled)
+    assert spool.total_bytes == sum(len(p) for p in payloads)
+
+    upload_file = spooled[0].to_upload_file()
+    assert await upload_file.read() == payloads[0]
+    await upload_file.close()
+
+    first_path = spooled[0].path
+    spool.release(spooled[0])
+    spool.release(spooled[0])
+    assert not first_path.exists()
+    assert spool.total_bytes == len(payloads[1])
+
+    spool.release(spooled[1])
+    spool.release_upload("u1")
+    assert spool.total_bytes == 0
+    assert not (tmp_path / "u1").exists()
+
+
+@pytest.mark.asyncio
+async def test_spool_rejects_request_over_size_limit_and_cleans_up(tmp_path) -> None:
+    _banner("upload spool: request size limit -> 413, partial files removed")
+    spool = UploadSpool(tmp_path, enabled=True, chunk_size=4, max_request_bytes=10)
+
+    with pytest.raises(RequestValidationError) as exc_info:
+        await spool.spool([_upload("A.xlsx", b"123456"), _upload("B.xlsx", b"789012")], "u2")
+
+    assert exc_info.value.http_status == 413
+    assert spool.total_bytes == 0
+    assert not (tmp_path / "u2").exists()
+
+
+@pytest.mark.asyncio
+async def test_spool_in_memory_mode_keeps_previous_behaviour(tmp_path) -> None:
+    _banner("upload spool: disabled spool keeps content in memory")
+    spool = UploadSpool(tmp_path, enabled=False, max_request_bytes=1024)
+
+    spooled = await spool.spool([_upload("A.xlsx", b"abc")], "u3")
+
+    assert spooled[0].path is None
+    assert spooled[0].content == b"abc"
+    assert not (tmp_path / "u3").exists()
+    assert spooled[0].open().read() == b"abc"
@@ -0,0 +1,116 @@
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+from openpyxl.styles import Border, Side
+
+from app.application.upload.pipeline.context import UploadPipelineContext
+from app.application.upload.pipeline.readers import ExcelReader, SheetGrid
+from app.application.upload.pipeline.steps import ProcessSheetsStep
+from app.domain.file.models import FileInfo
+from app.domain.form.models import FormInfo, detect_form_type
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FIXTURE = PROJECT_ROOT / "tests" / "fixtures" / "1fk" / "АЛАПАЕВСК 2020.xls"
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def test_trimmed_grid_drops_only_trailing_empty_area() -> None:
+    _banner("used range: trailing blank / service cells are cut, leading area is kept")
+    grid = SheetGrid.from_rows(
+        [
+            ["", "", "", ""],
+            ["", "Итого", 5.0, " "],
+            ["", "", "_x000D_", ""],
+            ["", "NULL", "", ""],
+        ]
+    )
+    trimmed = grid.trimmed()
+    assert trimmed.shape == (2, 3)
+    assert trimmed.values[1, 1] == "Итого"
+    assert np.shares_memory(trimmed.values, grid.values)
+    assert SheetGrid.from_rows([["", ""], [" ", "_x0000_"]]).trimmed().shape == (0, 0)
+    assert SheetGrid.from_rows([["", ""]]).trimmed().to_dataframe().empty
+
+
+@pytest.mark.parametrize("engine", ["calamine", "pandas"])
+def test_reader_trims_formatted_tail_of_sheet(engine: str) -> None:
+    _banner(f"used range: reader ({engine}) cuts whitespace/service tail and styled blank area")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Раздел1"
+    ws["A1"], ws["B2"], ws["C3"] = "Показатель", 1, 2.5
+    ws["H40"] = "   "
+    ws["C60"] = "_x000D_"
+    for row in range(1, 200):
+        ws.cell(row, 30).border = Border(left=Side(style="thin"))
+    buffer = BytesIO()
+    wb.save(buffer)
+    content = buffer.getvalue()
+
+    with ExcelReader(engine=engine, trim_used_range=False).read(content, "book.xlsx") as workbook:
+        untrimmed = workbook["Раздел1"]
+    with ExcelReader(engine=engine, trim_used_range=True).read(content, "book.xlsx") as workbook:
+        trimmed = workbook["Раздел1"]
+
+    print(f"shape: {untrimmed.shape} -> {trimmed.shape}")
+    assert untrimmed.shape == (60, 8)
+    assert trimmed.shape == (3, 3)
+    pd.testing.assert_frame_equal(trimmed, untrimmed.iloc[:3, :3])
+
+
+@pytest.mark.asyncio
+async def test_parse_result_is_the_same_for_padded_and_trimmed_sheets() -> None:
+    _banner("used range: parsing a trimmed sheet gives the same records as the padded one")
+    content = FIXTURE.read_bytes()
+    with ExcelReader().read(content, FIXTURE.name) as workbook:
+        sheets = {name: workbook[name] for name in workbook}
+
+    def pad(df: pd.DataFrame) -> pd.DataFrame:
+        values = np.full((len(df) + 2000, df.shape[1] + 20), np.nan, dtype=object)
+        values[: len(df), : df.shape[1]] = df.to_numpy()
+        values[len(df) + 5, 2] = "_x000D_"
+        values[-1, -1] = " "
+        return pd.DataFrame(values)
+
+    async def parse(workbook_sheets):
+        ctx = UploadPipelineContext(
+            form_id="eab639f7-78c4-4e08-bd27-756bac5cf571",
+            form_info=FormInfo(
+                id="eab639f7-78c4-4e08-bd27-756bac5cf571",
+                name="1ФК",
+                type=detect_form_type("1ФК"),
+                requisites={"skip_sheets": [0]},
+            ),
+            file=None,
+            filename=FIXTURE.name,
+            file_content=content,
+            file_info=FileInfo(reporter="АЛАПАЕВСК", year=2020, extension="xls"),
+        )
+        ctx.workbook_sheets = workbook_sheets
+        await ProcessSheetsStep().execute(ctx)
+        return ctx.sheets
+
+    padded = {name: pad(df) for name, df in sheets.items()}
+    trimmed = {
+        name: SheetGrid(df.to_numpy()).trimmed().to_dataframe() for name, df in padded.items()
+    }
+    for name, df in trimmed.items():
+        assert df.shape == sheets[name].shape
+
+    expected = await parse(padded)
+    actual = await parse(trimmed)
+    assert [s.sheet_name for s in actual] == [s.sheet_name for s in expected]
+    for want, got in zip(expected, actual):
+        assert got.vertical_headers == want.vertical_headers
+        assert got.horizontal_headers == want.horizontal_headers
+        assert got.flat_data == want.flat_data
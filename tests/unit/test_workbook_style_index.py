@@ -0,0 +1,105 @@
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+
+import openpyxl
+from openpyxl.styles import Alignment
+
+from app.domain.parsing.workbook_source import ParsingWorkbookSource
+from app.domain.parsing.workbook_styles import WorkbookStyleIndex
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FIXTURES = [
+    PROJECT_ROOT / "tests" / "fixtures" / "1fk" / "АСБЕСТ 2019.xlsx",
+    PROJECT_ROOT / "tests" / "fixtures" / "1fk" / "БИСЕРТЬ 2023.xlsm",
+]
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _openpyxl_reference(ws, numbering_row: int, rows: range):
+    """Прежняя логика header_parsing: openpyxl, data_only=True."""
+    first_col = None
+    for cell in ws[numbering_row]:
+        if cell.value is None:
+            continue
+        if cell.value == 1 or str(cell.value).strip() == "1":
+            first_col = cell.column if first_col is None else min(first_col, cell.column)
+    if first_col is None:
+        return None, []
+    return first_col, [int(ws.cell(row=r, column=first_col).alignment.indent or 0) for r in rows]
+
+
+def _style_index_lookup(sheet, numbering_row: int, rows: range):
+    first_col = sheet.first_one_column(numbering_row)
+    if first_col is None:
+        return None, []
+    return first_col, [sheet.indent(r, first_col) for r in rows]
+
+
+def _assert_same_as_openpyxl(content: bytes) -> int:
+    wb = openpyxl.load_workbook(BytesIO(content), data_only=True)
+    index = WorkbookStyleIndex(content)
+    compared = 0
+    try:
+        assert index.sheet_names == wb.sheetnames
+        for ws in wb.worksheets:
+            sheet = index.sheet(ws.title)
+            rows = range(1, ws.max_row + 1)
+            for numbering_row in rows:
+                expected = _openpyxl_reference(ws, numbering_row, rows)
+                assert _style_index_lookup(sheet, numbering_row, rows) == expected, (ws.title, numbering_row)
+                compared += expected[0] is not None
+    finally:
+        index.close()
+    return compared
+
+
+def test_style_index_matches_openpyxl_on_synthetic_workbook() -> None:
+    _banner("workbook style index: indents / numbering row equal to openpyxl (merged, strings, dates)")
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Раздел1"
+    ws["A3"], ws["B3"], ws["C3"] = "x", " 1 ", 1
+    ws["C2"] = 1
+    ws.merge_cells("B2:C2")  # C2 закрыта объединением — не «1»
+    ws["D4"] = datetime(1900, 1, 1)  # 1 с форматом даты — не «1»
+    ws["E4"] = 1.0
+    ws["F5"] = True
+    for row, indent in [(5, 1), (6, 2), (7, 0), (8, 3)]:
+        ws.cell(row=row, column=2, value=f"строка {row}").alignment = Alignment(indent=indent)
+    ws.cell(row=9, column=2).alignment = Alignment(indent=4)
+    ws.merge_cells("A9:B9")  # B9 закрыта — indent не виден
+    wb.create_sheet("Пустой")
+    buffer = BytesIO()
+    wb.save(buffer)
+
+    assert _assert_same_as_openpyxl(buffer.getvalue()) > 0
+    sheet = WorkbookStyleIndex(buffer.getvalue()).sheet("Раздел1")
+    assert sheet.first_one_column(3) == 2
+    assert [sheet.indent(r, 2) for r in range(5, 10)] == [1, 2, 0, 3, 0]
+
+
+def test_style_index_matches_openpyxl_on_fixtures() -> None:
+    _banner("workbook style index: fixture workbooks give the same lookups as openpyxl")
+    for path in FIXTURES:
+        compared = _assert_same_as_openpyxl(path.read_bytes())
+        print(f"{path.name}: numbering rows compared={compared}")
+        assert compared > 0
+
+
+def test_workbook_source_builds_style_index_once() -> None:
+    _banner("workbook source: style index is built once per file, format chosen by content")
+    content = FIXTURES[0].read_bytes()
+    source = ParsingWorkbookSource(content=content, extension="xlsx")
+    assert source.style_index() is source.style_index()
+    source.close()
+    # .xls, сохранённый как OOXML, получает индекс .xlsx
+    assert isinstance(ParsingWorkbookSource(content=content, extension="xls").style_index(), WorkbookStyleIndex)
+    assert ParsingWorkbookSource(content=content, extension="csv").style_index() is None
+    assert ParsingWorkbookSource(content=b"not a zip", extension=".xlsm").style_index() is None
@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pandas as pd
+
+from app.domain.parsing.workbook_source import ParsingWorkbookSource
+from app.domain.parsing.xls_styles import XlsStyleIndex
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+FIXTURES_1FK = PROJECT_ROOT / "tests" / "fixtures" / "1fk"
+BIFF8_FIXTURES = [
+    FIXTURES_1FK / "ИРБИТ 2023.xls",
+    FIXTURES_1FK / "НИЖНЕТУРИНСКИЙ 2020.xls",
+    FIXTURES_1FK / "!свод СВЕРДЛОВСКАЯ ОБЛАСТЬ 2019 год ИТОГ.xls",
+]
+
+
+def _banner(title: str) -> None:
+    print("\n" + "=" * 88)
+    print(f"TEST | {title}")
+    print("=" * 88)
+
+
+def _calamine_one_cells(df: pd.DataFrame) -> set[tuple[int, int]]:
+    ones = set()
+    for (row, column), value in df.stack().items():
+        if value == 1 or str(value).strip() == "1":
+            ones.add((row + 1, column + 1))
+    return ones
+
+
+def test_xls_style_index_finds_the_same_one_cells_as_calamine() -> None:
+    _banner("xls style index: cells equal to 1 match calamine values (sheets, rows, columns)")
+    for path in BIFF8_FIXTURES:
+        content = path.read_bytes()
+        index = XlsStyleIndex(content)
+        sheets = pd.read_excel(path, sheet_name=None, header=None, dtype=object, engine="calamine")
+        assert index.sheet_names == list(sheets)
+        for name, df in sheets.items():
+            sheet = index.sheet(name)
+            found = {(row, column) for row, columns in sheet.one_columns.items() for column in columns}
+            # Объединённые ячейки, кроме левой верхней, индекс не видит — как openpyxl для .xlsx.
+            assert found <= _calamine_one_cells(df), (path.name, name)
+        print(f"{path.name}: sheets={len(sheets)}")
+
+
+def test_xls_style_index_reads_cell_indents() -> None:
+    _banner("xls style index: per-cell indent of the vertical header column (BIFF8 XF records)")
+    index = XlsStyleIndex((FIXTURES_1FK / "ИРБИТ 2023.xls").read_bytes())
+    sheet = index.sheet("Раздел1")
+    assert sheet.indents == {(10, 1): 2, (12, 1): 2, (14, 1): 2}
+    assert sheet.first_one_column(6) == 1
+    assert index.sheet("Нет такого листа") is None
+
+
+def test_workbook_source_uses_xls_index_for_biff8_content() -> None:
+    _banner("workbook source: .xls gets the BIFF8 style index, unreadable content falls back to None")
+    content = (FIXTURES_1FK / "ИРБИТ 2023.xls").read_bytes()
+    assert isinstance(ParsingWorkbookSource(content=content, extension="xls").style_index(), XlsStyleIndex)
+    broken = content[:512] + b"\x00" * 512
+    assert ParsingWorkbookSource(content=broken, extension="xls").style_index() is None